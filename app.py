@@ -1,530 +1,341 @@
 import streamlit as st
-import pandas as pd
-import seaborn as sns
-import matplotlib.pyplot as plt
-import io
-import re
-import requests
-import sqlite3
-import ast
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+import os
+import threading
 import time
-import contextlib
-from streamlit_ace import st_ace
+import uuid
+# Kept free of pandas/numpy/matplotlib: those load in the editor kernels when a
+# cell needs them (budget: python tools/import_budget.py)
+import chapters
+from assets import injector_html, load_bundle
+from editor.capture import (SPILL_DIR, SPILL_SWEEP_INTERVAL, OutputBuffer, discard_spill, new_spill_path,
+                            read_spill, spill_pages, sweep_spills)
+from editor.executor import make_result
+from editor.graph import plan_run_all, source_hash
+from editor.kernel import KERNEL_MODE, KernelPool, KernelUnavailable, LocalKernel
+from metrics import serve, span, timed
+import progress
 
 # --- INITIALIZATION ---
-if 'progress' not in st.session_state:
-    st.session_state.progress = {}
-if 'current_chapter' not in st.session_state:
-    st.session_state.current_chapter = "Welcome"
-if 'current_lesson' not in st.session_state:
-    st.session_state.current_lesson = "Overview"
-if 'show_editor' not in st.session_state:
-    st.session_state.show_editor = False
-if 'editor_cells' not in st.session_state:
-    st.session_state.editor_cells = [{"id": time.time(), "input": "", "output": "", "exec_time": 0.0, "status": None}]
-if 'exec_globals' not in st.session_state:
-    # Pre-import common libraries for the editor
-    import numpy as np
-    import pandas as pd
-    import matplotlib.pyplot as plt
-    import seaborn as sns
-    st.session_state.exec_globals = {
-        'np': np,
-        'pd': pd,
-        'plt': plt,
-        'sns': sns,
-        're': re,
-        'sqlite3': sqlite3,
-        'time': time,
-        'input': lambda prompt="": (_ for _ in ()).throw(RuntimeError(f"Interactive input('{prompt}') is not supported in this editor.\nPlease hardcode your values for testing (e.g., x = 10)."))
-    }
+with span("session_init"):
+    if 'learner_id' not in st.session_state:
+        # Kept in the URL so a refresh (or a bookmark) picks the learner's progress back up
+        learner = st.query_params.get("learner", "")
+        if not (0 < len(learner) <= 64 and learner.isalnum()):
+            learner = uuid.uuid4().hex
+            st.query_params["learner"] = learner
+        st.session_state.learner_id = learner
+    if 'current_chapter' not in st.session_state:
+        st.session_state.current_chapter = "Welcome"
+    if 'current_lesson' not in st.session_state:
+        st.session_state.current_lesson = "Overview"
+    if 'show_editor' not in st.session_state:
+        st.session_state.show_editor = False
+    if 'editor_cells' not in st.session_state:
+        st.session_state.editor_cells = [{"id": time.time(), "input": "", "output": "", "exec_time": 0.0, "status": None}]
 
 # Page Config
 st.set_page_config(page_title="E-Learning", page_icon="🎓", layout="wide")
 
-# Load CSS
-with open("style.css") as f:
-    st.markdown(f"<style>{f.read()}</style>", unsafe_allow_html=True)
-
-# Custom Code Editor Style with FULL RESPONSIVE DESIGN
-st.markdown(f"""
-<style>
-    /* ========== DESKTOP STYLES (Default) ========== */
-    [data-testid="stSidebar"] {{
-        width: 380px !important;
-        min-width: 380px !important;
-    }}
-    
-    [data-testid="stSidebarUserContent"] {{
-        padding-top: 20px !important;
-        padding-left: 10px !important;
-        padding-right: 10px !important;
-    }}
-    
-    /* Main content area */
-    .main .block-container {{
-        padding-top: 2rem !important;
-        padding-left: 2rem !important;
-        padding-right: 2rem !important;
-        max-width: 100% !important;
-    }}
-    
-    /* Wrap long code/output lines in sidebar */
-    [data-testid="stSidebar"] code {{
-        white-space: pre-wrap !important;
-        word-break: break-word !important;
-    }}
-    
-    /* --- UNIFIED BUTTON STYLING --- */
-    .stButton > button, .stFormSubmitButton > button, button[kind="secondary"], button[kind="primary"] {{
-        border-radius: 4px !important;
-        white-space: nowrap !important;
-        width: auto !important;
-        min-width: max-content !important;
-        padding: 6px 12px !important;
-        font-size: 0.9rem !important;
-        height: auto !important;
-        min-height: 34px !important;
-        line-height: normal !important;
-        background-color: #1e293b !important;
-        color: #f8fafc !important;
-        border: 1px solid #334155 !important;
-        transition: all 0.2s ease !important;
-        cursor: pointer !important;
-    }}
-    
-    .stButton > button:hover, .stFormSubmitButton > button:hover, button:hover {{
-        background-color: #334155 !important;
-        border-color: #5cb9ff !important;
-        color: #5cb9ff !important;
-    }}
-    
-    /* Form containers */
-    [data-testid="stForm"], div[data-testid="stForm"] {{
-        border: 1px solid #334155 !important;
-        border-radius: 8px !important;
-        padding: 15px !important;
-        background-color: #0f172a !important;
-    }}
-    
-    /* Selectbox styling */
-    div[data-testid="stSelectbox"] > div > div {{
-        background-color: #1e293b !important;
-        color: white !important;
-        border: 1px solid #334155 !important;
-    }}
-    
-    /* Code editor */
-    .ace_editor {{
-        border: 1px solid #334155 !important;
-        border-radius: 4px !important;
-    }}
-    
-    /* Progress bar */
-    .stProgress > div > div {{
-        background-color: rgba(255, 255, 255, 0.05) !important;
-        border-radius: 10px !important;
-    }}
-    .stProgress > div > div > div > div {{
-        background-color: #5cb9ff !important;
-    }}
-    
-    /* Remove decoration */
-    [data-testid="stHeader"] {{
-        background: rgba(0,0,0,0) !important;
-    }}
-    div[data-testid="stDecoration"] {{
-        display: none !important;
-    }}
-    
-    /* Ace editor fixes */
-    div[data-testid="stAce"] {{
-        background-color: transparent !important;
-        padding: 0 !important;
-        border: none !important;
-    }}
-    div.stAce > div {{
-        border: 1px solid #334155 !important;
-        background-color: transparent !important;
-    }}
-    
-    /* Scrollbar styling */
-    ::-webkit-scrollbar {{
-        width: 8px;
-        height: 8px;
-    }}
-    ::-webkit-scrollbar-thumb {{
-        background: #334155;
-        border-radius: 10px;
-    }}
-    ::-webkit-scrollbar-track {{
-        background: transparent;
-    }}
-    
-    /* ========== TABLET STYLES (Portrait & Landscape) ========== */
-    @media only screen and (max-width: 1024px) {{
-        [data-testid="stSidebar"] {{
-            width: 300px !important;
-            min-width: 300px !important;
-        }}
-        
-        .main .block-container {{
-            padding-left: 1.5rem !important;
-            padding-right: 1.5rem !important;
-        }}
-        
-        /* Smaller headings on tablets */
-        h1 {{
-            font-size: 1.8rem !important;
-        }}
-        h2 {{
-            font-size: 1.5rem !important;
-        }}
-        h3 {{
-            font-size: 1.2rem !important;
-        }}
-        
-        /* Adjust code editor height */
-        .ace_editor {{
-            min-height: 150px !important;
-        }}
-    }}
-    
-    /* ========== MOBILE STYLES (Phones) ========== */
-    @media only screen and (max-width: 768px) {{
-        /* Collapsible sidebar on mobile */
-        [data-testid="stSidebar"] {{
-            width: 100% !important;
-            min-width: 100% !important;
-        }}
-        
-        [data-testid="stSidebar"][aria-expanded="false"] {{
-            width: 0 !important;
-            min-width: 0 !important;
-        }}
-        
-        /* Mobile content padding */
-        .main .block-container {{
-            padding-top: 1rem !important;
-            padding-left: 1rem !important;
-            padding-right: 1rem !important;
-        }}
-        
-        /* Mobile typography */
-        h1 {{
-            font-size: 1.5rem !important;
-            line-height: 1.3 !important;
-        }}
-        h2 {{
-            font-size: 1.3rem !important;
-        }}
-        h3 {{
-            font-size: 1.1rem !important;
-        }}
-        p, li, span {{
-            font-size: 0.95rem !important;
-            line-height: 1.6 !important;
-        }}
-        
-        /* Touch-friendly buttons */
-        .stButton > button, .stFormSubmitButton > button {{
-            min-height: 44px !important;
-            padding: 10px 20px !important;
-            font-size: 1rem !important;
-            width: 100% !important;
-            margin-bottom: 8px !important;
-        }}
-        
-        /* Stack columns vertically on mobile */
-        [data-testid="column"] {{
-            width: 100% !important;
-            min-width: 100% !important;
-            margin-bottom: 1rem !important;
-        }}
-        
-        /* Code blocks */
-        pre, code {{
-            font-size: 0.85rem !important;
-            overflow-x: auto !important;
-        }}
-        
-        /* Text inputs */
-        input[type="text"], textarea {{
-            font-size: 1rem !important;
-            min-height: 44px !important;
-        }}
-        
-        /* Radio buttons and checkboxes - larger touch targets */
-        [data-testid="stRadio"] label {{
-            padding: 10px !important;
-            font-size: 1rem !important;
-        }}
-        
-        /* Sliders */
-        .stSlider {{
-            padding: 10px 0 !important;
-        }}
-        
-        /* Code editor on mobile */
-        .ace_editor {{
-            min-height: 200px !important;
-            font-size: 0.9rem !important;
-        }}
-        
-        /* Tables responsive */
-        table {{
-            display: block !important;
-            overflow-x: auto !important;
-            font-size: 0.85rem !important;
-        }}
-        
-        /* Lesson cards */
-        .lesson-card, .exercise-box {{
-            padding: 15px !important;
-            margin: 10px 0 !important;
-        }}
-        
-        /* Form spacing */
-        [data-testid="stForm"] {{
-            padding: 12px !important;
-        }}
-    }}
-    
-    /* ========== SMALL MOBILE (iPhone SE, etc.) ========== */
-    @media only screen and (max-width: 375px) {{
-        h1 {{
-            font-size: 1.3rem !important;
-        }}
-        h2 {{
-            font-size: 1.15rem !important;
-        }}
-        h3 {{
-            font-size: 1rem !important;
-        }}
-        
-        .main .block-container {{
-            padding-left: 0.75rem !important;
-            padding-right: 0.75rem !important;
-        }}
-        
-        .stButton > button {{
-            font-size: 0.95rem !important;
-            padding: 8px 16px !important;
-        }}
-    }}
-    
-    /* ========== LANDSCAPE MOBILE ========== */
-    @media only screen and (max-width: 896px) and (orientation: landscape) {{
-        .main .block-container {{
-            padding-top: 0.5rem !important;
-        }}
-        
-        h1 {{
-            font-size: 1.4rem !important;
-        }}
-        
-        .ace_editor {{
-            min-height: 150px !important;
-        }}
-    }}
-    
-    /* ========== LARGE DESKTOP ========== */
-    @media only screen and (min-width: 1400px) {{
-        .main .block-container {{
-            max-width: 1200px !important;
-            margin: 0 auto !important;
-        }}
-    }}
-    
-    /* ========== ACCESSIBILITY & TOUCH IMPROVEMENTS ========== */
-    /* Larger tap targets for all interactive elements */
-    button, a, input, select, textarea {{
-        min-height: 38px !important;
-        touch-action: manipulation !important;
-    }}
-    
-    /* Focus states for keyboard navigation */
-    button:focus, input:focus, select:focus, textarea:focus {{
-        outline: 2px solid #5cb9ff !important;
-        outline-offset: 2px !important;
-    }}
-    
-    /* Prevent text selection issues on touch */
-    .stButton > button {{
-        -webkit-tap-highlight-color: rgba(92, 185, 255, 0.3) !important;
-    }}
-</style>
-""", unsafe_allow_html=True)
+# Stylesheets and scripts are bundled once per process and injected once per browser session
+with span("css_injection"):
+    bundle = load_bundle()
+    if st.session_state.get("assets_injected") != bundle.digest:
+        st.html(injector_html(bundle), unsafe_allow_javascript=True)
+        st.session_state.assets_injected = bundle.digest
 
 # --- UTILS ---
-def mark_completed(chapter, lesson, exercise):
-    key = f"{chapter}_{lesson}_{exercise}"
-    st.session_state.progress[key] = True
+# How long a Stop click waits for the stopped cell to report back (the
+# kernel's interrupt grace period, plus a worker restart)
+STOP_WAIT = 3.0
+
+@st.cache_resource
+def get_metrics_server():
+    # Local /metrics endpoint, one per server process (see metrics.py)
+    return serve()
+
+get_metrics_server()
+
+@st.cache_resource
+def sweep_spill_dir():
+    # One sweeper per server process, for spill files no kernel cleaned up
+    def sweep():
+        while True:
+            sweep_spills()
+            time.sleep(SPILL_SWEEP_INTERVAL)
+    threading.Thread(target=sweep, daemon=True).start()
+
+sweep_spill_dir()
+
+@st.cache_resource
+def get_kernel_pool():
+    # One pool per server process, shared by every session
+    return KernelPool()
+
+def get_kernel():
+    # Leased on first run so learners who never open the editor don't hold a worker
+    if 'kernel' not in st.session_state:
+        st.session_state.kernel = LocalKernel() if KERNEL_MODE == "local" else get_kernel_pool().lease()
+    return st.session_state.kernel
+
+def store_result(cell, result):
+    # The new output replaces the old one, spilled copy and pager position included
+    st.session_state.pop(f"out_page_{cell['id']}", None)
+    replace_output(cell, result)
 
-def is_completed(chapter, lesson, exercise):
-    return st.session_state.progress.get(f"{chapter}_{lesson}_{exercise}", False)
+def replace_output(cell, result):
+    # No st calls: execute_cell also stores a result after a Stop click ended its script run
+    if cell.get("spill") != result.get("spill"):
+        discard_spill(cell.get("spill"))
+    cell.update(result)
 
-def lesson_summary(title, time, points):
-    st.markdown(f"""
-    <div class="lesson-card">
-        <h3>📖 Lesson: {title}</h3>
-        <p style="color: #94a3b8; font-style: italic;">Estimated time: {time}</p>
-        <ul style="margin-top: 10px;">
-            {''.join([f'<li>{p}</li>' for p in points])}
-        </ul>
-    </div>
-    """, unsafe_allow_html=True)
+def clear_output(cell):
+    store_result(cell, {"output": "", "status": None, "exec_time": 0.0, "figures": [], "profile": None,
+                        "output_size": 0, "spill": None})
 
-def exercise_container(name, difficulty, scenario, instruction):
-    badge_class = "badge-beginner" if difficulty == "beginner" else "badge-intermediate"
-    st.markdown(f"""
-    <div class="exercise-box">
-        <div class="exercise-header">
-            <span class="badge {badge_class}">{difficulty}</span>
-            <span>🧩 {name}</span>
-        </div>
-        <p><b>Scenario:</b> {scenario}</p>
-        <p style="color: #cbd5e1; font-size: 0.95rem;"><i>Instruction: {instruction}</i></p>
-    </div>
-    """, unsafe_allow_html=True)
+def execute_cell(idx, code):
+    try:
+        kernel = get_kernel()
+    except KernelUnavailable as e:
+        store_result(st.session_state.editor_cells[idx], make_result(str(e), "error"))
+        return
+    cell = st.session_state.editor_cells[idx]
+    # Bookkeeping for incremental Run All (see editor/graph.py), done before the
+    # run: once a Stop click has ended this script run, every st.session_state
+    # access raises again, and the result still has to be stored
+    st.session_state.exec_count = run_seq = st.session_state.get('exec_count', 0) + 1
+    st.session_state.pop(f"out_page_{cell['id']}", None)
+    profile = st.session_state.get("profile_cells", False)
+    # A Stop click (or any other full-page interaction) asks Streamlit to rerun.
+    # That request surfaces as an exception from the next st call, so the
+    # progress caption doubles as our cancellation check. Clicks inside a
+    # fragment only queue a fragment rerun, which never interrupts this one, so
+    # the Stop button is drawn outside the editor (see the sidebar).
+    status_box = st.empty()
+    output_box = st.empty()
+    live_output = OutputBuffer()
+    shown = [""]
+    started = time.time()
+    pending = []
+    def on_tick():
+        try:
+            status_box.caption(f"⏳ Running… {time.time() - started:.0f}s")
+            # Stream what the cell has printed so far (bounded by the ring buffer)
+            text = live_output.getvalue()
+            if text != shown[0]:
+                output_box.code(text)
+                shown[0] = text
+        except BaseException as e:
+            pending.append(e)
+            return True
+        return False
+    spill = new_spill_path() if SPILL_DIR else None
+    cell["running"] = True
+    try:
+        with span("cell_execution"):
+            result = kernel.run(code, on_tick=on_tick, on_output=live_output.write, profile=profile, spill=spill)
+        if result.get("spill") != spill:
+            # Not needed (short output), or left half-written by a kernel that was restarted
+            discard_spill(spill)
+        result.update(ran_hash=source_hash(code.strip()), kernel_gen=kernel.generation, run_seq=run_seq)
+        replace_output(cell, result)
+    finally:
+        cell["running"] = False
+    if pending:
+        raise pending[0]
+
+def wait_for_stopped_cells(timeout=STOP_WAIT):
+    # The Stop click's run starts while the stopped one is still unwinding;
+    # let it store the cell's result before the editor is drawn
+    cells = st.session_state.editor_cells
+    deadline = time.monotonic() + timeout
+    while any(c.get("running") for c in cells) and time.monotonic() < deadline:
+        time.sleep(0.02)
+
+def rerun_fragment():
+    # Redraw just the calling fragment. A click can still land in a full run
+    # (reruns that got merged, AppTest), where Streamlit rejects that scope.
+    ctx = get_script_run_ctx()
+    st.rerun(scope="fragment" if ctx and ctx.fragment_ids_this_run else "app")
 
+def format_bytes(n):
+    for unit in ("B", "KB", "MB", "GB"):
+        if n < 1024 or unit == "GB":
+            return f"{n:.0f} {unit}" if unit == "B" else f"{n:.1f} {unit}"
+        n /= 1024
+
+def cell_metrics(cell):
+    # "0.12s · CPU 0.10s · RSS peak 180.2 MB · traced peak 1.2 MB · +340 net blocks" for the status line
+    parts = [f"{cell.get('exec_time', 0):.2f}s"]
+    if cell.get("cpu_time") is not None:
+        parts.append(f"CPU {cell['cpu_time']:.2f}s")
+    if cell.get("peak_rss") is not None:
+        parts.append(f"RSS peak {format_bytes(cell['peak_rss'])}")
+    if cell.get("peak_memory") is not None:
+        parts.append(f"traced peak {format_bytes(cell['peak_memory'])}")
+    if cell.get("net_blocks"):
+        parts.append(f"{cell['net_blocks']:+,} net blocks")
+    return " · ".join(parts)
+
+@st.fragment
+@timed("code_editor")
 def render_code_editor():
+    # A fragment: editor actions redraw the sidebar editor only, not the lesson
+    # page; each cell is a nested fragment again (see render_cell)
     st.markdown("#### 💻 Code Editor")
+    if KERNEL_MODE != "local":
+        # Start warming workers as soon as the editor opens, before the first Run
+        get_kernel_pool()
     
     if not st.session_state.editor_cells:
         st.session_state.editor_cells = [{"id": time.time(), "input": "", "output": "", "exec_time": 0.0, "status": None}]
 
-    for i, cell in enumerate(st.session_state.editor_cells):
-        cell_id = cell.get("id", i) # Fallback to i for safety
-        # --- 1. GLOBAL TOOLBAR (ONLY ABOVE CELL 1) ---
-        if i == 0:
-            col_g1, col_g2, col_g3, col_g4 = st.columns([1.3, 1.8, 1.2, 1.2], gap="small")
-            with col_g1:
-                if st.button("➕Cell", key="global_add"):
-                    st.session_state.editor_cells.append({"id": time.time(), "input": "", "output": "", "exec_time": 0.0, "status": None})
-                    st.rerun()
-            
-            with col_g2:
-                if st.button(" ▶️All Cells", key="global_run_all"):
-                    # Execute EVERY cell in sequence
-                    for idx, c in enumerate(st.session_state.editor_cells):
-                        code = c.get("input", "").strip()
-                        if not code: continue
-                        
-                        output_capture = io.StringIO()
-                        start_time = time.time()
-                        try:
-                            with contextlib.redirect_stdout(output_capture):
-                                exec(code, st.session_state.exec_globals)
-                            
-                            exec_time = time.time() - start_time
-                            output = output_capture.getvalue()
-                            if not output:
-                                try:
-                                    res = eval(code.split('\n')[-1], st.session_state.exec_globals)
-                                    if res is not None: output = str(res)
-                                except: pass
-                            
-                            st.session_state.editor_cells[idx]["output"] = output
-                            st.session_state.editor_cells[idx]["exec_time"] = exec_time
-                            st.session_state.editor_cells[idx]["status"] = "success"
-                        except Exception:
-                            import traceback
-                            st.session_state.editor_cells[idx]["output"] = traceback.format_exc(), "error"
-                    st.rerun()
+    # --- 1. GLOBAL TOOLBAR (ABOVE CELL 1) ---
+    col_g1, col_g2, col_g3, col_g4 = st.columns([1.3, 1.8, 1.2, 1.2], gap="small")
+    with col_g1:
+        if st.button("➕Cell", key="global_add"):
+            st.session_state.editor_cells.append({"id": time.time(), "input": "", "output": "", "exec_time": 0.0, "status": None})
+            rerun_fragment()
+    
+    with col_g2:
+        if st.button(" ▶️All Cells", key="global_run_all"):
+            # Only re-run edited cells and the cells that depend on them
+            generation = getattr(st.session_state.get('kernel'), 'generation', None)
+            for idx in plan_run_all(st.session_state.editor_cells, generation):
+                execute_cell(idx, st.session_state.editor_cells[idx]["input"].strip())
+            rerun_fragment()
+
+    with col_g2 if False else col_g3: # logic for placement
+        if st.button("🧹 All", key="global_clear"):
+            for c in st.session_state.editor_cells:
+                clear_output(c)
+            rerun_fragment()
+    with col_g4:
+        if st.button("Reset", key="global_reset"):
+            for c in st.session_state.editor_cells:
+                discard_spill(c.get("spill"))
+            st.session_state.editor_cells = [{"id": time.time(), "input": "", "output": "", "exec_time": 0.0, "status": None}]
+            rerun_fragment()
+    st.checkbox("📈 Profile cells (hotspots and peak memory)", key="profile_cells",
+                help="Every run shows its time, CPU time and the kernel's peak memory (RSS). "
+                     "\"Net blocks\" is how many memory blocks the cell left allocated, "
+                     "not how many it allocated along the way. Profiling adds the slowest "
+                     "calls and the peak of Python allocations, and makes cells run slower.")
+    st.markdown("---")
+
+    for i in range(len(st.session_state.editor_cells)):
+        render_cell(i)
 
-            with col_g2 if False else col_g3: # logic for placement
-                if st.button("🧹 All", key="global_clear"):
-                    for c in st.session_state.editor_cells:
-                        c["output"], c["status"] = "", None
-                        c["exec_time"] = 0.0
-                    st.rerun()
-            with col_g4:
-                if st.button("Reset", key="global_reset"):
-                    st.session_state.editor_cells = [{"id": time.time(), "input": "", "output": "", "exec_time": 0.0, "status": None}]
-                    st.rerun()
-            st.markdown("---")
+def render_output_pager(cell):
+    # The stored output is only its head and tail; the full text is read from
+    # the spill file one page at a time, and only once asked for
+    path, key = cell["spill"], f"out_page_{cell['id']}"
+    if not os.path.exists(path):
+        return
+    page = st.session_state.get(key)
+    if page is None:
+        if st.button(f"📜 Show more ({cell.get('output_size', 0):,} characters)", key=f"more_{cell['id']}"):
+            st.session_state[key] = 0
+            rerun_fragment()
+        return
+    pages = spill_pages(path)
+    page = min(page, pages - 1)
+    st.code(read_spill(path, page))
+    col_prev, col_page, col_next, col_hide = st.columns([1, 1.5, 1, 1], gap="small")
+    col_page.caption(f"Page {page + 1} / {pages}")
+    if col_prev.button("◀", key=f"page_prev_{cell['id']}", disabled=page == 0):
+        st.session_state[key] = page - 1
+        rerun_fragment()
+    if col_next.button("▶", key=f"page_next_{cell['id']}", disabled=page >= pages - 1):
+        st.session_state[key] = page + 1
+        rerun_fragment()
+    if col_hide.button("Hide", key=f"page_hide_{cell['id']}"):
+        del st.session_state[key]
+        rerun_fragment()
 
-        # --- 2. CELL HEADER (In [ ] and individual Delete) ---
-        hdr1, hdr2 = st.columns([5, 1])
-        with hdr1:
-            st.markdown(f"<p style='color: #5cb9ff; font-family: monospace; font-size: 0.8rem; margin: 0;'>In [{i+1 if cell.get('status') else ' '}]</p>", unsafe_allow_html=True)
-        with hdr2:
-            if len(st.session_state.editor_cells) > 1:
-                if st.button("🗑️", key=f"del_cell_{cell_id}"):
-                    st.session_state.editor_cells.pop(i)
-                    st.rerun()
+@st.fragment
+def render_cell(i):
+    from streamlit_ace import st_ace
+    cell = st.session_state.editor_cells[i]
+    cell_id = cell.get("id", i) # Fallback to i for safety
+    # --- 2. CELL HEADER (In [ ] and individual Delete) ---
+    hdr1, hdr2 = st.columns([5, 1])
+    with hdr1:
+        st.markdown(f"<p style='color: #5cb9ff; font-family: monospace; font-size: 0.8rem; margin: 0;'>In [{i+1 if cell.get('status') else ' '}]</p>", unsafe_allow_html=True)
+    with hdr2:
+        if len(st.session_state.editor_cells) > 1:
+            if st.button("🗑️", key=f"del_cell_{cell_id}"):
+                discard_spill(st.session_state.editor_cells.pop(i).get("spill"))
+                # Renumbers the cells below, so the whole editor has to redraw
+                st.rerun()
 
-        # --- 3. CODE EDITOR (Inside a Form to kill Red Button & Typing Refreshes) ---
-        input_text = cell.get("input", "")
-        line_count = input_text.count('\n') + 1
-        # Allow growth up to 2000px, min 100px
-        dynamic_height = max(100, min(2000, line_count * 24 + 40))
+    # --- 3. CODE EDITOR (Inside a Form to kill Red Button & Typing Refreshes) ---
+    input_text = cell.get("input", "")
+    line_count = input_text.count('\n') + 1
+    # Allow growth up to 2000px, min 100px
+    dynamic_height = max(100, min(2000, line_count * 24 + 40))
+    
+    with st.form(key=f"cell_form_{cell_id}", clear_on_submit=False):
+        # auto_update=True hides the red button
+        # st.form blocks the typing-reruns
+        cell_input = st_ace(
+            value=input_text,
+            placeholder="Write code here...",
+            language="python",
+            theme="monokai",
+            key=f"ace_editor_stable_{cell_id}",
+            height=dynamic_height,
+            font_size=14,
+            wrap=False,
+            auto_update=True
+        )
         
-        with st.form(key=f"cell_form_{cell_id}", clear_on_submit=False):
-            # auto_update=True hides the red button
-            # st.form blocks the typing-reruns
-            cell_input = st_ace(
-                value=input_text,
-                placeholder="Write code here...",
-                language="python",
-                theme="monokai",
-                key=f"ace_editor_stable_{cell_id}",
-                height=dynamic_height,
-                font_size=14,
-                wrap=False,
-                auto_update=True
-            )
-            
-            # --- 4. BUTTONS (Inside the Form) ---
-            # Using columns to put Run on left and Clear on far right
-            b_col1, b_spacer, b_col2 = st.columns([1, 2, 1.5], gap="small")
-            with b_col1:
-                run_clicked = st.form_submit_button("▶️ Run")
-            with b_col2:
-                clear_clicked = st.form_submit_button("🧹 Clear")
+        # --- 4. BUTTONS (Inside the Form) ---
+        # Using columns to put Run on left and Clear on far right
+        b_col1, b_spacer, b_col2 = st.columns([1, 2, 1.5], gap="small")
+        with b_col1:
+            run_clicked = st.form_submit_button("▶️ Run")
+        with b_col2:
+            clear_clicked = st.form_submit_button("🧹 Clear")
 
-        # --- 3. ACTION LOGIC ---
-        if run_clicked:
-            st.session_state.editor_cells[i]["input"] = cell_input
-            output_capture = io.StringIO()
-            start_time = time.time()
-            try:
-                with contextlib.redirect_stdout(output_capture):
-                    exec(cell_input, st.session_state.exec_globals)
-                exec_time = time.time() - start_time
-                output = output_capture.getvalue()
-                if not output:
-                    try:
-                        res = eval(cell_input.strip().split('\n')[-1], st.session_state.exec_globals)
-                        if res is not None: output = str(res)
-                    except: pass
-                st.session_state.editor_cells[i]["output"], st.session_state.editor_cells[i]["exec_time"], st.session_state.editor_cells[i]["status"] = output, exec_time, "success"
-            except Exception:
-                import traceback
-                st.session_state.editor_cells[i]["output"], st.session_state.editor_cells[i]["status"] = traceback.format_exc(), "error"
-            st.rerun()
-            
-        elif clear_clicked:
-            st.session_state.editor_cells[i]["input"] = cell_input
-            st.session_state.editor_cells[i]["output"] = ""
-            st.session_state.editor_cells[i]["status"] = None
-            st.session_state.editor_cells[i]["exec_time"] = 0.0
-            st.rerun()
-            
-        # Display Output
-        if cell.get("output"):
-            if cell.get("status") == "success":
-                st.markdown(f"✅ <span style='color: #10b981; font-size: 0.8rem;'>{cell.get('exec_time', 0):.2f}s</span>", unsafe_allow_html=True)
+    # --- 3. ACTION LOGIC ---
+    if run_clicked:
+        st.session_state.editor_cells[i]["input"] = cell_input
+        execute_cell(i, cell_input)
+        # Only this cell redraws; the rest of the page keeps what it showed
+        rerun_fragment()
+        
+    elif clear_clicked:
+        st.session_state.editor_cells[i]["input"] = cell_input
+        clear_output(st.session_state.editor_cells[i])
+        rerun_fragment()
+        
+    # Display Output
+    if cell.get("output") or cell.get("figures"):
+        if cell.get("status") == "success":
+            st.markdown(f"✅ <span style='color: #10b981; font-size: 0.8rem;'>{cell_metrics(cell)}</span>", unsafe_allow_html=True)
+            if cell.get("output"):
                 st.code(cell["output"])
-            elif cell.get("status") == "error":
-                st.error(cell.get("output", "Unknown error"))
-        
-        st.markdown("<hr style='margin: 15px 0; border: 0; border-top: 1px solid #333;'>", unsafe_allow_html=True)
+        elif cell.get("status") == "error":
+            st.error(cell.get("output", "Unknown error"))
+        elif cell.get("status") in ("timeout", "interrupted"):
+            icon = "⏱" if cell["status"] == "timeout" else "⏹"
+            st.markdown(f"{icon} <span style='color: #f59e0b; font-size: 0.8rem;'>{cell['status']} after {cell.get('exec_time', 0):.2f}s</span>", unsafe_allow_html=True)
+            st.code(cell["output"])
+        if cell.get("spill"):
+            render_output_pager(cell)
+        # Encoded once by the kernel; reruns just resend the stored bytes
+        for fig in cell.get("figures", []):
+            st.image(fig)
+        if cell.get("profile"):
+            with st.expander("📈 Profile hotspots"):
+                st.code(cell["profile"])
+    
+    st.markdown("<hr style='margin: 15px 0; border: 0; border-top: 1px solid #333;'>", unsafe_allow_html=True)
 
 
 # --- SIDEBAR NAVIGATION ---
-with st.sidebar:
+with st.sidebar, span("sidebar"):
     st.markdown("<h3 style='margin-bottom: 0;'>📊 Master APDV Module</h3>", unsafe_allow_html=True)
     
     # Toggle and Progress together
@@ -536,77 +347,18 @@ with st.sidebar:
             st.rerun()
     
     with col_prog:
-        total_exercises = 25 
-        completed_exercises = len(st.session_state.progress)
-        progress_percentage = completed_exercises / total_exercises
+        completed_exercises = progress.store().completed(st.session_state.learner_id).bit_count()
+        progress_percentage = completed_exercises / chapters.TOTAL_EXERCISES
         st.progress(progress_percentage)
         st.caption(f"Progress: {int(progress_percentage*100)}%")
     
-    chapters = {
-        "Welcome": ["Overview"],
-        "CH 1: Python Foundations": ["Deep Dive"],
-        "CH 2: Data Ingestion (ETL)": ["Deep Dive"],
-        "CH 3: Data Cleaning": ["Deep Dive"],
-        "CH 4: SQL Management": ["Deep Dive"],
-        "CH 5: Visual Insights": ["Deep Dive"],
-        "CH 6: CA Practice Lab": ["Deep Dive"],
-        "Final Project": ["Retail Pipeline"]
-    }
-    
-    ch_options = list(chapters.keys())
+    ch_options = list(chapters.sidebar_index())
     try:
         curr_idx = ch_options.index(st.session_state.current_chapter)
     except:
         curr_idx = 0
         
-    # Disable typing in selectbox - make it dropdown-only
-    st.markdown("""
-    <style>
-        /* Completely disable text input in selectbox */
-        div[data-testid="stSelectbox"] input {
-            pointer-events: none !important;
-            caret-color: transparent !important;
-            cursor: pointer !important;
-            user-select: none !important;
-            -webkit-user-select: none !important;
-            -moz-user-select: none !important;
-            -ms-user-select: none !important;
-        }
-        /* Prevent keyboard events */
-        div[data-testid="stSelectbox"] input:focus {
-            outline: none !important;
-        }
-        /* Make entire selectbox clickable */
-        div[data-testid="stSelectbox"] {
-            cursor: pointer !important;
-        }
-        /* Hide the blinking cursor */
-        div[data-testid="stSelectbox"] input::selection {
-            background: transparent !important;
-        }
-        /* Disable input editing completely */
-        div[data-testid="stSelectbox"] input {
-            -webkit-touch-callout: none !important;
-            -webkit-user-modify: read-only !important;
-        }
-    </style>
-    <script>
-        // JavaScript to completely disable keyboard input
-        document.addEventListener('DOMContentLoaded', function() {
-            const observer = new MutationObserver(function(mutations) {
-                const selectInputs = document.querySelectorAll('div[data-testid="stSelectbox"] input');
-                selectInputs.forEach(input => {
-                    input.setAttribute('readonly', 'readonly');
-                    input.addEventListener('keydown', (e) => e.preventDefault());
-                    input.addEventListener('keypress', (e) => e.preventDefault());
-                    input.addEventListener('keyup', (e) => e.preventDefault());
-                    input.addEventListener('input', (e) => e.preventDefault());
-                });
-            });
-            observer.observe(document.body, { childList: true, subtree: true });
-        });
-    </script>
-    """, unsafe_allow_html=True)
+    # Dropdown-only (no typing): see selectbox.css / selectbox.js
     
     ch_selected = st.selectbox("Select Chapter", ch_options, index=curr_idx, label_visibility="collapsed", disabled=False, key="chapter_selector")
     st.session_state.current_chapter = ch_selected
@@ -615,6 +367,9 @@ with st.sidebar:
     
     # Code Editor in Sidebar
     if st.session_state.show_editor:
+        # Outside the editor fragment, so a click preempts a running cell (see execute_cell)
+        if st.button("⏹ Stop running cell", key="stop_cell"):
+            wait_for_stopped_cells()
         render_code_editor()
     else:
         st.info("💡 Click 'Show Code'   to open the editor here!")
@@ -622,956 +377,5 @@ with st.sidebar:
 # --- MAIN LAYOUT ---
 main_col = st.container()
 
-def app_content():
-    # --- CHAPTER: WELCOME ---
-    if st.session_state.current_chapter == "Welcome":
-        st.markdown("<h1>Analytics Programming Mastery</h1>", unsafe_allow_html=True)
-        st.write("### The most structured way to learn Data Engineering & Visualization.")
-        
-        col1, col2 = st.columns([2, 1])
-        with col1:
-            st.markdown("""
-            <div class="lesson-card">
-                <h3>How to use this course:</h3>
-                <ol>
-                    <li><b>Learn</b>: Read the high-level theory for each sub-topic.</li>
-                    <li><b>Solve</b>: Complete the micro-quiz immediately after reading.</li>
-                    <li><b>Progress</b>: Use the slider at the top of each chapter to move through topics.</li>
-                    <li><b>Task</b>: Every chapter ends with a coding challenge that tests everything you've learned.</li>
-                    <li><b>CA Lab</b>: A dedicated section for Continuous Assessment (CA) practice with real past exam logic.</li>
-                </ol>
-                <p style="color: #ffcc00; font-weight: bold;">Select "CH 1: Python Foundations" in the sidebar to begin!</p>
-            </div>
-            """, unsafe_allow_html=True)
-            
-            if st.button("Start Chapter 1 →", type="primary"):
-                st.session_state.current_chapter = "CH 1: Python Foundations"
-                st.session_state.ch1_step = "1.1 Scalar Types"
-                st.rerun()
-    
-    # --- CHAPTER 1: FOUNDATIONS ---
-    elif st.session_state.current_chapter == "CH 1: Python Foundations":
-        st.markdown("<h1>Chapter 1: Python Foundations</h1>", unsafe_allow_html=True)
-        
-        # Internal Chapter Navigation (Step-by-Step)
-        ch1_steps = ["1.1 Scalar Types", "1.2 Operators & Logic", "1.3 String Mastery", "1.4 Collections", "🏆 Chapter 1 Challenge"]
-        step = st.select_slider("Chapter Progress", options=ch1_steps, value=st.session_state.get('ch1_step', "1.1 Scalar Types"))
-        st.session_state.ch1_step = step
-    
-        if step == "1.1 Scalar Types":
-            st.markdown("### 🧬 1.1 Understanding Scalar Types")
-            st.write("""
-            In Python, **Scalars** are the most basic units of data. Think of them as the "atoms" of your code. 
-            Before you can analyze sales trends or customer behavior, you must understand exactly how Python stores this information.
-            """)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("""
-                #### The Four Core Pillars:
-                1. **Integers (`int`)**: Whole numbers. Used for counting (e.g., `num_customers = 50`).
-                2. **Floats (`float`)**: Decimal numbers. Used for precision (e.g., `conversion_rate = 0.087`).
-                3. **Strings (`str`)**: Text. Always wrapped in quotes (e.g., `name = "Alice"`).
-                4. **Booleans (`bool`)**: Logical switches. Either `True` or `False`.
-                """)
-            
-            with col2:
-                st.markdown("""
-                #### 💡 Pro Tip: Coercion
-                Sometimes data arrives in the wrong format (like a number inside a string). 
-                We use **Coercion** to fix this:
-                - `int("100")` → `100`
-                - `str(42)` → `"42"`
-                - `float("19.99")` → `19.99`
-                """)
-    
-            st.info("⚠️ **The Boolean Quirk**: In Python, almost anything has a boolean value. `bool(\"False\")` is actually **True** because the string is not empty!")
-    
-            # QUIZ 1.1
-            st.markdown("---")
-            exercise_container(
-                "Quick Check: Coercion", 
-                "beginner", 
-                "You are importing a CSV where the 'price' column is loaded as text: `'1250.50'`.",
-                "Write the function call to convert this string into a number that supports decimals."
-            )
-            q1_1 = st.text_input("code: corrected_price = ____('1250.50')", key="q1_1")
-            
-            # Initialize session state for this quiz
-            if 'q1_1_correct' not in st.session_state:
-                st.session_state.q1_1_correct = False
-            
-            if st.button("✓ Submit Answer", key="submit_q1_1", type="primary"):
-                if q1_1.strip().lower() == "float":
-                    st.success("✅ Correct! `float` is the right choice for decimal values.")
-                    mark_completed("CH1", "1.1", "quiz")
-                    st.session_state.q1_1_correct = True
-                else:
-                    st.error("Not quite. Try again! Hint: Which data type handles decimal numbers?")
-                    st.session_state.q1_1_correct = False
-            
-            # Show navigation button if answer is correct
-            if st.session_state.q1_1_correct:
-                if st.button("Move to Next Topic →", key="nav_q1_1", type="secondary"):
-                    st.session_state.ch1_step = "1.2 Operators & Logic"
-                    st.session_state.q1_1_correct = False  # Reset
-                    st.rerun()
-    
-        elif step == "1.2 Operators & Logic":
-            st.markdown("### 🧮 1.2 Operators & Logical Flow")
-            st.write("""
-            Operators allow you to perform calculations and make comparisons. In Data Analytics, 
-            you'll use these to filter datasets (e.g., "Find all sales > $500").
-            """)
-            
-            st.markdown("""
-            | Operator | Description | Example |
-            | :--- | :--- | :--- |
-            | `+`, `-`, `*`, `/` | Basic Math | `total = price * qty` |
-            | `//` | Floor Division | `20 // 3` gives `6` |
-            | `%` | Modulo (Remainder) | `20 % 3` gives `2` |
-            | `==`, `!=` | Equality check | `status == "shipped"` |
-            | `>`, `<` | Comparison | `age >= 18` |
-            """)
-    
-            st.markdown("#### Logical Gates: `and`, `or`, `not` ")
-            st.write("Use these to combine multiple conditions. For a customer to get a discount, they might need to be (Age > 65) **or** (Member == True).")
-    
-            # QUIZ 1.2
-            st.markdown("---")
-            exercise_container(
-                "The Discount Logic", 
-                "beginner", 
-                "You are writing a script for a loyalty program. A user gets a reward if their `points` are over 1000 AND they are an `active` member.",
-                "Choose the correct logical operator to combine these conditions."
-            )
-            q1_2 = st.radio("Selection:", ["and", "or", "not"], key="q1_2", index=None)
-            
-            if 'q1_2_correct' not in st.session_state:
-                st.session_state.q1_2_correct = False
-            
-            if st.button("✓ Submit Answer", key="submit_q1_2", type="primary"):
-                if q1_2 == "and":
-                    st.success("✅ Correct! Both conditions must be True.")
-                    mark_completed("CH1", "1.2", "quiz")
-                    st.session_state.q1_2_correct = True
-                else:
-                    st.error("Not quite. Think about when BOTH conditions need to be satisfied.")
-                    st.session_state.q1_2_correct = False
-            
-            if st.session_state.q1_2_correct:
-                if st.button("Move to Next Topic →", key="nav_q1_2", type="secondary"):
-                    st.session_state.ch1_step = "1.3 String Mastery"
-                    st.session_state.q1_2_correct = False
-                    st.rerun()
-    
-        elif step == "1.3 String Mastery":
-            st.markdown("### ✍️ 1.3 String Manipulation")
-            st.write("""
-            Data is often "noisy." Customer names might have extra spaces, or emails might be in all caps. 
-            Python's string methods are your first line of defense in data cleaning.
-            """)
-            
-            st.markdown("""
-            #### Key String Methods:
-            - `.strip()`: Removes leading/trailing whitespace.
-            - `.lower()` / `.upper()`: Standardizes case.
-            - `.replace("old", "new")`: Swaps text.
-            - `.split(",")`: Turns a string into a list (great for CSV lines).
-            - **f-strings**: `f"Hello {name}"` is the cleanest way to insert variables into text.
-            """)
-    
-            # INDEXING & SLICING
-            st.code("""
-    text = "PYTHON"
-    # Indexing starts at 0
-    print(text[0]) # 'P'
-    # Slicing [start:end_exclusive]
-    print(text[0:2]) # 'PY'
-            """)
-    
-            # QUIZ 1.3
-            st.markdown("---")
-            exercise_container(
-                "Cleaning Customer Names", 
-                "beginner", 
-                "A user entered their name as `'  JOHN SMITH  '`. You need to remove the spaces and make it `'John Smith'`.",
-                "Which two methods would you chain together? (e.g. name.method1().method2())"
-            )
-            q1_3 = st.text_input("code: clean_name = raw_name.____().title()", key="q1_3")
-            
-            if 'q1_3_correct' not in st.session_state:
-                st.session_state.q1_3_correct = False
-            
-            if st.button("✓ Submit Answer", key="submit_q1_3", type="primary"):
-                if q1_3.strip().lower() == "strip":
-                    st.success("✅ Perfect! `.strip()` removes the spaces, and `.title()` capitalizes the first letters.")
-                    mark_completed("CH1", "1.3", "quiz")
-                    st.session_state.q1_3_correct = True
-                else:
-                    st.error("Not quite. Which method removes leading and trailing whitespace?")
-                    st.session_state.q1_3_correct = False
-            
-            if st.session_state.q1_3_correct:
-                if st.button("Move to Next Topic →", key="nav_q1_3", type="secondary"):
-                    st.session_state.ch1_step = "1.4 Collections"
-                    st.session_state.q1_3_correct = False
-                    st.rerun()
-    
-        elif step == "1.4 Collections":
-            st.markdown("### 📚 1.4 Collections: Lists & Dictionaries")
-            st.write("""
-            In Analytics, we rarely work with one number at a time. We work with **collections** of data.
-            """)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("#### Lists (`[]`)")
-                st.write("An ordered sequence. Good for column data or time-series.")
-                st.code("""
-    sales = [100, 250, 300]
-    sales.append(400) # Add
-    sales[0] # Access 1st
-                """)
-            with col2:
-                st.markdown("#### Dictionaries (`{}` )")
-                st.write("Key-value pairs. Perfect for structured records.")
-                st.code("""
-    user = {"name": "Alice", "id": 1}
-    print(user["name"]) # "Alice"
-                """)
-    
-            # QUIZ 1.4
-            st.markdown("---")
-            exercise_container(
-                "Accessing the Data", 
-                "intermediate", 
-                "You have a nested dictionary: `data = {'users': [{'name': 'Bob'}]}`.",
-                "How would you access the name 'Bob'?"
-            )
-            q1_4 = st.text_input("code: target = data['users'][0][____]", key="q1_4")
-            
-            if 'q1_4_correct' not in st.session_state:
-                st.session_state.q1_4_correct = False
-            
-            if st.button("✓ Submit Answer", key="submit_q1_4", type="primary"):
-                if q1_4.strip() in ["'name'", '"name"']:
-                    st.success("✅ Excellent! You navigated the list inside the dictionary.")
-                    mark_completed("CH1", "1.4", "quiz")
-                    st.session_state.q1_4_correct = True
-                else:
-                    st.error("Not quite. Remember to include quotes around the dictionary key!")
-                    st.session_state.q1_4_correct = False
-            
-            if st.session_state.q1_4_correct:
-                if st.button("Go to Chapter Challenge →", key="nav_q1_4", type="secondary"):
-                    st.session_state.ch1_step = "🏆 Chapter 1 Challenge"
-                    st.session_state.q1_4_correct = False
-                    st.rerun()
-    
-        elif step == "🏆 Chapter 1 Challenge":
-            st.markdown("### 🏆 Chapter 1 Final Task")
-            st.markdown("""
-            <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
-            <b>The Scenario:</b> You are a Junior Data Engineer. You've been given a messy string containing a customer's record:
-            <code>"  ID:001 | NAME:ALICE | SPENT:150.50  "</code><br><br>
-            
-            <b>Your Task:</b> Write a script that:
-            1. Removes the extra spaces from the string.
-            2. Splits the string by the <code>|</code> character.
-            3. Extracts the 'SPENT' value and converts it to a <b>float</b>.
-            4. Calculates a 10% tax on that value.
-            </div>
-            """, unsafe_allow_html=True)
-            
-            raw_data = "  ID:001 | NAME:ALICE | SPENT:150.50  "
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.code(f"data = \"{raw_data}\"")
-                user_code = st.text_area("Write your solution (Python):", height=200, placeholder="clean_data = ...\nparts = ...\nspent = ...\ntax = ...")
-            
-            with col2:
-                if st.button("Submit Project"):
-                    # Basic validation logic (looking for keywords)
-                    if ".strip()" in user_code and ".split('|')" in user_code and "float" in user_code:
-                        st.success("🎊 AMAZING! You've combined everything from Chapter 1.")
-                        st.balloons()
-                        mark_completed("CH1", "TASK", "final")
-                        
-                        if st.button("Move to Chapter 2 →", type="primary"):
-                            st.session_state.current_chapter = "CH 2: Data Ingestion (ETL)"
-                            st.session_state.ch2_step = "2.1 pandas I/O"
-                            st.rerun()
-                    else:
-                        st.error("Not quite. Remember to use `.strip()`, `.split('|')`, and `float()`.")
-    
-    # --- CHAPTER 2: DATA INGESTION (ETL) ---
-    elif st.session_state.current_chapter == "CH 2: Data Ingestion (ETL)":
-        st.markdown("<h1>Chapter 2: Data Ingestion (ETL)</h1>", unsafe_allow_html=True)
-        
-        ch2_steps = ["2.1 pandas I/O", "2.2 API Connection", "🏆 Chapter 2 Challenge"]
-        step = st.select_slider("Chapter Progress", options=ch2_steps, value=st.session_state.get('ch2_step', "2.1 pandas I/O"))
-        st.session_state.ch2_step = step
-    
-        if step == "2.1 pandas I/O":
-            st.markdown("### 📊 2.1 The Gateway to pandas")
-            st.write("""
-            `pandas` is the standard library for data engineering in Python. It allows you to transform raw files 
-            (like CSV or Excel) into high-performance **DataFrames**.
-            """)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("""
-                #### Core Ingestion Functions:
-                - `pd.read_csv("file.csv")`: The bread and butter of data loading.
-                - `pd.read_json("file.json")`: For structured web data.
-                - `pd.read_excel("file.xlsx")`: For business reports.
-                """)
-            with col2:
-                st.markdown("""
-                #### First Inspection Tools:
-                - `df.head()`: See top rows.
-                - `df.info()`: Check data types and nulls.
-                - `df.describe()`: Get statistical snapshots.
-                """)
-    
-            st.code("""
-    import pandas as pd
-    df = pd.read_csv("sales.csv", index_col=0)
-    print(df.info())
-            """)
-    
-            # QUIZ 2.1
-            st.markdown("---")
-            exercise_container(
-                "The Structural Audit", 
-                "beginner", 
-                "You've loaded a file and notice some columns have missing values. You need to see which columns are mostly empty.",
-                "Which method provides the count of non-null values for every column?"
-            )
-            q2_1 = st.radio("Selection:", ["df.head()", "df.info()", "df.describe()"], key="q2_1", index=None)
-            if st.button("✓ Submit Answer", key="submit_q2_1", type="primary"):
-                if q2_1 == "df.info()":
-                    st.success("Correct! `info()` reveals the 'Non-Null Count' for each column.")
-                    mark_completed("CH2", "2.1", "quiz")
-                    if st.button("Next: API Connection →"):
-                        st.session_state.ch2_step = "2.2 API Connection"
-                        st.rerun()
-                else:
-                    st.error("Not quite. Which method shows detailed column information including non-null counts?")
-    
-        elif step == "2.2 API Connection":
-            st.markdown("### 🌐 2.2 Fetching Live Data (APIs)")
-            st.write("""
-            APIs allow you to request data directly from a server. This is how you get live stock prices, 
-            weather updates, or social media trends.
-            """)
-            
-            st.markdown("""
-            #### The requests workflow:
-            1. **GET**: Ask the server for data via a URL.
-            2. **Status**: Check if the code is `200` (OK).
-            3. **JSON**: Convert the response to a Python-usable format with `.json()`.
-            """)
-            
-            st.info("💡 **Common Status Codes:**\n- `200`: Success\n- `401`: Access Denied (Bad API Key)\n- `404`: Not Found\n- `500`: Server Error")
-    
-            # QUIZ 2.2
-            st.markdown("---")
-            exercise_container(
-                "The API Diagnostic", 
-                "beginner", 
-                "Your weather script failed. The status code returned is 404.",
-                "What does a 404 error usually mean?"
-            )
-            q2_2 = st.radio("Selection:", ["Success", "Authentication Link Broken", "The resource/URL does not exist"], key="q2_2", index=None)
-            if st.button("✓ Submit Answer", key="submit_q2_2", type="primary"):
-                if q2_2 == "The resource/URL does not exist":
-                    st.success("Correct! 404 is 'Not Found'.")
-                    mark_completed("CH2", "2.2", "quiz")
-                    if st.button("Final Chapter Challenge! →"):
-                        st.session_state.ch2_step = "🏆 Chapter 2 Challenge"
-                        st.rerun()
-                else:
-                    st.error("Not quite. What does a 404 status code typically mean in HTTP?")
-    
-        elif step == "🏆 Chapter 2 Challenge":
-            st.markdown("### 🏆 Chapter 2 Final Task")
-            st.markdown("""
-            <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
-            <b>The Scenario:</b> You are building an ETL pipeline. You need to load a CSV and get a statistical summary.<br><br>
-            
-            <b>Your Task:</b> Write the code to:
-            1. Import pandas.
-            2. Load <code>"retail_sales.csv"</code> as a DataFrame called <code>sales_df</code>.
-            3. Print the statistical summary (mean, max, min, etc.) of the DataFrame.
-            </div>
-            """, unsafe_allow_html=True)
-            
-            user_code_2 = st.text_area("Write your solution (Python):", height=200, key="task2", placeholder="import ...\nsales_df = ...\n...")
-            
-            if st.button("Submit Project"):
-                if "import pandas" in user_code_2 and "read_csv" in user_code_2 and "describe()" in user_code_2:
-                    st.success("🎉 HEROIC! You've mastered Data Ingestion.")
-                    st.balloons()
-                    mark_completed("CH2", "TASK", "final")
-                    
-                    if st.button("Move to Chapter 3 →", type="primary"):
-                        st.session_state.current_chapter = "CH 3: Data Cleaning"
-                        st.session_state.ch3_step = "3.1 Regex Mastery"
-                        st.rerun()
-                else:
-                    st.error("Check your code! Did you use `read_csv` and `describe()`?")
-    
-    # --- CHAPTER 3: DATA CLEANING ---
-    elif st.session_state.current_chapter == "CH 3: Data Cleaning":
-        st.markdown("<h1>Chapter 3: Data Cleaning & Extraction</h1>", unsafe_allow_html=True)
-        
-        ch3_steps = ["3.1 Regex Mastery", "3.2 Web Scraping", "🏆 Chapter 3 Challenge"]
-        step = st.select_slider("Chapter Progress", options=ch3_steps, value=st.session_state.get('ch3_step', "3.1 Regex Mastery"))
-        st.session_state.ch3_step = step
-    
-        if step == "3.1 Regex Mastery":
-            st.markdown("### 🔍 3.1 Regex for Data Cleaning")
-            st.write("""
-            **Regular Expressions** (Regex) are patterns used to match character combinations in strings. 
-            In data analysis, they are indispensable for extracting information from messy text.
-            """)
-            
-            st.markdown(r"""
-            #### Common Regex Symbols:
-            - `\d`: Matches any digit (0-9).
-            - `\w`: Matches any alphanumeric character.
-            - `\s`: Matches any whitespace (spaces, tabs).
-            - `+`: Matches 1 or more of the preceding character.
-            - `*`: Matches 0 or more of the preceding character.
-            - `.` : Matches any character except newline.
-            """)
-    
-            st.code("""
-    import re
-    text = "Contact us at 555-1234"
-    # Extract phone
-    pattern = r"\d{3}-\d{4}"
-    print(re.findall(pattern, text))
-            """)
-    
-            # QUIZ 3.1
-            st.markdown("---")
-            exercise_container(
-                "The Digit Hunter", 
-                "intermediate", 
-                "You have a string of mixed data: `'User_ID_9921_Logged'`. You want to extract only the digits.",
-                "Choose the correct regex pattern to find all sequences of digits."
-            )
-            q3_1 = st.radio("Selection:", [r"\w+", r"\d+", r"\s+"], key="q3_1", index=None)
-            if st.button("✓ Submit Answer", key="submit_q3_1", type="primary"):
-                if q3_1 == r"\d+":
-                    st.success(r"Correct! `\d+` matches one or more consecutive digits.")
-                    mark_completed("CH3", "3.1", "quiz")
-                    if st.button("Next: Web Scraping →"):
-                        st.session_state.ch3_step = "3.2 Web Scraping"
-                        st.rerun()
-                else:
-                    st.error("Not quite. Which regex pattern specifically matches digits?")
-    
-        elif step == "3.2 Web Scraping":
-            st.markdown("### 🕸️ 3.2 Web Scraping with BeautifulSoup")
-            st.write("""
-            Web scraping is the automated process of extracting data from websites. 
-            `BeautifulSoup` is the go-to library for parsing HTML.
-            """)
-            
-            st.markdown("""
-            #### The Scraping Flow:
-            1. Fetch HTML using `requests`.
-            2. Create a "Soup" object: `soup = BeautifulSoup(html, 'html.parser')`.
-            3. Find elements using `.find()` or `.find_all()`.
-            """)
-            
-            st.warning("⚖️ **Ethics**: Always check a site's `robots.txt` before scraping. Don't spam the server with requests!")
-    
-            # QUIZ 3.2
-            st.markdown("---")
-            exercise_container(
-                "The Class Identifier", 
-                "beginner", 
-                "You are trying to find a `div` tag that has a CSS class called 'price-tag'.",
-                "How do you specify the class in the `.find()` method?"
-            )
-            q3_2 = st.radio("Selection:", ["class='price-tag'", "class_='price-tag'", "id='price-tag'"], key="q3_2", index=None)
-            if st.button("✓ Submit Answer", key="submit_q3_2", type="primary"):
-                if q3_2 == "class_='price-tag'":
-                    st.success("Exactly! We use `class_` because `class` is a reserved word in Python.")
-                    mark_completed("CH3", "3.2", "quiz")
-                    if st.button("Final Chapter Challenge! →"):
-                        st.session_state.ch3_step = "🏆 Chapter 3 Challenge"
-                        st.rerun()
-                else:
-                    st.error("Not quite. Remember that 'class' is a keyword in Python, so BeautifulSoup uses a variation.")
-    
-        elif step == "🏆 Chapter 3 Challenge":
-            st.markdown("### 🏆 Chapter 3 Final Task")
-            st.markdown("""
-            <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
-            <b>The Scenario:</b> You have scraped a product description: <code>"The UltraBook 5000 is on sale for $1,299.99 today!"</code>.<br><br>
-            
-            <b>Your Task:</b> Code a regex pattern to extract the price.
-            1. Use <code>re.findall()</code>.
-            2. Pattern should look for the dollar sign and digits.
-            </div>
-            """, unsafe_allow_html=True)
-            
-            user_code_3 = st.text_area("Write your solution (Python):", height=200, key="task3")
-            
-            if st.button("Submit Project"):
-                if "re.findall" in user_code_3 and "\\$" in user_code_3 and "\\d" in user_code_3:
-                    st.success("🎉 SPOT ON! Your cleaning skills are top-tier.")
-                    st.balloons()
-                    mark_completed("CH3", "TASK", "final")
-                    
-                    if st.button("Move to Chapter 4 →", type="primary"):
-                        st.session_state.current_chapter = "CH 4: SQL Management"
-                        st.session_state.ch4_step = "4.1 SQL Basics"
-                        st.rerun()
-                else:
-                    st.error("Try again! Make sure to escape the dollar sign using `\\$` in your pattern.")
-    
-    # --- CHAPTER 4: SQL MANAGEMENT ---
-    elif st.session_state.current_chapter == "CH 4: SQL Management":
-        st.markdown("<h1>Chapter 4: SQL Management</h1>", unsafe_allow_html=True)
-        
-        ch4_steps = ["4.1 SQL Basics", "4.2 Joins & Keys", "🏆 Chapter 4 Challenge"]
-        step = st.select_slider("Chapter Progress", options=ch4_steps, value=st.session_state.get('ch4_step', "4.1 SQL Basics"))
-        st.session_state.ch4_step = step
-    
-        if step == "4.1 SQL Basics":
-            st.markdown("### 🗄️ 4.1 Introduction to SQL")
-            st.write("""
-            SQL (Structured Query Language) is used to communicate with databases. Unlike Python, 
-            which focuses on *how* to do something, SQL focuses on *what* data you want.
-            """)
-            
-            col1, col2 = st.columns(2)
-            with col1:
-                st.markdown("""
-                #### Primary Keywords:
-                - `SELECT`: Choose your columns.
-                - `FROM`: Choose your table.
-                - `WHERE`: Filter your rows.
-                - `ORDER BY`: Sort your results.
-                """)
-            with col2:
-                st.markdown("""
-                #### Examples:
-                `SELECT * FROM users;`  
-                `SELECT name FROM sales WHERE revenue > 1000;`
-                """)
-    
-            # QUIZ 4.1
-            st.markdown("---")
-            exercise_container(
-                "Filtering the Database", 
-                "beginner", 
-                "You need to find all orders where the amount is less than $50.",
-                "Choose the correct SQL clause to apply this filter."
-            )
-            q4_1 = st.radio("Selection:", ["LIMIT 50", "WHERE amount < 50", "ORDER BY 50"], key="q4_1", index=None)
-            if st.button("✓ Submit Answer", key="submit_q4_1", type="primary"):
-                if q4_1 == "WHERE amount < 50":
-                    st.success("Correct! `WHERE` is the universal filter in SQL.")
-                    mark_completed("CH4", "4.1", "quiz")
-                    if st.button("Next: Joins & Keys →"):
-                        st.session_state.ch4_step = "4.2 Joins & Keys"
-                        st.rerun()
-                else:
-                    st.error("Not quite. Which SQL clause is used to filter rows based on conditions?")
-    
-        elif step == "4.2 Joins & Keys":
-            st.markdown("### 🔗 4.2 Relationships & Joins")
-            st.write("""
-            Relational databases work by splitting data into multiple tables and linking them using **Keys**.
-            """)
-            
-            st.markdown("""
-            - **Primary Key**: A unique ID for every row in a table.
-            - **Foreign Key**: A reference in one table to a Primary Key in another.
-            - **JOIN**: Combining tables using these keys.
-            """)
-    
-            st.code("""
-    SELECT orders.id, customers.name 
-    FROM orders
-    JOIN customers ON orders.customer_id = customers.id;
-            """)
-    
-            # QUIZ 4.2
-            st.markdown("---")
-            exercise_container(
-                "Connecting Tables", 
-                "intermediate", 
-                "You have a 'Products' table and an 'Orders' table. Both share a 'product_id' column.",
-                "Which SQL keyword is used to merge these two tables together?"
-            )
-            q4_2 = st.text_input("code: SELECT * FROM Products ____ Orders ON ...", key="q4_2")
-            if st.button("✓ Submit Answer", key="submit_q4_2", type="primary"):
-                if q4_2.strip().upper() == "JOIN":
-                    st.success("Correct! `JOIN` is how we combine relational data.")
-                    mark_completed("CH4", "4.2", "quiz")
-                    if st.button("Final Chapter Challenge! →"):
-                        st.session_state.ch4_step = "🏆 Chapter 4 Challenge"
-                        st.rerun()
-                else:
-                    st.error("Not quite. What SQL keyword combines data from multiple tables?")
-    
-        elif step == "🏆 Chapter 4 Challenge":
-            st.markdown("### 🏆 Chapter 4 Final Task")
-            st.markdown("""
-            <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
-            <b>The Scenario:</b> You are analyzing a retail database. You need all customer names from the 'Customers' 
-            table who live in 'London'.<br><br>
-            
-            <b>Your Task:</b> Write the SQL query.
-            </div>
-            """, unsafe_allow_html=True)
-            
-            user_sql = st.text_area("Write your SQL query:", height=100)
-            if st.button("Submit Query"):
-                if "SELECT" in user_sql.upper() and "FROM Customers" in user_sql and "WHERE city = 'London'" in user_sql:
-                    st.success("🎉 DATABASE MASTER! You've conquered SQL.")
-                    st.balloons()
-                    mark_completed("CH4", "TASK", "final")
-                    
-                    if st.button("Move to Chapter 5 →", type="primary"):
-                        st.session_state.current_chapter = "CH 5: Visual Insights"
-                        st.session_state.ch5_step = "5.1 Plot Selection"
-                        st.rerun()
-                else:
-                    st.error("Check your syntax! Did you use SELECT, FROM, and WHERE?")
-    
-    # --- CHAPTER 5: VISUAL INSIGHTS ---
-    elif st.session_state.current_chapter == "CH 5: Visual Insights":
-        st.markdown("<h1>Chapter 5: Data Visualization</h1>", unsafe_allow_html=True)
-        
-        ch5_steps = ["5.1 Plot Selection", "5.2 Seaborn Styling", "🏆 Chapter 5 Challenge"]
-        step = st.select_slider("Chapter Progress", options=ch5_steps, value=st.session_state.get('ch5_step', "5.1 Plot Selection"))
-        st.session_state.ch5_step = step
-    
-        if step == "5.1 Plot Selection":
-            st.markdown("### 📊 5.1 Choosing the Right Chart")
-            st.write("""
-            Visualization is about choosing the right medium for your message.
-            """)
-            
-            st.markdown("""
-            | Data Insight | Best Chart |
-            | :--- | :--- |
-            | Comparison (e.g. Sales by Dept) | **Bar Chart** |
-            | Trends over Time (e.g. Stock Price) | **Line Plot** |
-            | Distribution (e.g. Income spreads) | **Histogram** |
-            | Relationships (e.g. Price vs. Sales) | **Scatter Plot** |
-            """)
-    
-            # QUIZ 5.1
-            st.markdown("---")
-            exercise_container(
-                "The Trend Tracker", 
-                "beginner", 
-                "You want to show how 'Daily Users' changed over a 12-month period.",
-                "Which chart is most effective for showing this time-series trend?"
-            )
-            q5_1 = st.radio("Selection:", ["Bar Chart", "Line Plot", "Pie Chart"], key="q5_1", index=None)
-            if st.button("✓ Submit Answer", key="submit_q5_1", type="primary"):
-                if q5_1 == "Line Plot":
-                    st.success("Correct! Line plots emphasize the flow and change of data over time.")
-                    mark_completed("CH5", "5.1", "quiz")
-                    if st.button("Next: Seaborn Styling →"):
-                        st.session_state.ch5_step = "5.2 Seaborn Styling"
-                        st.rerun()
-                else:
-                    st.error("Not quite. Which chart type is best for showing trends over time?")
-    
-        elif step == "5.2 Seaborn Styling":
-            st.markdown("### 🎨 5.2 Aesthetics & Clarity")
-            st.write("""
-            Raw charts are hard to read. A professional analyst adds labels, titles, and clean themes.
-            """)
-            
-            st.code("""
-    import seaborn as sns
-    import matplotlib.pyplot as plt
-    
-    sns.set_theme(style="whitegrid")
-    sns.barplot(x="region", y="sales", data=df)
-    plt.title("Regional Sales Distribution")
-    plt.xlabel("Region")
-    plt.ylabel("Sales ($)")
-            """)
-    
-            # QUIZ 5.2
-            st.markdown("---")
-            exercise_container(
-                "The Labeling Standard", 
-                "beginner", 
-                "You've created a plot, but the audience doesn't know what the Y-axis represents.",
-                "Which matplotlib function would you use to add a label to the Y-axis?"
-            )
-            q5_2 = st.text_input("code: plt.____('Revenue In USD')", key="q5_2")
-            if st.button("✓ Submit Answer", key="submit_q5_2", type="primary"):
-                if q5_2.strip().lower() == "ylabel":
-                    st.success("Exactly! `plt.ylabel()` adds the vertical context.")
-                    mark_completed("CH5", "5.2", "quiz")
-                    if st.button("Final Chapter Challenge! →"):
-                        st.session_state.ch5_step = "🏆 Chapter 5 Challenge"
-                        st.rerun()
-                else:
-                    st.error("Not quite. Which matplotlib function adds a label to the Y-axis?")
-    
-        elif step == "🏆 Chapter 5 Challenge":
-            st.markdown("### 🏆 Chapter 5 Final Task")
-            st.markdown("""
-            <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
-            <b>The Scenario:</b> You are presenting to stockholders. You have a DataFrame <code>df</code> with 
-            <code>'Year'</code> and <code>'Profit'</code> columns. <br><br>
-            
-            <b>Your Task:</b> Write the two lines of code to plot a line chart and set the title.
-            </div>
-            """, unsafe_allow_html=True)
-            
-            user_viz = st.text_area("Write your solution (Python):")
-            if st.button("Submit Project"):
-                if "lineplot" in user_viz and "plt.title" in user_viz:
-                    st.success("🎉 VIZ WIZARD! Your reports will be legendary.")
-                    st.balloons()
-                    mark_completed("CH5", "TASK", "final")
-                    
-                    if st.button("Move to Chapter 6 →", type="primary"):
-                        st.session_state.current_chapter = "CH 6: CA Practice Lab"
-                        st.session_state.ch6_step = "6.1 XML Mastery"
-                        st.rerun()
-                else:
-                    st.error("Try again! Use `sns.lineplot()` and `plt.title()`.")
-    
-    # --- CHAPTER 6: CA PRACTICE LAB ---
-    elif st.session_state.current_chapter == "CH 6: CA Practice Lab":
-        st.markdown("<h1>Chapter 6: CA Exam Practice Lab</h1>", unsafe_allow_html=True)
-        
-        ch6_steps = ["6.1 XML Mastery", "6.2 NumPy Analytics", "6.3 Regex Challenge", "🏆 CA Mock Exam"]
-        step = st.select_slider("Chapter Progress", options=ch6_steps, value=st.session_state.get('ch6_step', "6.1 XML Mastery"))
-        st.session_state.ch6_step = step
-    
-        if step == "6.1 XML Mastery":
-            st.markdown("### 🏺 6.1 Safe XML Ingestion")
-            st.write("""
-            In the CA, you are often asked to load XML data safely. This means handling errors like **FileNotFound** 
-            or **ParseError** so the program doesn't crash.
-            """)
-            
-            lesson_summary(
-                "XML Patterns", 
-                "30 Minutes", 
-                [
-                    "Use <code>xml.etree.ElementTree as ET</code>.",
-                    "Wrap <code>ET.parse()</code> in a <code>try-except</code> block.",
-                    "Extract attributes using <code>.get('attr_name')</code>.",
-                    "Extract nested text using <code>.findtext('tag_name')</code>."
-                ]
-            )
-    
-            exercise_container(
-                "The Safe Loader", 
-                "intermediate", 
-                "You are loading 'flights.xml'. You must catch the case where the XML is malformed.",
-                "Complete the exception type for XML parsing errors."
-            )
-            
-            st.code("""
-    import xml.etree.ElementTree as ET
-    try:
-        tree = ET.parse("flights.xml")
-    except ET.____ as e:
-        print(f"XML is broken: {e}")
-            """)
-            q6_1 = st.text_input("Fill in the exception class name:", key="q6_1")
-            if st.button("✓ Submit Answer", key="submit_q6_1", type="primary"):
-                if q6_1 == "ParseError":
-                    st.success("Correct! ET.ParseError specifically catches malformed XML syntax.")
-                    mark_completed("CH6", "6.1", "quiz")
-                    if st.button("Next: NumPy Analytics →"):
-                        st.session_state.ch6_step = "6.2 NumPy Analytics"
-                        st.rerun()
-                else:
-                    st.error("Not quite. What exception does ElementTree raise for malformed XML?")
-    
-        elif step == "6.2 NumPy Analytics":
-            st.markdown("### 📊 6.2 Data Structure Manipulation")
-            st.write("""
-            A common exam task is converting raw string records into NumPy arrays and handling **'NA'** values 
-            programmatically without using standard loops for every operation.
-            """)
-            
-            st.code("""
-    import numpy as np
-    # Convert strings to floats, mapping 'NA' to NaN
-    scores = [10, 'NA', 30]
-    arr = np.array([np.nan if x == 'NA' else float(x) for x in scores])
-    print(np.nanmean(arr)) # Returns 20.0
-            """)
-    
-            # QUIZ 6.2
-            st.markdown("---")
-            exercise_container(
-                "The NaN Ninja", 
-                "intermediate", 
-                "You have a NumPy array with missing data (NaN). You want to count how many valid (non-missing) scores exist.",
-                "Which logical combination counts non-NaN values?"
-            )
-            q6_2 = st.radio("Selection:", ["np.sum(arr == np.nan)", "np.sum(~np.isnan(arr))", "len(arr)"], key="q6_2", index=None)
-            if st.button("✓ Submit Answer", key="submit_q6_2", type="primary"):
-                if q6_2 == "np.sum(~np.isnan(arr))":
-                    st.success("Correct! `~np.isnan(arr)` creates a boolean mask of valid values, and `sum()` counts the True entries.")
-                    mark_completed("CH6", "6.2", "quiz")
-                    if st.button("Next: Regex Challenge →"):
-                        st.session_state.ch6_step = "6.3 Regex Challenge"
-                        st.rerun()
-                else:
-                    st.error("Not quite. How do you count non-NaN values in a NumPy array?")
-    
-        elif step == "6.3 Regex Challenge":
-            st.markdown("### 🔍 6.3 Advanced Pattern Extraction")
-            st.write("""
-            The CA will test your ability to extract multiple types of entities from a single text block 
-            (like Hashtags AND Mentions) using capture groups and specific character classes.
-            """)
-            
-            st.markdown("""
-            #### Regex Power Tools:
-            - `re.finditer()`: Better than `findall()` if you need capture groups or match positions.
-            - `group(1)`: Accesses the first bracketed set `()` in your pattern.
-            - `re.IGNORECASE`: Flag to match both `USD` and `usd`.
-            """)
-    
-            # QUIZ 6.3
-            st.markdown("---")
-            exercise_container(
-                "The Mention Threader", 
-                "beginner", 
-                "You need to find all @mentions. A mention starts with @ and is followed by one or more letters/digits.",
-                "Which pattern is most accurate?"
-            )
-            q6_3 = st.radio("Selection:", [r"@\w+", r"@\d+", r"#\w+"], key="q6_3", index=None)
-            if st.button("✓ Submit Answer", key="submit_q6_3", type="primary"):
-                if q6_3 == r"@\w+":
-                    st.success(r"Correct! `\w` matches letters, digits, and underscores.")
-                    mark_completed("CH6", "6.3", "quiz")
-                    if st.button("Go to Mock Exam! →"):
-                        st.session_state.ch6_step = "🏆 CA Mock Exam"
-                        st.rerun()
-                else:
-                    st.error("Not quite. Which pattern matches @ followed by word characters?")
-    
-        elif step == "🏆 CA Mock Exam":
-            st.markdown("### 🏆 Comprehensive CA Mock Exam")
-            st.markdown("""
-            <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
-            <b>Exam Scenario:</b> You are given a file <code>reviews.txt</code> with entries like:<br>
-            <code>R001 | 5 | Great flight! #smooth @pilot</code><br><br>
-            
-            <b>Your Task:</b> Code a solution that:
-            1. Loads the file and splits each line by <code>' | '</code>.
-            2. Uses regex to find ALL <b>hashtags</b> in the text.
-            3. Stores the counts of hashtags in a dictionary.
-            </div>
-            """, unsafe_allow_html=True)
-            
-            user_exam_code = st.text_area("Write your solution (Python):", height=250, key="ca_exam")
-            if st.button("Finish CA Exam"):
-                if "split(" in user_exam_code and "re.findall" in user_exam_code and "#" in user_exam_code:
-                    st.success("🎊 CA COMPLETE! You've matched the logic from the practice guide.")
-                    st.balloons()
-                    mark_completed("CH6", "TASK", "final")
-                    
-                    if st.button("Start Final Capstone →", type="primary"):
-                         st.session_state.current_chapter = "Final Project"
-                         st.rerun()
-                else:
-                    st.error("Check your logic! You need to split the line, use regex for '#', and count results.")
-    
-    # --- FINAL PROJECT ---
-    elif st.session_state.current_chapter == "Final Project":
-        st.markdown("<h1>🏆 Capstone: The Retail Intelligence Pipeline</h1>", unsafe_allow_html=True)
-        
-        st.markdown("""
-        <div class="lesson-card">
-        <h3>The Mission</h3>
-        <p>You are the Lead Analyst for <b>Electro-Pulse</b>. Your goal is to build an ETL pipeline that loads sales data, 
-        extracts discount codes with Regex, and identifies the most profitable region.</p>
-        </div>
-        """, unsafe_allow_html=True)
-        
-        # PROJECT STEP 1
-        st.subheader("Step 1: Ingestion")
-        exercise_container(
-            "Load the Dataset", 
-            "intermediate", 
-            "The raw sales data is stored as a CSV. You need to load it into a pandas DataFrame.",
-            "Use the pandas function to read 'sales_data.csv'."
-        )
-        p_ex1 = st.text_input("code: df = pd.____('sales_data.csv')", key="p_ex1")
-        if st.button("✓ Submit Step 1", key="submit_p_ex1", type="primary"):
-            if p_ex1 == "read_csv":
-                st.success("Step 1 Complete!")
-                mark_completed("PROJ", "FINAL", "ex1")
-            else:
-                st.error("Not quite. Which pandas function reads CSV files?")
-            
-            # PROJECT STEP 2 (Visible only after Step 1)
-            st.divider()
-            st.subheader("Step 2: regex Cleaning")
-            exercise_container(
-                "Extracting Vouchers", 
-                "intermediate", 
-                "One column has messy notes like 'User applied code SAVE20'. You need to find all SAVExx codes.",
-                "Complete the regex pattern to find 'SAVE' followed by two digits."
-            )
-            p_ex2 = st.text_input("code: pattern = r'SAVE\\____'", key="p_ex2")
-            if st.button("✓ Submit Step 2", key="submit_p_ex2", type="primary"):
-                if p_ex2 == "d{2}":
-                    st.success("Step 2 Complete! You've successfully parsed the voucher codes.")
-                    mark_completed("PROJ", "FINAL", "ex2")
-                else:
-                    st.error("Not quite. Use regex to match exactly 2 digits.")
-                
-                # PROJECT STEP 3
-                st.divider()
-                st.subheader("Step 3: Business Insight")
-                st.markdown("""
-                <div class="exercise-box">
-                <b>Scenario:</b> Your visual analysis shows that the 'West' region has high sales but very low profit. 
-                Which plot would BEST help you investigate the relationship between 'Discount Amount' and 'Profit Margin'?
-                </div>
-                """, unsafe_allow_html=True)
-                p_ex3 = st.radio("Select the diagnostic plot:", ["Pie Chart", "Scatter Plot", "Histogram"], key="p_ex3", index=None)
-                if st.button("✓ Submit Step 3", key="submit_p_ex3", type="primary"):
-                    if p_ex3 == "Scatter Plot":
-                        st.success("🏆 Project Complete! Scatter plots are perfect for seeing how one variable influences another.")
-                        mark_completed("PROJ", "FINAL", "ex3")
-                        st.balloons()
-                        st.markdown("""
-                        ### 🎉 Congratulations!
-                        You have completed the **APDV Mastery Course**. You now have the skills to:
-                        - Extract data from multiple sources.
-                        - Clean text with Regex.
-                        - Query SQL databases.
-                        - Visualize complex business trends.
-                        """)
-                    else:
-                        st.error("Not quite. Which plot shows the relationship between two variables?")
-    
-# --- MAIN LAYOUT ---
-main_col = st.container()
-
 with main_col:
-    app_content()
+    chapters.render(st.session_state.current_chapter)
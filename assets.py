@@ -0,0 +1,78 @@
+"""Static CSS/JS for the app, bundled once per process.
+
+The stylesheets are concatenated and minified into one payload named by its
+content hash. app.py injects it into the page head once per browser session;
+every later rerun only compares the hash, instead of re-sending ~10 KB of CSS
+and re-parsing it in the browser. Editing a file changes the hash, so the new
+bundle replaces the old one on the next session without a server restart.
+"""
+import hashlib
+import json
+import os
+import re
+from functools import lru_cache
+from typing import NamedTuple
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+CSS_FILES = ("style.css", "responsive.css", "selectbox.css")
+JS_FILES = ("selectbox.js",)
+
+
+class Bundle(NamedTuple):
+    css: str
+    js: str
+    digest: str
+
+
+def minify_css(css):
+    css = re.sub(r"/\*.*?\*/", "", css, flags=re.S)
+    css = re.sub(r"\s+", " ", css)
+    css = re.sub(r"\s*([{};,>])\s*", r"\1", css)
+    css = re.sub(r"([{;])\s*([-\w]+)\s*:\s*", r"\1\2:", css)
+    return css.replace(";}", "}").strip()
+
+
+def _read(name):
+    with open(os.path.join(ROOT, name), encoding="utf-8") as f:
+        return f.read()
+
+
+@lru_cache(maxsize=4)
+def _build(stamp):
+    css = "".join(minify_css(_read(name)) for name in CSS_FILES)
+    js = "\n".join(_read(name) for name in JS_FILES)
+    digest = hashlib.sha1((css + js).encode("utf-8")).hexdigest()[:12]
+    return Bundle(css, js, digest)
+
+
+def load_bundle():
+    """Current bundle; rebuilt only when one of the source files changes."""
+    stamp = tuple(os.stat(os.path.join(ROOT, name)).st_mtime_ns for name in CSS_FILES + JS_FILES)
+    return _build(stamp)
+
+
+def _js_string(text):
+    # Safe to embed inside <script>: no way to close the tag early
+    return json.dumps(text).replace("</", "<\\/")
+
+
+def injector_html(bundle):
+    """<script> that installs the bundle in the app's document head.
+
+    Idempotent per digest: a second copy of the same bundle is a no-op, and an
+    older bundle's <style> is swapped out.
+    """
+    return f"""<script>
+(function () {{
+    const id = "app-assets-{bundle.digest}";
+    if (document.getElementById(id)) return;
+    document.querySelectorAll("style[id^='app-assets-']").forEach(el => el.remove());
+    const style = document.createElement("style");
+    style.id = id;
+    style.textContent = {_js_string(bundle.css)};
+    document.head.appendChild(style);
+    const script = document.createElement("script");
+    script.textContent = {_js_string(bundle.js)};
+    document.head.appendChild(script);
+}})();
+</script>"""
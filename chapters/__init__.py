@@ -0,0 +1,108 @@
+"""Course chapters.
+
+Each chapter lives in its own module and is listed here in course order. A
+chapter module either defines ``render()`` (single-page chapters) or a
+``HEADING`` plus an ordered ``STEPS`` dict mapping step label -> function.
+
+Modules are imported on first use, so a rerun only imports and runs the active
+chapter and, within it, the active step; adding chapters doesn't make other
+pages slower.
+
+Each step (and each single-page chapter) runs as a fragment: submitting a
+quiz answer reruns that step only, not the sidebar and code editor. Buttons
+that move to another step or chapter call ``st.rerun()``, which still reruns
+the whole app so the slider and sidebar follow.
+
+Every exercise that counts towards progress is registered with its chapter
+under a fixed integer id, its bit in the learner's progress bitset (see
+progress.py). Ids are permanent: give a new exercise the next unused id and
+never reuse or renumber one, or stored progress would point at the wrong
+exercises.
+"""
+import importlib
+from typing import NamedTuple
+
+import streamlit as st
+
+from metrics import timed
+
+
+class Chapter(NamedTuple):
+    title: str
+    module: str
+    lessons: tuple = ("Deep Dive",)
+    # session_state key holding the chapter's current step
+    step_key: str = None
+    # progress bits of the chapter's exercises, and how many there are
+    mask: int = 0
+    total: int = 0
+
+
+CHAPTERS = {}
+# "CH1_1.1_quiz" (the key mark_completed builds) -> progress bit
+EXERCISE_IDS = {}
+# Bits of every registered exercise
+ALL_EXERCISES = 0
+
+
+def register(title, module, lessons=("Deep Dive",), step_key=None, exercises=None):
+    """Add a chapter; ``exercises`` maps each of its exercise keys to a permanent id."""
+    global ALL_EXERCISES
+    mask = 0
+    for key, exercise_id in (exercises or {}).items():
+        if key in EXERCISE_IDS or ALL_EXERCISES >> exercise_id & 1:
+            raise ValueError(f"{title}: exercise {key!r} (id {exercise_id}) is already registered")
+        EXERCISE_IDS[key] = exercise_id
+        mask |= 1 << exercise_id
+        ALL_EXERCISES |= 1 << exercise_id
+    CHAPTERS[title] = Chapter(title, module, tuple(lessons), step_key, mask, mask.bit_count())
+
+
+register("Welcome", "chapters.welcome", lessons=["Overview"])
+register("CH 1: Python Foundations", "chapters.ch1_foundations", step_key="ch1_step",
+         exercises={"CH1_1.1_quiz": 0, "CH1_1.2_quiz": 1, "CH1_1.3_quiz": 2, "CH1_1.4_quiz": 3,
+                    "CH1_TASK_final": 4})
+register("CH 2: Data Ingestion (ETL)", "chapters.ch2_ingestion", step_key="ch2_step",
+         exercises={"CH2_2.1_quiz": 5, "CH2_2.2_quiz": 6, "CH2_TASK_final": 7})
+register("CH 3: Data Cleaning", "chapters.ch3_cleaning", step_key="ch3_step",
+         exercises={"CH3_3.1_quiz": 8, "CH3_3.2_quiz": 9, "CH3_TASK_final": 10})
+register("CH 4: SQL Management", "chapters.ch4_sql", step_key="ch4_step",
+         exercises={"CH4_4.1_quiz": 11, "CH4_4.2_quiz": 12, "CH4_TASK_final": 13})
+register("CH 5: Visual Insights", "chapters.ch5_visuals", step_key="ch5_step",
+         exercises={"CH5_5.1_quiz": 14, "CH5_5.2_quiz": 15, "CH5_TASK_final": 16})
+register("CH 6: CA Practice Lab", "chapters.ch6_ca_lab", step_key="ch6_step",
+         exercises={"CH6_6.1_quiz": 17, "CH6_6.2_quiz": 18, "CH6_6.3_quiz": 19, "CH6_TASK_final": 20})
+register("Final Project", "chapters.final_project", lessons=["Retail Pipeline"],
+         exercises={"PROJ_FINAL_ex1": 21, "PROJ_FINAL_ex2": 22, "PROJ_FINAL_ex3": 23})
+TOTAL_EXERCISES = ALL_EXERCISES.bit_count()
+
+
+def exercise_id(key):
+    try:
+        return EXERCISE_IDS[key]
+    except KeyError:
+        raise KeyError(f"exercise {key!r} isn't registered in chapters/__init__.py") from None
+
+
+def sidebar_index():
+    """``{chapter title: [lessons]}`` for the sidebar, without importing any chapter."""
+    return {title: list(chapter.lessons) for title, chapter in CHAPTERS.items()}
+
+
+def render(title):
+    chapter = CHAPTERS.get(title) or next(iter(CHAPTERS.values()))
+    module = importlib.import_module(chapter.module)
+    if not getattr(module, "STEPS", None):
+        st.fragment(timed("chapter", chapter=chapter.title, step="")(module.render))()
+        return
+
+    st.markdown(module.HEADING, unsafe_allow_html=True)
+
+    # Internal Chapter Navigation (Step-by-Step)
+    options = list(module.STEPS)
+    current = st.session_state.get(chapter.step_key)
+    step = st.select_slider("Chapter Progress", options=options,
+                            value=current if current in options else options[0])
+    st.session_state[chapter.step_key] = step
+    # Timed inside the fragment, so quiz-only reruns are measured too
+    st.fragment(timed("chapter", chapter=chapter.title, step=step)(module.STEPS[step]))()
@@ -0,0 +1,248 @@
+"""CH 1: Python Foundations."""
+import streamlit as st
+
+from chapters.common import exercise_container, feedback, is_correct, mark_completed, quiz_input, submit_challenge
+
+HEADING = "<h1>Chapter 1: Python Foundations</h1>"
+
+
+def scalar_types():
+    st.markdown("### 🧬 1.1 Understanding Scalar Types")
+    st.write("""
+    In Python, **Scalars** are the most basic units of data. Think of them as the "atoms" of your code. 
+    Before you can analyze sales trends or customer behavior, you must understand exactly how Python stores this information.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("""
+        #### The Four Core Pillars:
+        1. **Integers (`int`)**: Whole numbers. Used for counting (e.g., `num_customers = 50`).
+        2. **Floats (`float`)**: Decimal numbers. Used for precision (e.g., `conversion_rate = 0.087`).
+        3. **Strings (`str`)**: Text. Always wrapped in quotes (e.g., `name = "Alice"`).
+        4. **Booleans (`bool`)**: Logical switches. Either `True` or `False`.
+        """)
+
+    with col2:
+        st.markdown("""
+        #### 💡 Pro Tip: Coercion
+        Sometimes data arrives in the wrong format (like a number inside a string). 
+        We use **Coercion** to fix this:
+        - `int("100")` → `100`
+        - `str(42)` → `"42"`
+        - `float("19.99")` → `19.99`
+        """)
+
+    st.info("⚠️ **The Boolean Quirk**: In Python, almost anything has a boolean value. `bool(\"False\")` is actually **True** because the string is not empty!")
+
+    # QUIZ 1.1
+    st.markdown("---")
+    exercise_container("q1_1")
+    q1_1 = quiz_input("q1_1")
+
+    # Initialize session state for this quiz
+    if 'q1_1_correct' not in st.session_state:
+        st.session_state.q1_1_correct = False
+
+    if st.button("✓ Submit Answer", key="submit_q1_1", type="primary"):
+        if is_correct("q1_1", q1_1):
+            st.success(feedback("q1_1", True))
+            mark_completed("CH1", "1.1", "quiz")
+            st.session_state.q1_1_correct = True
+        else:
+            st.error(feedback("q1_1", False))
+            st.session_state.q1_1_correct = False
+
+    # Show navigation button if answer is correct
+    if st.session_state.q1_1_correct:
+        if st.button("Move to Next Topic →", key="nav_q1_1", type="secondary"):
+            st.session_state.ch1_step = "1.2 Operators & Logic"
+            st.session_state.q1_1_correct = False  # Reset
+            st.rerun()
+
+
+def operators_logic():
+    st.markdown("### 🧮 1.2 Operators & Logical Flow")
+    st.write("""
+    Operators allow you to perform calculations and make comparisons. In Data Analytics, 
+    you'll use these to filter datasets (e.g., "Find all sales > $500").
+    """)
+
+    st.markdown("""
+    | Operator | Description | Example |
+    | :--- | :--- | :--- |
+    | `+`, `-`, `*`, `/` | Basic Math | `total = price * qty` |
+    | `//` | Floor Division | `20 // 3` gives `6` |
+    | `%` | Modulo (Remainder) | `20 % 3` gives `2` |
+    | `==`, `!=` | Equality check | `status == "shipped"` |
+    | `>`, `<` | Comparison | `age >= 18` |
+    """)
+
+    st.markdown("#### Logical Gates: `and`, `or`, `not` ")
+    st.write("Use these to combine multiple conditions. For a customer to get a discount, they might need to be (Age > 65) **or** (Member == True).")
+
+    # QUIZ 1.2
+    st.markdown("---")
+    exercise_container("q1_2")
+    q1_2 = quiz_input("q1_2")
+
+    if 'q1_2_correct' not in st.session_state:
+        st.session_state.q1_2_correct = False
+
+    if st.button("✓ Submit Answer", key="submit_q1_2", type="primary"):
+        if is_correct("q1_2", q1_2):
+            st.success(feedback("q1_2", True))
+            mark_completed("CH1", "1.2", "quiz")
+            st.session_state.q1_2_correct = True
+        else:
+            st.error(feedback("q1_2", False))
+            st.session_state.q1_2_correct = False
+
+    if st.session_state.q1_2_correct:
+        if st.button("Move to Next Topic →", key="nav_q1_2", type="secondary"):
+            st.session_state.ch1_step = "1.3 String Mastery"
+            st.session_state.q1_2_correct = False
+            st.rerun()
+
+
+def string_mastery():
+    st.markdown("### ✍️ 1.3 String Manipulation")
+    st.write("""
+    Data is often "noisy." Customer names might have extra spaces, or emails might be in all caps. 
+    Python's string methods are your first line of defense in data cleaning.
+    """)
+
+    st.markdown("""
+    #### Key String Methods:
+    - `.strip()`: Removes leading/trailing whitespace.
+    - `.lower()` / `.upper()`: Standardizes case.
+    - `.replace("old", "new")`: Swaps text.
+    - `.split(",")`: Turns a string into a list (great for CSV lines).
+    - **f-strings**: `f"Hello {name}"` is the cleanest way to insert variables into text.
+    """)
+
+    # INDEXING & SLICING
+    st.code("""
+    text = "PYTHON"
+    # Indexing starts at 0
+    print(text[0]) # 'P'
+    # Slicing [start:end_exclusive]
+    print(text[0:2]) # 'PY'
+    """)
+
+    # QUIZ 1.3
+    st.markdown("---")
+    exercise_container("q1_3")
+    q1_3 = quiz_input("q1_3")
+
+    if 'q1_3_correct' not in st.session_state:
+        st.session_state.q1_3_correct = False
+
+    if st.button("✓ Submit Answer", key="submit_q1_3", type="primary"):
+        if is_correct("q1_3", q1_3):
+            st.success(feedback("q1_3", True))
+            mark_completed("CH1", "1.3", "quiz")
+            st.session_state.q1_3_correct = True
+        else:
+            st.error(feedback("q1_3", False))
+            st.session_state.q1_3_correct = False
+
+    if st.session_state.q1_3_correct:
+        if st.button("Move to Next Topic →", key="nav_q1_3", type="secondary"):
+            st.session_state.ch1_step = "1.4 Collections"
+            st.session_state.q1_3_correct = False
+            st.rerun()
+
+
+def collections():
+    st.markdown("### 📚 1.4 Collections: Lists & Dictionaries")
+    st.write("""
+    In Analytics, we rarely work with one number at a time. We work with **collections** of data.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("#### Lists (`[]`)")
+        st.write("An ordered sequence. Good for column data or time-series.")
+        st.code("""
+    sales = [100, 250, 300]
+    sales.append(400) # Add
+    sales[0] # Access 1st
+        """)
+    with col2:
+        st.markdown("#### Dictionaries (`{}` )")
+        st.write("Key-value pairs. Perfect for structured records.")
+        st.code("""
+    user = {"name": "Alice", "id": 1}
+    print(user["name"]) # "Alice"
+        """)
+
+    # QUIZ 1.4
+    st.markdown("---")
+    exercise_container("q1_4")
+    q1_4 = quiz_input("q1_4")
+
+    if 'q1_4_correct' not in st.session_state:
+        st.session_state.q1_4_correct = False
+
+    if st.button("✓ Submit Answer", key="submit_q1_4", type="primary"):
+        if is_correct("q1_4", q1_4):
+            st.success(feedback("q1_4", True))
+            mark_completed("CH1", "1.4", "quiz")
+            st.session_state.q1_4_correct = True
+        else:
+            st.error(feedback("q1_4", False))
+            st.session_state.q1_4_correct = False
+
+    if st.session_state.q1_4_correct:
+        if st.button("Go to Chapter Challenge →", key="nav_q1_4", type="secondary"):
+            st.session_state.ch1_step = "🏆 Chapter 1 Challenge"
+            st.session_state.q1_4_correct = False
+            st.rerun()
+
+
+def challenge():
+    st.markdown("### 🏆 Chapter 1 Final Task")
+    st.markdown("""
+    <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
+    <b>The Scenario:</b> You are a Junior Data Engineer. You've been given a messy string containing a customer's record:
+    <code>"  ID:001 | NAME:ALICE | SPENT:150.50  "</code><br><br>
+    
+    <b>Your Task:</b> Write a script that:
+    1. Removes the extra spaces from the string.
+    2. Splits the string by the <code>|</code> character.
+    3. Extracts the 'SPENT' value and converts it to a <b>float</b>.
+    4. Calculates a 10% tax on that value.<br><br>
+    Work from the <code>data</code> variable: your script is also tested on other customers' records.
+    </div>
+    """, unsafe_allow_html=True)
+
+    raw_data = "  ID:001 | NAME:ALICE | SPENT:150.50  "
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.code(f"data = \"{raw_data}\"")
+        user_code = st.text_area("Write your solution (Python):", height=200, placeholder="clean_data = ...\nparts = ...\nspent = ...\ntax = ...")
+
+    with col2:
+        if st.button("Submit Project"):
+            if submit_challenge("ch1_task", user_code):
+                st.success("🎊 AMAZING! You've combined everything from Chapter 1.")
+                st.balloons()
+                mark_completed("CH1", "TASK", "final")
+
+                if st.button("Move to Chapter 2 →", type="primary"):
+                    st.session_state.current_chapter = "CH 2: Data Ingestion (ETL)"
+                    st.session_state.ch2_step = "2.1 pandas I/O"
+                    st.rerun()
+            else:
+                st.info("Remember to use `.strip()`, `.split('|')`, and `float()`.")
+
+
+STEPS = {
+    "1.1 Scalar Types": scalar_types,
+    "1.2 Operators & Logic": operators_logic,
+    "1.3 String Mastery": string_mastery,
+    "1.4 Collections": collections,
+    "🏆 Chapter 1 Challenge": challenge,
+}
@@ -0,0 +1,117 @@
+"""CH 2: Data Ingestion (ETL)."""
+import streamlit as st
+
+from chapters.common import exercise_container, feedback, is_correct, mark_completed, quiz_input, submit_challenge
+
+HEADING = "<h1>Chapter 2: Data Ingestion (ETL)</h1>"
+
+
+def pandas_io():
+    st.markdown("### 📊 2.1 The Gateway to pandas")
+    st.write("""
+    `pandas` is the standard library for data engineering in Python. It allows you to transform raw files 
+    (like CSV or Excel) into high-performance **DataFrames**.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("""
+        #### Core Ingestion Functions:
+        - `pd.read_csv("file.csv")`: The bread and butter of data loading.
+        - `pd.read_json("file.json")`: For structured web data.
+        - `pd.read_excel("file.xlsx")`: For business reports.
+        """)
+    with col2:
+        st.markdown("""
+        #### First Inspection Tools:
+        - `df.head()`: See top rows.
+        - `df.info()`: Check data types and nulls.
+        - `df.describe()`: Get statistical snapshots.
+        """)
+
+    st.code("""
+    import pandas as pd
+    df = pd.read_csv("sales.csv", index_col=0)
+    print(df.info())
+    """)
+
+    # QUIZ 2.1
+    st.markdown("---")
+    exercise_container("q2_1")
+    q2_1 = quiz_input("q2_1")
+    if st.button("✓ Submit Answer", key="submit_q2_1", type="primary"):
+        if is_correct("q2_1", q2_1):
+            st.success(feedback("q2_1", True))
+            mark_completed("CH2", "2.1", "quiz")
+            if st.button("Next: API Connection →"):
+                st.session_state.ch2_step = "2.2 API Connection"
+                st.rerun()
+        else:
+            st.error(feedback("q2_1", False))
+
+
+def api_connection():
+    st.markdown("### 🌐 2.2 Fetching Live Data (APIs)")
+    st.write("""
+    APIs allow you to request data directly from a server. This is how you get live stock prices, 
+    weather updates, or social media trends.
+    """)
+
+    st.markdown("""
+    #### The requests workflow:
+    1. **GET**: Ask the server for data via a URL.
+    2. **Status**: Check if the code is `200` (OK).
+    3. **JSON**: Convert the response to a Python-usable format with `.json()`.
+    """)
+
+    st.info("💡 **Common Status Codes:**\n- `200`: Success\n- `401`: Access Denied (Bad API Key)\n- `404`: Not Found\n- `500`: Server Error")
+
+    # QUIZ 2.2
+    st.markdown("---")
+    exercise_container("q2_2")
+    q2_2 = quiz_input("q2_2")
+    if st.button("✓ Submit Answer", key="submit_q2_2", type="primary"):
+        if is_correct("q2_2", q2_2):
+            st.success(feedback("q2_2", True))
+            mark_completed("CH2", "2.2", "quiz")
+            if st.button("Final Chapter Challenge! →"):
+                st.session_state.ch2_step = "🏆 Chapter 2 Challenge"
+                st.rerun()
+        else:
+            st.error(feedback("q2_2", False))
+
+
+def challenge():
+    st.markdown("### 🏆 Chapter 2 Final Task")
+    st.markdown("""
+    <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
+    <b>The Scenario:</b> You are building an ETL pipeline. You need to load a CSV and get a statistical summary.<br><br>
+    
+    <b>Your Task:</b> Write the code to:
+    1. Import pandas.
+    2. Load <code>"retail_sales.csv"</code> as a DataFrame called <code>sales_df</code>.
+    3. Print the statistical summary (mean, max, min, etc.) of the DataFrame.
+    </div>
+    """, unsafe_allow_html=True)
+
+    user_code_2 = st.text_area("Write your solution (Python):", height=200, key="task2", placeholder="import ...\nsales_df = ...\n...")
+
+    if st.button("Submit Project"):
+        if submit_challenge("ch2_task", user_code_2):
+            st.success("🎉 HEROIC! You've mastered Data Ingestion.")
+            st.balloons()
+            mark_completed("CH2", "TASK", "final")
+
+            if st.button("Move to Chapter 3 →", type="primary"):
+                st.session_state.current_chapter = "CH 3: Data Cleaning"
+                st.session_state.ch3_step = "3.1 Regex Mastery"
+                st.rerun()
+        else:
+            st.info("Did you use `read_csv` and `describe()`?")
+
+
+STEPS = {
+    "2.1 pandas I/O": pandas_io,
+    "2.2 API Connection": api_connection,
+    "🏆 Chapter 2 Challenge": challenge,
+}
@@ -0,0 +1,114 @@
+"""CH 3: Data Cleaning."""
+import streamlit as st
+
+from chapters.common import exercise_container, feedback, is_correct, mark_completed, quiz_input, submit_challenge
+
+HEADING = "<h1>Chapter 3: Data Cleaning & Extraction</h1>"
+
+
+def regex_mastery():
+    st.markdown("### 🔍 3.1 Regex for Data Cleaning")
+    st.write("""
+    **Regular Expressions** (Regex) are patterns used to match character combinations in strings. 
+    In data analysis, they are indispensable for extracting information from messy text.
+    """)
+
+    st.markdown(r"""
+    #### Common Regex Symbols:
+    - `\d`: Matches any digit (0-9).
+    - `\w`: Matches any alphanumeric character.
+    - `\s`: Matches any whitespace (spaces, tabs).
+    - `+`: Matches 1 or more of the preceding character.
+    - `*`: Matches 0 or more of the preceding character.
+    - `.` : Matches any character except newline.
+    """)
+
+    st.code("""
+    import re
+    text = "Contact us at 555-1234"
+    # Extract phone
+    pattern = r"\d{3}-\d{4}"
+    print(re.findall(pattern, text))
+    """)
+
+    # QUIZ 3.1
+    st.markdown("---")
+    exercise_container("q3_1")
+    q3_1 = quiz_input("q3_1")
+    if st.button("✓ Submit Answer", key="submit_q3_1", type="primary"):
+        if is_correct("q3_1", q3_1):
+            st.success(feedback("q3_1", True))
+            mark_completed("CH3", "3.1", "quiz")
+            if st.button("Next: Web Scraping →"):
+                st.session_state.ch3_step = "3.2 Web Scraping"
+                st.rerun()
+        else:
+            st.error(feedback("q3_1", False))
+
+
+def web_scraping():
+    st.markdown("### 🕸️ 3.2 Web Scraping with BeautifulSoup")
+    st.write("""
+    Web scraping is the automated process of extracting data from websites. 
+    `BeautifulSoup` is the go-to library for parsing HTML.
+    """)
+
+    st.markdown("""
+    #### The Scraping Flow:
+    1. Fetch HTML using `requests`.
+    2. Create a "Soup" object: `soup = BeautifulSoup(html, 'html.parser')`.
+    3. Find elements using `.find()` or `.find_all()`.
+    """)
+
+    st.warning("⚖️ **Ethics**: Always check a site's `robots.txt` before scraping. Don't spam the server with requests!")
+
+    # QUIZ 3.2
+    st.markdown("---")
+    exercise_container("q3_2")
+    q3_2 = quiz_input("q3_2")
+    if st.button("✓ Submit Answer", key="submit_q3_2", type="primary"):
+        if is_correct("q3_2", q3_2):
+            st.success(feedback("q3_2", True))
+            mark_completed("CH3", "3.2", "quiz")
+            if st.button("Final Chapter Challenge! →"):
+                st.session_state.ch3_step = "🏆 Chapter 3 Challenge"
+                st.rerun()
+        else:
+            st.error(feedback("q3_2", False))
+
+
+def challenge():
+    st.markdown("### 🏆 Chapter 3 Final Task")
+    st.markdown("""
+    <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
+    <b>The Scenario:</b> You have scraped a product description: <code>"The UltraBook 5000 is on sale for $1,299.99 today!"</code>.<br><br>
+    
+    <b>Your Task:</b> Code a regex pattern to extract the price.
+    1. Use <code>re.findall()</code>.
+    2. Pattern should look for the dollar sign and digits.
+    3. It should also work for other prices, with or without cents (e.g. <code>$5</code>).
+    </div>
+    """, unsafe_allow_html=True)
+
+    st.code('text = "The UltraBook 5000 is on sale for $1,299.99 today!"')
+    user_code_3 = st.text_area("Write your solution (Python):", height=200, key="task3")
+
+    if st.button("Submit Project"):
+        if submit_challenge("ch3_task", user_code_3):
+            st.success("🎉 SPOT ON! Your cleaning skills are top-tier.")
+            st.balloons()
+            mark_completed("CH3", "TASK", "final")
+
+            if st.button("Move to Chapter 4 →", type="primary"):
+                st.session_state.current_chapter = "CH 4: SQL Management"
+                st.session_state.ch4_step = "4.1 SQL Basics"
+                st.rerun()
+        else:
+            st.info("Make sure to escape the dollar sign using `\\$` in your pattern.")
+
+
+STEPS = {
+    "3.1 Regex Mastery": regex_mastery,
+    "3.2 Web Scraping": web_scraping,
+    "🏆 Chapter 3 Challenge": challenge,
+}
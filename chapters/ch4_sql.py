@@ -0,0 +1,111 @@
+"""CH 4: SQL Management."""
+import streamlit as st
+
+from chapters.common import exercise_container, feedback, is_correct, mark_completed, quiz_input, submit_challenge
+
+HEADING = "<h1>Chapter 4: SQL Management</h1>"
+
+
+def sql_basics():
+    st.markdown("### 🗄️ 4.1 Introduction to SQL")
+    st.write("""
+    SQL (Structured Query Language) is used to communicate with databases. Unlike Python, 
+    which focuses on *how* to do something, SQL focuses on *what* data you want.
+    """)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("""
+        #### Primary Keywords:
+        - `SELECT`: Choose your columns.
+        - `FROM`: Choose your table.
+        - `WHERE`: Filter your rows.
+        - `ORDER BY`: Sort your results.
+        """)
+    with col2:
+        st.markdown("""
+        #### Examples:
+        `SELECT * FROM users;`  
+        `SELECT name FROM sales WHERE revenue > 1000;`
+        """)
+
+    # QUIZ 4.1
+    st.markdown("---")
+    exercise_container("q4_1")
+    q4_1 = quiz_input("q4_1")
+    if st.button("✓ Submit Answer", key="submit_q4_1", type="primary"):
+        if is_correct("q4_1", q4_1):
+            st.success(feedback("q4_1", True))
+            mark_completed("CH4", "4.1", "quiz")
+            if st.button("Next: Joins & Keys →"):
+                st.session_state.ch4_step = "4.2 Joins & Keys"
+                st.rerun()
+        else:
+            st.error(feedback("q4_1", False))
+
+
+def joins_keys():
+    st.markdown("### 🔗 4.2 Relationships & Joins")
+    st.write("""
+    Relational databases work by splitting data into multiple tables and linking them using **Keys**.
+    """)
+
+    st.markdown("""
+    - **Primary Key**: A unique ID for every row in a table.
+    - **Foreign Key**: A reference in one table to a Primary Key in another.
+    - **JOIN**: Combining tables using these keys.
+    """)
+
+    st.code("""
+    SELECT orders.id, customers.name 
+    FROM orders
+    JOIN customers ON orders.customer_id = customers.id;
+    """)
+
+    # QUIZ 4.2
+    st.markdown("---")
+    exercise_container("q4_2")
+    q4_2 = quiz_input("q4_2")
+    if st.button("✓ Submit Answer", key="submit_q4_2", type="primary"):
+        if is_correct("q4_2", q4_2):
+            st.success(feedback("q4_2", True))
+            mark_completed("CH4", "4.2", "quiz")
+            if st.button("Final Chapter Challenge! →"):
+                st.session_state.ch4_step = "🏆 Chapter 4 Challenge"
+                st.rerun()
+        else:
+            st.error(feedback("q4_2", False))
+
+
+def challenge():
+    st.markdown("### 🏆 Chapter 4 Final Task")
+    st.markdown("""
+    <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
+    <b>The Scenario:</b> You are analyzing a retail database. You need all customer names from the 'Customers' 
+    table who live in 'London'.<br><br>
+    
+    <b>Your Task:</b> Write the SQL query. The table has the columns <code>id</code>, <code>name</code>,
+    <code>city</code> and <code>country</code>.
+    </div>
+    """, unsafe_allow_html=True)
+
+    user_sql = st.text_area("Write your SQL query:", height=100)
+    if st.button("Submit Query"):
+        if submit_challenge("ch4_task", user_sql):
+            st.success("🎉 DATABASE MASTER! You've conquered SQL.")
+            st.balloons()
+            mark_completed("CH4", "TASK", "final")
+
+            if st.button("Move to Chapter 5 →", type="primary"):
+                st.session_state.current_chapter = "CH 5: Visual Insights"
+                st.session_state.ch5_step = "5.1 Plot Selection"
+                st.rerun()
+        else:
+            st.info("Did you use SELECT, FROM, and WHERE?")
+
+
+STEPS = {
+    "4.1 SQL Basics": sql_basics,
+    "4.2 Joins & Keys": joins_keys,
+    "🏆 Chapter 4 Challenge": challenge,
+}
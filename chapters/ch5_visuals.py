@@ -0,0 +1,101 @@
+"""CH 5: Visual Insights."""
+import streamlit as st
+
+from chapters.common import exercise_container, feedback, is_correct, mark_completed, quiz_input, submit_challenge
+
+HEADING = "<h1>Chapter 5: Data Visualization</h1>"
+
+
+def plot_selection():
+    st.markdown("### 📊 5.1 Choosing the Right Chart")
+    st.write("""
+    Visualization is about choosing the right medium for your message.
+    """)
+
+    st.markdown("""
+    | Data Insight | Best Chart |
+    | :--- | :--- |
+    | Comparison (e.g. Sales by Dept) | **Bar Chart** |
+    | Trends over Time (e.g. Stock Price) | **Line Plot** |
+    | Distribution (e.g. Income spreads) | **Histogram** |
+    | Relationships (e.g. Price vs. Sales) | **Scatter Plot** |
+    """)
+
+    # QUIZ 5.1
+    st.markdown("---")
+    exercise_container("q5_1")
+    q5_1 = quiz_input("q5_1")
+    if st.button("✓ Submit Answer", key="submit_q5_1", type="primary"):
+        if is_correct("q5_1", q5_1):
+            st.success(feedback("q5_1", True))
+            mark_completed("CH5", "5.1", "quiz")
+            if st.button("Next: Seaborn Styling →"):
+                st.session_state.ch5_step = "5.2 Seaborn Styling"
+                st.rerun()
+        else:
+            st.error(feedback("q5_1", False))
+
+
+def seaborn_styling():
+    st.markdown("### 🎨 5.2 Aesthetics & Clarity")
+    st.write("""
+    Raw charts are hard to read. A professional analyst adds labels, titles, and clean themes.
+    """)
+
+    st.code("""
+    import seaborn as sns
+    import matplotlib.pyplot as plt
+    
+    sns.set_theme(style="whitegrid")
+    sns.barplot(x="region", y="sales", data=df)
+    plt.title("Regional Sales Distribution")
+    plt.xlabel("Region")
+    plt.ylabel("Sales ($)")
+    """)
+
+    # QUIZ 5.2
+    st.markdown("---")
+    exercise_container("q5_2")
+    q5_2 = quiz_input("q5_2")
+    if st.button("✓ Submit Answer", key="submit_q5_2", type="primary"):
+        if is_correct("q5_2", q5_2):
+            st.success(feedback("q5_2", True))
+            mark_completed("CH5", "5.2", "quiz")
+            if st.button("Final Chapter Challenge! →"):
+                st.session_state.ch5_step = "🏆 Chapter 5 Challenge"
+                st.rerun()
+        else:
+            st.error(feedback("q5_2", False))
+
+
+def challenge():
+    st.markdown("### 🏆 Chapter 5 Final Task")
+    st.markdown("""
+    <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
+    <b>The Scenario:</b> You are presenting to stockholders. You have a DataFrame <code>df</code> with 
+    <code>'Year'</code> and <code>'Profit'</code> columns. <br><br>
+    
+    <b>Your Task:</b> Write the two lines of code to plot a line chart and set the title.
+    </div>
+    """, unsafe_allow_html=True)
+
+    user_viz = st.text_area("Write your solution (Python):")
+    if st.button("Submit Project"):
+        if submit_challenge("ch5_task", user_viz):
+            st.success("🎉 VIZ WIZARD! Your reports will be legendary.")
+            st.balloons()
+            mark_completed("CH5", "TASK", "final")
+
+            if st.button("Move to Chapter 6 →", type="primary"):
+                st.session_state.current_chapter = "CH 6: CA Practice Lab"
+                st.session_state.ch6_step = "6.1 XML Mastery"
+                st.rerun()
+        else:
+            st.info("Use `sns.lineplot()` and `plt.title()`.")
+
+
+STEPS = {
+    "5.1 Plot Selection": plot_selection,
+    "5.2 Seaborn Styling": seaborn_styling,
+    "🏆 Chapter 5 Challenge": challenge,
+}
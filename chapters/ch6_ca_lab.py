@@ -0,0 +1,131 @@
+"""CH 6: CA Practice Lab."""
+import streamlit as st
+
+from chapters.common import exercise_container, feedback, is_correct, lesson_summary, mark_completed, quiz_input, submit_challenge
+
+HEADING = "<h1>Chapter 6: CA Exam Practice Lab</h1>"
+
+
+def xml_mastery():
+    st.markdown("### 🏺 6.1 Safe XML Ingestion")
+    st.write("""
+    In the CA, you are often asked to load XML data safely. This means handling errors like **FileNotFound** 
+    or **ParseError** so the program doesn't crash.
+    """)
+
+    lesson_summary("xml_patterns")
+
+    exercise_container("q6_1")
+
+    st.code("""
+    import xml.etree.ElementTree as ET
+    try:
+        tree = ET.parse("flights.xml")
+    except ET.____ as e:
+        print(f"XML is broken: {e}")
+    """)
+    q6_1 = quiz_input("q6_1")
+    if st.button("✓ Submit Answer", key="submit_q6_1", type="primary"):
+        if is_correct("q6_1", q6_1):
+            st.success(feedback("q6_1", True))
+            mark_completed("CH6", "6.1", "quiz")
+            if st.button("Next: NumPy Analytics →"):
+                st.session_state.ch6_step = "6.2 NumPy Analytics"
+                st.rerun()
+        else:
+            st.error(feedback("q6_1", False))
+
+
+def numpy_analytics():
+    st.markdown("### 📊 6.2 Data Structure Manipulation")
+    st.write("""
+    A common exam task is converting raw string records into NumPy arrays and handling **'NA'** values 
+    programmatically without using standard loops for every operation.
+    """)
+
+    st.code("""
+    import numpy as np
+    # Convert strings to floats, mapping 'NA' to NaN
+    scores = [10, 'NA', 30]
+    arr = np.array([np.nan if x == 'NA' else float(x) for x in scores])
+    print(np.nanmean(arr)) # Returns 20.0
+    """)
+
+    # QUIZ 6.2
+    st.markdown("---")
+    exercise_container("q6_2")
+    q6_2 = quiz_input("q6_2")
+    if st.button("✓ Submit Answer", key="submit_q6_2", type="primary"):
+        if is_correct("q6_2", q6_2):
+            st.success(feedback("q6_2", True))
+            mark_completed("CH6", "6.2", "quiz")
+            if st.button("Next: Regex Challenge →"):
+                st.session_state.ch6_step = "6.3 Regex Challenge"
+                st.rerun()
+        else:
+            st.error(feedback("q6_2", False))
+
+
+def regex_challenge():
+    st.markdown("### 🔍 6.3 Advanced Pattern Extraction")
+    st.write("""
+    The CA will test your ability to extract multiple types of entities from a single text block 
+    (like Hashtags AND Mentions) using capture groups and specific character classes.
+    """)
+
+    st.markdown("""
+    #### Regex Power Tools:
+    - `re.finditer()`: Better than `findall()` if you need capture groups or match positions.
+    - `group(1)`: Accesses the first bracketed set `()` in your pattern.
+    - `re.IGNORECASE`: Flag to match both `USD` and `usd`.
+    """)
+
+    # QUIZ 6.3
+    st.markdown("---")
+    exercise_container("q6_3")
+    q6_3 = quiz_input("q6_3")
+    if st.button("✓ Submit Answer", key="submit_q6_3", type="primary"):
+        if is_correct("q6_3", q6_3):
+            st.success(feedback("q6_3", True))
+            mark_completed("CH6", "6.3", "quiz")
+            if st.button("Go to Mock Exam! →"):
+                st.session_state.ch6_step = "🏆 CA Mock Exam"
+                st.rerun()
+        else:
+            st.error(feedback("q6_3", False))
+
+
+def mock_exam():
+    st.markdown("### 🏆 Comprehensive CA Mock Exam")
+    st.markdown("""
+    <div class="exercise-box" style="border-left: 5px solid #ffcc00;">
+    <b>Exam Scenario:</b> You are given a file <code>reviews.txt</code> with entries like:<br>
+    <code>R001 | 5 | Great flight! #smooth @pilot</code><br><br>
+    
+    <b>Your Task:</b> Code a solution that:
+    1. Loads the file and splits each line by <code>' | '</code>.
+    2. Uses regex to find ALL <b>hashtags</b> in the text.
+    3. Stores the counts of hashtags in a dictionary.
+    </div>
+    """, unsafe_allow_html=True)
+
+    user_exam_code = st.text_area("Write your solution (Python):", height=250, key="ca_exam")
+    if st.button("Finish CA Exam"):
+        if submit_challenge("ch6_exam", user_exam_code):
+            st.success("🎊 CA COMPLETE! You've matched the logic from the practice guide.")
+            st.balloons()
+            mark_completed("CH6", "TASK", "final")
+
+            if st.button("Start Final Capstone →", type="primary"):
+                 st.session_state.current_chapter = "Final Project"
+                 st.rerun()
+        else:
+            st.info("You need to split the line, use regex for '#', and count results.")
+
+
+STEPS = {
+    "6.1 XML Mastery": xml_mastery,
+    "6.2 NumPy Analytics": numpy_analytics,
+    "6.3 Regex Challenge": regex_challenge,
+    "🏆 CA Mock Exam": mock_exam,
+}
@@ -0,0 +1,68 @@
+"""Progress tracking, lesson widgets and challenge grading shared by every chapter."""
+import streamlit as st
+
+import progress
+from chapters import content, exercise_id
+from grading.engine import grade
+
+
+def mark_completed(chapter, lesson, exercise):
+    # Cached at once, written to the progress database in the background
+    progress.store().mark(st.session_state.learner_id, exercise_id(f"{chapter}_{lesson}_{exercise}"))
+
+
+def is_completed(chapter, lesson, exercise):
+    return progress.store().is_completed(st.session_state.learner_id, exercise_id(f"{chapter}_{lesson}_{exercise}"))
+
+
+def lesson_summary(summary_id):
+    st.markdown(content.bundle()["summaries"][summary_id], unsafe_allow_html=True)
+
+
+def exercise_container(exercise_id):
+    # Card HTML is rendered once, when the content bundle is compiled
+    st.markdown(content.bundle()["exercises"][exercise_id]["card"], unsafe_allow_html=True)
+
+
+def quiz_input(exercise_id):
+    """The exercise's answer widget; its value is what ``is_correct`` checks."""
+    ex = content.bundle()["exercises"][exercise_id]
+    if ex["widget"] == "radio":
+        return st.radio(ex["label"], ex["options"], key=exercise_id, index=None)
+    return st.text_input(ex["label"], key=exercise_id)
+
+
+def is_correct(exercise_id, answer):
+    ex = content.bundle()["exercises"][exercise_id]
+    if answer is None:
+        return False
+    for step in ex["normalize"]:
+        answer = getattr(answer, step)()
+    return answer in ex["answers"]
+
+
+def feedback(exercise_id, correct):
+    return content.bundle()["exercises"][exercise_id]["correct" if correct else "incorrect"]
+
+
+def submit_challenge(challenge_id, code):
+    """Run a challenge submission through the grader (see grading/); True when it passed.
+
+    Grading stops at the first failing test, for quick feedback. On failure
+    the learner sees what was missing, which tests passed and what their
+    code printed.
+    """
+    if not code.strip():
+        st.warning("Write your solution first.")
+        return False
+    with st.spinner("Running your code..."):
+        verdict = grade(challenge_id, code, fail_fast=True)
+    if verdict["passed"]:
+        return True
+    st.error(verdict["message"])
+    icons = {"passed": "✅", "skipped": "⏭️"}
+    st.caption(" · ".join(f"{icons.get(test['status'], '❌')} {test['test']}" for test in verdict["tests"]))
+    if verdict["output"]:
+        with st.expander("Your code's output"):
+            st.code(verdict["output"])
+    return False
@@ -0,0 +1,197 @@
+"""Course content compiled from declarative sources.
+
+``content/<chapter module>.json`` holds a chapter's exercises (card text, quiz
+widget, accepted answers, feedback) and lesson summaries. The sources are
+validated once and compiled into a single bundle in which every exercise card
+and summary is already rendered to HTML. The bundle is written to
+``content/.build/course-<hash>.json``, named by the hash of the sources, so
+later server processes load it straight from disk. Editing a source changes
+the hash and the next load rebuilds it.
+
+A server process loads the bundle once. With ``APP_DEV=1`` it also looks for
+edited sources, at most once a second, so content changes show up without a
+restart.
+
+    python -m chapters.content      # build ahead of deployment
+"""
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SOURCE_DIR = os.path.join(ROOT, "content")
+BUILD_DIR = os.path.join(SOURCE_DIR, ".build")
+# Bump when the compiled layout or the HTML templates change
+BUNDLE_FORMAT = 1
+# Re-check the sources while the server runs (for content authors)
+DEV_MODE = os.environ.get("APP_DEV", "") not in ("", "0")
+# Seconds between those checks; the quiz widgets call bundle() several times per rerun
+RELOAD_INTERVAL = 1.0
+
+DIFFICULTIES = ("beginner", "intermediate")
+WIDGETS = ("text_input", "radio")
+NORMALIZERS = ("strip", "lower", "upper")
+_CARD_FIELDS = ("name", "difficulty", "scenario", "instruction")
+_EXERCISE_FIELDS = _CARD_FIELDS + ("widget", "label", "options", "answers", "normalize", "correct", "incorrect")
+
+
+class ContentError(ValueError):
+    """Raised when a content source doesn't validate."""
+
+
+def _card_html(ex):
+    badge_class = "badge-beginner" if ex["difficulty"] == "beginner" else "badge-intermediate"
+    return f"""
+    <div class="exercise-box">
+        <div class="exercise-header">
+            <span class="badge {badge_class}">{ex["difficulty"]}</span>
+            <span>🧩 {ex["name"]}</span>
+        </div>
+        <p><b>Scenario:</b> {ex["scenario"]}</p>
+        <p style="color: #cbd5e1; font-size: 0.95rem;"><i>Instruction: {ex["instruction"]}</i></p>
+    </div>
+    """
+
+
+def _summary_html(summary):
+    return f"""
+    <div class="lesson-card">
+        <h3>📖 Lesson: {summary["title"]}</h3>
+        <p style="color: #94a3b8; font-style: italic;">Estimated time: {summary["time"]}</p>
+        <ul style="margin-top: 10px;">
+            {''.join([f'<li>{p}</li>' for p in summary["points"]])}
+        </ul>
+    </div>
+    """
+
+
+def _compile_exercise(where, ex):
+    unknown = set(ex) - set(_EXERCISE_FIELDS)
+    if unknown:
+        raise ContentError(f"{where}: unknown fields {sorted(unknown)}")
+    for field in ("widget", "label", "answers", "correct", "incorrect"):
+        if field not in ex:
+            raise ContentError(f"{where}: missing {field!r}")
+    card = [field for field in _CARD_FIELDS if field in ex]
+    if card and len(card) != len(_CARD_FIELDS):
+        raise ContentError(f"{where}: an exercise card needs all of {list(_CARD_FIELDS)}")
+    if card and ex["difficulty"] not in DIFFICULTIES:
+        raise ContentError(f"{where}: difficulty must be one of {DIFFICULTIES}")
+    if ex["widget"] not in WIDGETS:
+        raise ContentError(f"{where}: widget must be one of {WIDGETS}")
+    if not ex["answers"]:
+        raise ContentError(f"{where}: no accepted answers")
+    options = ex.get("options")
+    if ex["widget"] == "radio":
+        if not options:
+            raise ContentError(f"{where}: a radio quiz needs options")
+        if not set(ex["answers"]) <= set(options):
+            raise ContentError(f"{where}: answers must be among the options")
+    elif options is not None:
+        raise ContentError(f"{where}: options only apply to radio quizzes")
+    normalize = ex.get("normalize", [])
+    if not set(normalize) <= set(NORMALIZERS):
+        raise ContentError(f"{where}: normalize steps must be among {NORMALIZERS}")
+    return {
+        "card": _card_html(ex) if card else None,
+        "widget": ex["widget"],
+        "label": ex["label"],
+        "options": options,
+        "answers": ex["answers"],
+        "normalize": normalize,
+        "correct": ex["correct"],
+        "incorrect": ex["incorrect"],
+    }
+
+
+def _compile_summary(where, summary):
+    if set(summary) != {"title", "time", "points"}:
+        raise ContentError(f"{where}: a summary has exactly 'title', 'time' and 'points'")
+    return _summary_html(summary)
+
+
+def compile_sources(sources):
+    """Validate ``{file name: parsed JSON}`` and return the compiled bundle."""
+    exercises, summaries = {}, {}
+    for name, source in sorted(sources.items()):
+        unknown = set(source) - {"exercises", "summaries"}
+        if unknown:
+            raise ContentError(f"{name}: unknown sections {sorted(unknown)}")
+        for table, compile_entry, entries in ((exercises, _compile_exercise, source.get("exercises", {})),
+                                              (summaries, _compile_summary, source.get("summaries", {}))):
+            for entry_id, entry in entries.items():
+                if entry_id in table:
+                    raise ContentError(f"{name}: {entry_id!r} is already defined in another file")
+                table[entry_id] = compile_entry(f"{name}: {entry_id}", entry)
+    return {"exercises": exercises, "summaries": summaries}
+
+
+def _source_names():
+    return sorted(name for name in os.listdir(SOURCE_DIR) if name.endswith(".json"))
+
+
+def build():
+    """Load the bundle for the current sources, compiling it first if needed."""
+    raw = {}
+    digest = hashlib.sha1(f"format {BUNDLE_FORMAT}".encode())
+    for name in _source_names():
+        with open(os.path.join(SOURCE_DIR, name), "rb") as f:
+            raw[name] = f.read()
+        digest.update(name.encode() + b"\0" + raw[name] + b"\0")
+    path = os.path.join(BUILD_DIR, f"course-{digest.hexdigest()[:16]}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        pass
+
+    sources = {}
+    for name, data in raw.items():
+        try:
+            sources[name] = json.loads(data)
+        except ValueError as e:
+            raise ContentError(f"{name}: {e}") from None
+    compiled = compile_sources(sources)
+    os.makedirs(BUILD_DIR, exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(compiled, f, ensure_ascii=False, separators=(",", ":"))
+    # Atomic, so concurrent server processes never read a half-written bundle
+    os.replace(tmp, path)
+    for name in os.listdir(BUILD_DIR):
+        if name.startswith("course-") and name.endswith(".json") and name != os.path.basename(path):
+            try:
+                os.remove(os.path.join(BUILD_DIR, name))
+            except FileNotFoundError:
+                pass
+    return compiled
+
+
+_loaded = {"bundle": None, "stamp": None, "checked": 0.0}
+_load_lock = threading.Lock()
+
+
+def _source_stamp():
+    return tuple((name, os.stat(os.path.join(SOURCE_DIR, name)).st_mtime_ns) for name in _source_names())
+
+
+def bundle():
+    """The compiled bundle, loaded once per process (see DEV_MODE for reloading)."""
+    if _loaded["bundle"] is None or (DEV_MODE and time.monotonic() - _loaded["checked"] >= RELOAD_INTERVAL):
+        with _load_lock:
+            stamp = _source_stamp()
+            if stamp != _loaded["stamp"]:
+                _loaded.update(bundle=build(), stamp=stamp)
+            _loaded["checked"] = time.monotonic()
+    return _loaded["bundle"]
+
+
+if __name__ == "__main__":
+    try:
+        compiled = build()
+    except ContentError as e:
+        sys.exit(f"content error: {e}")
+    print(f"{len(compiled['exercises'])} exercises, {len(compiled['summaries'])} summaries -> {BUILD_DIR}")
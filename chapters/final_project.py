@@ -0,0 +1,65 @@
+"""Capstone: the Retail Intelligence Pipeline."""
+import streamlit as st
+
+from chapters.common import exercise_container, feedback, is_correct, mark_completed, quiz_input
+
+
+def render():
+    st.markdown("<h1>🏆 Capstone: The Retail Intelligence Pipeline</h1>", unsafe_allow_html=True)
+
+    st.markdown("""
+    <div class="lesson-card">
+    <h3>The Mission</h3>
+    <p>You are the Lead Analyst for <b>Electro-Pulse</b>. Your goal is to build an ETL pipeline that loads sales data, 
+    extracts discount codes with Regex, and identifies the most profitable region.</p>
+    </div>
+    """, unsafe_allow_html=True)
+
+    # PROJECT STEP 1
+    st.subheader("Step 1: Ingestion")
+    exercise_container("p_ex1")
+    p_ex1 = quiz_input("p_ex1")
+    if st.button("✓ Submit Step 1", key="submit_p_ex1", type="primary"):
+        if is_correct("p_ex1", p_ex1):
+            st.success(feedback("p_ex1", True))
+            mark_completed("PROJ", "FINAL", "ex1")
+        else:
+            st.error(feedback("p_ex1", False))
+
+        # PROJECT STEP 2 (Visible only after Step 1)
+        st.divider()
+        st.subheader("Step 2: regex Cleaning")
+        exercise_container("p_ex2")
+        p_ex2 = quiz_input("p_ex2")
+        if st.button("✓ Submit Step 2", key="submit_p_ex2", type="primary"):
+            if is_correct("p_ex2", p_ex2):
+                st.success(feedback("p_ex2", True))
+                mark_completed("PROJ", "FINAL", "ex2")
+            else:
+                st.error(feedback("p_ex2", False))
+
+            # PROJECT STEP 3
+            st.divider()
+            st.subheader("Step 3: Business Insight")
+            st.markdown("""
+            <div class="exercise-box">
+            <b>Scenario:</b> Your visual analysis shows that the 'West' region has high sales but very low profit. 
+            Which plot would BEST help you investigate the relationship between 'Discount Amount' and 'Profit Margin'?
+            </div>
+            """, unsafe_allow_html=True)
+            p_ex3 = quiz_input("p_ex3")
+            if st.button("✓ Submit Step 3", key="submit_p_ex3", type="primary"):
+                if is_correct("p_ex3", p_ex3):
+                    st.success(feedback("p_ex3", True))
+                    mark_completed("PROJ", "FINAL", "ex3")
+                    st.balloons()
+                    st.markdown("""
+                    ### 🎉 Congratulations!
+                    You have completed the **APDV Mastery Course**. You now have the skills to:
+                    - Extract data from multiple sources.
+                    - Clean text with Regex.
+                    - Query SQL databases.
+                    - Visualize complex business trends.
+                    """)
+                else:
+                    st.error(feedback("p_ex3", False))
@@ -0,0 +1,28 @@
+"""Welcome page: how the course works."""
+import streamlit as st
+
+
+def render():
+    st.markdown("<h1>Analytics Programming Mastery</h1>", unsafe_allow_html=True)
+    st.write("### The most structured way to learn Data Engineering & Visualization.")
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        st.markdown("""
+        <div class="lesson-card">
+            <h3>How to use this course:</h3>
+            <ol>
+                <li><b>Learn</b>: Read the high-level theory for each sub-topic.</li>
+                <li><b>Solve</b>: Complete the micro-quiz immediately after reading.</li>
+                <li><b>Progress</b>: Use the slider at the top of each chapter to move through topics.</li>
+                <li><b>Task</b>: Every chapter ends with a coding challenge that tests everything you've learned.</li>
+                <li><b>CA Lab</b>: A dedicated section for Continuous Assessment (CA) practice with real past exam logic.</li>
+            </ol>
+            <p style="color: #ffcc00; font-weight: bold;">Select "CH 1: Python Foundations" in the sidebar to begin!</p>
+        </div>
+        """, unsafe_allow_html=True)
+
+        if st.button("Start Chapter 1 →", type="primary"):
+            st.session_state.current_chapter = "CH 1: Python Foundations"
+            st.session_state.ch1_step = "1.1 Scalar Types"
+            st.rerun()
@@ -0,0 +1 @@
+"""Execution engine behind the sidebar code editor."""
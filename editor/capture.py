@@ -0,0 +1,270 @@
+"""Per-context capture of stdout, stderr and warnings.
+
+``contextlib.redirect_stdout`` swaps the process-wide ``sys.stdout``, so two
+cells running at the same time in different threads end up printing into each
+other's buffers. Instead, one router is installed on ``sys.stdout`` and
+``sys.stderr`` for the life of the process and each write is forwarded to the
+buffer bound to the current execution context. Writes from contexts that are
+not capturing go to the original stream untouched, and no lock is held while a
+cell runs.
+
+A cell's buffer keeps the head and tail of what it printed, so the output
+stored per cell (and re-sent on every rerun) stays bounded. The complete
+output also goes to a file in the spill directory (a temporary directory
+unless configured) that the editor pages through on demand.
+"""
+import contextlib
+import contextvars
+import os
+import sys
+import tempfile
+import threading
+import time
+import uuid
+import warnings
+from collections import deque
+
+# Characters of output kept per cell: the first OUTPUT_HEAD and the rest from
+# the end; anything in between is dropped (or paged from the spill file).
+OUTPUT_LIMIT = int(os.environ.get("EDITOR_OUTPUT_LIMIT", 20000))
+OUTPUT_HEAD = int(os.environ.get("EDITOR_OUTPUT_HEAD", 5000))
+# Directory for complete copies of long outputs (empty: no spilling), the cap
+# per cell in bytes, how long orphaned files live, how often they are looked
+# for, and the pager's page size.
+SPILL_DIR = os.environ.get("EDITOR_SPILL_DIR", os.path.join(tempfile.gettempdir(), "editor-spill"))
+SPILL_LIMIT = int(os.environ.get("EDITOR_SPILL_LIMIT", 64 * 1024 * 1024))
+SPILL_TTL = float(os.environ.get("EDITOR_SPILL_TTL", 24 * 3600))
+SPILL_SWEEP_INTERVAL = min(3600.0, max(60.0, SPILL_TTL))
+SPILL_PAGE = 16 * 1024
+
+_active = contextvars.ContextVar("editor_capture", default=None)
+_install_lock = threading.Lock()
+
+
+class _StreamRouter:
+    def __init__(self, fallback):
+        self._fallback = fallback
+
+    def write(self, s):
+        target = _active.get()
+        if target is None:
+            return self._fallback.write(s)
+        return target.write(s)
+
+    def flush(self):
+        if _active.get() is None:
+            self._fallback.flush()
+
+    def __getattr__(self, attr):
+        # encoding, fileno(), isatty() etc. come from the real stream
+        return getattr(self._fallback, attr)
+
+
+class OutputBuffer:
+    """Thread-safe buffer that keeps the first ``head`` and the last characters, up to ``limit``.
+
+    Whatever falls in between is counted in ``dropped`` and replaced by a
+    marker in ``getvalue()``; ``size`` is everything ever written.
+    ``on_write``, if given, sees every write as it happens (used to stream
+    output while the cell is still running).
+    """
+
+    def __init__(self, limit=OUTPUT_LIMIT, on_write=None, head=0):
+        self._head_limit = min(head, limit - 1)
+        self._tail_limit = limit - self._head_limit
+        self._on_write = on_write
+        self._head = []
+        self._head_size = 0
+        self._chunks = deque()
+        self._size = 0
+        self._lock = threading.Lock()
+        self.size = 0
+        self.dropped = 0
+        # Path of the complete output on disk, when capture() spilled it
+        self.spill = None
+
+    def write(self, s):
+        if not isinstance(s, str):
+            raise TypeError(f"write() argument must be str, not {type(s).__name__}")
+        with self._lock:
+            self.size += len(s)
+            rest = s
+            if self._head_size < self._head_limit:
+                kept = rest[:self._head_limit - self._head_size]
+                self._head.append(kept)
+                self._head_size += len(kept)
+                rest = rest[len(kept):]
+            if len(rest) >= self._tail_limit:
+                self.dropped += self._size + len(rest) - self._tail_limit
+                self._chunks.clear()
+                self._chunks.append(rest[-self._tail_limit:])
+                self._size = self._tail_limit
+            elif rest:
+                self._chunks.append(rest)
+                self._size += len(rest)
+                while self._size > self._tail_limit:
+                    excess = self._size - self._tail_limit
+                    head = self._chunks[0]
+                    if len(head) <= excess:
+                        self._chunks.popleft()
+                        self._size -= len(head)
+                        self.dropped += len(head)
+                    else:
+                        self._chunks[0] = head[excess:]
+                        self._size -= excess
+                        self.dropped += excess
+        if self._on_write is not None:
+            self._on_write(s)
+        return len(s)
+
+    def flush(self):
+        pass
+
+    def getvalue(self):
+        with self._lock:
+            head = "".join(self._head)
+            tail = "".join(self._chunks)
+            dropped = self.dropped
+        if not dropped:
+            return head + tail
+        if head and not head.endswith("\n"):
+            head += "\n"
+        return f"{head}[... {dropped:,} characters omitted ...]\n{tail}"
+
+    def drain(self):
+        """Return the buffered text and start over empty."""
+        text = self.getvalue()
+        with self._lock:
+            self._head.clear()
+            self._head_size = 0
+            self._chunks.clear()
+            self._size = 0
+            self.dropped = 0
+        return text
+
+
+class SpillFile:
+    """Complete copy of a cell's output on disk (UTF-8), capped at ``limit`` bytes."""
+
+    def __init__(self, path, limit=SPILL_LIMIT):
+        self.path = path
+        self._limit = limit
+        self._file = open(path, "wb")
+        self.size = 0
+
+    def write(self, s):
+        if self.size >= self._limit:
+            return
+        data = s.encode("utf-8", errors="backslashreplace")[:self._limit - self.size]
+        self._file.write(data)
+        self.size += len(data)
+
+    def close(self):
+        self._file.close()
+
+
+def new_spill_path():
+    os.makedirs(SPILL_DIR, exist_ok=True)
+    return os.path.join(SPILL_DIR, f"cell-{uuid.uuid4().hex}.txt")
+
+
+def discard_spill(path):
+    if path:
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+
+
+def sweep_spills(max_age=SPILL_TTL):
+    """Remove spill files older than ``max_age`` seconds.
+
+    A session's files go with its kernel (see editor.kernel); this catches
+    the ones a crashed or killed server left behind.
+    """
+    if not SPILL_DIR or not os.path.isdir(SPILL_DIR):
+        return
+    cutoff = time.time() - max_age
+    for entry in os.scandir(SPILL_DIR):
+        if entry.name.startswith("cell-") and entry.stat().st_mtime < cutoff:
+            discard_spill(entry.path)
+
+
+def spill_pages(path, page_size=SPILL_PAGE):
+    return max(1, -(-os.path.getsize(path) // page_size))
+
+
+def read_spill(path, page, page_size=SPILL_PAGE):
+    """Text of page ``page`` (0-based) of a spill file.
+
+    Pages are ``page_size`` bytes, widened or narrowed to whole UTF-8
+    characters: a character straddling a boundary belongs to the earlier page.
+    """
+    start = page * page_size
+    with open(path, "rb") as f:
+        f.seek(start)
+        data = f.read(page_size + 3)
+    begin = 0
+    while start and begin < len(data) and 0x80 <= data[begin] < 0xC0:
+        begin += 1
+    end = min(page_size, len(data))
+    while end < len(data) and 0x80 <= data[end] < 0xC0:
+        end += 1
+    return data[begin:end].decode("utf-8", errors="replace")
+
+
+_original_showwarning = warnings.showwarning
+
+
+def _show_warning(message, category, filename, lineno, file=None, line=None):
+    target = _active.get()
+    if target is None or file is not None:
+        return _original_showwarning(message, category, filename, lineno, file, line)
+    target.write(warnings.formatwarning(message, category, filename, lineno, line))
+
+
+def install():
+    """Put the routers in place; safe to call repeatedly."""
+    global _original_showwarning
+    with _install_lock:
+        for name in ("stdout", "stderr"):
+            stream = getattr(sys, name)
+            if not isinstance(stream, _StreamRouter):
+                setattr(sys, name, _StreamRouter(stream))
+        if warnings.showwarning is not _show_warning:
+            _original_showwarning = warnings.showwarning
+            warnings.showwarning = _show_warning
+
+
+@contextlib.contextmanager
+def capture(on_write=None, spill=None):
+    """Collect everything the current context prints, warns or writes to stderr.
+
+    Yields the ``OutputBuffer`` the output is written to, in the order it was
+    produced; it keeps the head and tail of long output. With ``spill`` (a
+    file path) the complete output is also written there. The file is kept
+    only if the buffer had to drop something, and ``buffer.spill`` is then
+    its path (otherwise None).
+    """
+    install()
+    sink = on_write
+    if spill is not None:
+        spill_file = SpillFile(spill)
+
+        def sink(s):
+            spill_file.write(s)
+            if on_write is not None:
+                on_write(s)
+
+    buffer = OutputBuffer(on_write=sink, head=OUTPUT_HEAD)
+    token = _active.set(buffer)
+    try:
+        yield buffer
+    finally:
+        _active.reset(token)
+        if spill is not None:
+            spill_file.close()
+            if buffer.dropped:
+                buffer.spill = spill
+            else:
+                discard_spill(spill)
@@ -0,0 +1,289 @@
+"""Runs a single editor cell against a namespace and packages the result."""
+import ast
+import cProfile
+import hashlib
+import importlib
+import io
+import os
+import pstats
+import re
+import sqlite3
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+import warnings
+from collections import OrderedDict
+
+from editor.capture import capture
+
+try:
+    import resource
+except ImportError:  # not on Windows; no peak RSS there
+    resource = None
+
+# Names every kernel starts with (see fresh_namespace)
+PRELOADED_NAMES = frozenset({'np', 'pd', 'plt', 'sns', 're', 'sqlite3', 'time', 'input'})
+
+CODE_CACHE_SIZE = 256
+_code_cache = OrderedDict()
+
+# "png" or "svg"; figures are encoded once and stored on the cell.
+FIGURE_FORMAT = os.environ.get("EDITOR_FIGURE_FORMAT", "png")
+MAX_FIGURES = 10
+
+# Rows shown when a cell is run with profiling on.
+PROFILE_TOP_N = 15
+# tracemalloc is process-wide: with in-process kernels only one cell at a time can own it.
+_tracemalloc_lock = threading.Lock()
+
+
+def _no_input(prompt=""):
+    raise RuntimeError(f"Interactive input('{prompt}') is not supported in this editor.\nPlease hardcode your values for testing (e.g., x = 10).")
+
+
+class LazyModule:
+    """Stands in for a module in a kernel namespace and imports it on first attribute access."""
+
+    def __init__(self, name, setup=None):
+        self._name = name
+        self._setup = setup
+        self._module = None
+
+    def _load(self):
+        if self._module is None:
+            if self._setup is not None:
+                self._setup()
+            self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, attr):
+        return getattr(self._load(), attr)
+
+    def __dir__(self):
+        return dir(self._load())
+
+    def __repr__(self):
+        return repr(self._load())
+
+
+def _use_agg():
+    import matplotlib
+    matplotlib.use("Agg")
+    # Figures are captured after the cell, so plt.show() has nothing to do
+    warnings.filterwarnings("ignore", message="FigureCanvasAgg is non-interactive")
+
+
+def fresh_namespace(lazy=False):
+    """Globals a new kernel starts with: the libraries the lessons use.
+
+    Worker processes import them eagerly (they are started ahead of need);
+    ``lazy`` hands out proxies instead so an in-process kernel only pays for
+    a library once a cell touches it.
+    """
+    if lazy:
+        np, pd = LazyModule("numpy"), LazyModule("pandas")
+        plt = LazyModule("matplotlib.pyplot", setup=_use_agg)
+        sns = LazyModule("seaborn", setup=_use_agg)
+    else:
+        _use_agg()
+        import numpy as np
+        import pandas as pd
+        import matplotlib.pyplot as plt
+        import seaborn as sns
+    return {
+        'np': np,
+        'pd': pd,
+        'plt': plt,
+        'sns': sns,
+        're': re,
+        'sqlite3': sqlite3,
+        'time': time,
+        'input': _no_input,
+    }
+
+
+def compile_cell(code):
+    """Parse a cell once and split off its trailing expression, Jupyter-style.
+
+    Returns ``(body, expr)`` code objects; ``expr`` is None when the cell does
+    not end in an expression. Results are cached by source hash so re-running
+    an unchanged cell skips parsing and compiling.
+    """
+    key = hashlib.sha1(code.encode("utf-8")).digest()
+    cached = _code_cache.get(key)
+    if cached is not None:
+        _code_cache.move_to_end(key)
+        return cached
+
+    tree = ast.parse(code, filename="<cell>", mode="exec")
+    expr = None
+    if tree.body and isinstance(tree.body[-1], ast.Expr):
+        expr = compile(ast.Expression(tree.body.pop().value), "<cell>", "eval")
+    compiled = (compile(tree, "<cell>", "exec"), expr)
+
+    _code_cache[key] = compiled
+    if len(_code_cache) > CODE_CACHE_SIZE:
+        _code_cache.popitem(last=False)
+    return compiled
+
+
+def open_figures():
+    """Numbers of the pyplot figures open right now (none before pyplot is imported)."""
+    plt = sys.modules.get("matplotlib.pyplot")
+    return frozenset(plt.get_fignums()) if plt is not None else frozenset()
+
+
+def collect_figures(existing=frozenset()):
+    """Encode the pyplot figures opened since ``existing`` was taken, then close them.
+
+    Figures open before that are left alone: with in-process kernels pyplot is
+    shared by every session, and those belong to other sessions' cells.
+    """
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is None:
+        return []
+    created = [num for num in plt.get_fignums() if num not in existing]
+    figures = []
+    for num in created[:MAX_FIGURES]:
+        buf = io.BytesIO()
+        try:
+            plt.figure(num).savefig(buf, format=FIGURE_FORMAT, bbox_inches="tight")
+        except Exception:
+            continue
+        data = buf.getvalue()
+        figures.append(data.decode("utf-8") if FIGURE_FORMAT == "svg" else data)
+    # Beyond MAX_FIGURES too, so they don't pile up across runs
+    for num in created:
+        plt.close(num)
+    return figures
+
+
+def _reset_peak_rss():
+    # Linux can reset the high-water mark, so the next reading covers one run only
+    try:
+        with open("/proc/self/clear_refs", "w") as f:
+            f.write("5")
+    except OSError:
+        pass
+
+
+def _peak_rss():
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    if resource is None:
+        return None
+    # The process's high-water mark so far: kilobytes, except on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class CellProfile:
+    """Resource usage of one cell run.
+
+    Records wall time (``perf_counter``), process CPU time and the net change
+    in allocated memory blocks (``sys.getallocatedblocks``: what the cell left
+    allocated, not how much it allocated along the way). With ``own_process``
+    (a kernel worker, which runs one cell at a time) it also records the
+    process's peak RSS during the run; on Linux the high-water mark is reset
+    first, elsewhere it is the worker's peak so far. With ``hotspots`` it keeps
+    the top cProfile entries and the peak memory traced by tracemalloc;
+    tracing slows allocation-heavy code several times over, so plain runs
+    skip it. The timers start after tracing and profiling are switched on
+    and stop before they are torn down, but under ``hotspots`` they still
+    include the overhead of both.
+    """
+
+    def __init__(self, hotspots=False, own_process=False):
+        self.hotspots = hotspots
+        self.own_process = own_process
+        self.exec_time = 0.0
+        self.cpu_time = 0.0
+        self.peak_rss = None
+        self.peak_memory = None
+        self.net_blocks = 0
+        self.profile = None
+        self._profiler = None
+        self._traced = False
+
+    def __enter__(self):
+        if self.own_process:
+            _reset_peak_rss()
+        self._traced = (self.hotspots and not tracemalloc.is_tracing()
+                        and _tracemalloc_lock.acquire(blocking=False))
+        if self._traced:
+            tracemalloc.start()
+        self._blocks = sys.getallocatedblocks()
+        if self.hotspots:
+            self._profiler = cProfile.Profile()
+            self._profiler.enable()
+        self._cpu = time.process_time()
+        self._wall = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.exec_time = time.perf_counter() - self._wall
+        self.cpu_time = time.process_time() - self._cpu
+        if self._profiler is not None:
+            self._profiler.disable()
+            stream = io.StringIO()
+            pstats.Stats(self._profiler, stream=stream).sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+            self.profile = stream.getvalue().strip()
+        self.net_blocks = sys.getallocatedblocks() - self._blocks
+        if self.own_process:
+            self.peak_rss = _peak_rss()
+        if self._traced:
+            self.peak_memory = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            _tracemalloc_lock.release()
+        return False
+
+    def results(self):
+        return {"exec_time": self.exec_time, "cpu_time": self.cpu_time, "peak_rss": self.peak_rss,
+                "peak_memory": self.peak_memory, "net_blocks": self.net_blocks, "profile": self.profile}
+
+
+def make_result(output, status, exec_time=0.0):
+    """A complete cell result for runs that never reached ``run_cell`` (dead or stuck kernels)."""
+    return {"output": output, "status": status, "figures": [], "exec_time": exec_time,
+            "cpu_time": 0.0, "peak_rss": None, "peak_memory": None, "net_blocks": 0, "profile": None,
+            "output_size": len(output), "spill": None}
+
+
+def run_cell(code, namespace, on_write=None, profile=False, spill=None, own_process=False):
+    """Execute ``code`` in ``namespace`` and return the fields stored on the cell dict.
+
+    The body runs once and only the trailing expression is evaluated for
+    display; its ``repr`` follows anything the cell printed. ``on_write`` is
+    called with each chunk of output as it is produced. ``profile`` adds the
+    top cProfile hotspots and traced peak memory to the resource figures every
+    run records; ``own_process`` says the process runs nothing else, so its
+    peak RSS is the cell's (see ``CellProfile``).
+    ``output`` keeps the head and tail of long output; ``output_size`` is the
+    full length, and ``spill`` the file holding all of it when a spill path
+    was given and the output didn't fit (see ``capture``).
+    """
+    status = "success"
+    usage = CellProfile(hotspots=profile, own_process=own_process)
+    existing = open_figures()
+    with capture(on_write, spill) as output_capture:
+        try:
+            body, expr = compile_cell(code)
+            with usage:
+                exec(body, namespace)
+                res = eval(expr, namespace) if expr is not None else None
+            if res is not None:
+                output_capture.write(repr(res))
+        except (Exception, KeyboardInterrupt) as e:
+            # Keep whatever the cell printed before it failed
+            output_capture.write(traceback.format_exc())
+            status = "interrupted" if isinstance(e, KeyboardInterrupt) else "error"
+        output = output_capture.getvalue()
+    return {"output": output, "status": status, "figures": collect_figures(existing), **usage.results(),
+            "output_size": output_capture.size, "spill": output_capture.spill}
@@ -0,0 +1,153 @@
+"""Cell dependency graph for incremental "Run All".
+
+Each cell is reduced to the names it defines and the names it reads. A cell
+needs re-running when its source changed since its last successful run, the
+kernel was restarted underneath it, or a cell it depends on has run more
+recently than it did. Everything downstream of a re-run cell is re-run too;
+the rest keep their stored outputs.
+
+The analysis is deliberately conservative: a name that has a method called on
+it or an attribute/item assigned (``df.dropna(inplace=True)``,
+``df['x'] = 1``) counts as redefined, and names bound inside functions count
+as cell-level definitions. A cell that uses a function or class defined in
+the notebook also reads the globals that body reads, so ``f()`` re-runs when
+a cell redefines a ``k`` that ``def f(): return k`` looks up.
+"""
+import ast
+import hashlib
+from functools import lru_cache
+
+from editor.executor import PRELOADED_NAMES
+
+
+def source_hash(code):
+    return hashlib.sha1(code.encode("utf-8")).hexdigest()
+
+
+def _root_name(node):
+    while isinstance(node, (ast.Attribute, ast.Subscript)):
+        node = node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+@lru_cache(maxsize=1024)
+def analyze(code):
+    """Return ``(defines, reads)`` frozensets of top-level names for a cell."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return frozenset(), frozenset()
+    defines, reads = set(), set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            (reads if isinstance(node.ctx, ast.Load) else defines).add(node.id)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            defines.add(node.name)
+        elif isinstance(node, (ast.Import, ast.ImportFrom)):
+            for alias in node.names:
+                defines.add(alias.asname or alias.name.split(".")[0])
+        elif isinstance(node, (ast.Assign, ast.AugAssign, ast.AnnAssign, ast.Delete)):
+            targets = node.targets if isinstance(node, (ast.Assign, ast.Delete)) else [node.target]
+            for target in targets:
+                if isinstance(target, (ast.Attribute, ast.Subscript)):
+                    name = _root_name(target)
+                    if name and name not in PRELOADED_NAMES:
+                        defines.add(name)
+        elif isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+            name = _root_name(node.func.value)
+            if name and name not in PRELOADED_NAMES:
+                defines.add(name)
+    return frozenset(defines), frozenset(reads)
+
+
+@lru_cache(maxsize=1024)
+def body_reads(code):
+    """Map each function or class a cell defines to the outside names its body reads."""
+    try:
+        tree = ast.parse(code)
+    except SyntaxError:
+        return {}
+    bodies = {}
+    for node in ast.walk(tree):
+        if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            loads, local = set(), set()
+            for child in ast.walk(node):
+                if isinstance(child, ast.Name):
+                    (loads if isinstance(child.ctx, ast.Load) else local).add(child.id)
+                elif isinstance(child, ast.arg):
+                    local.add(child.arg)
+            bodies[node.name] = bodies.get(node.name, frozenset()) | frozenset(loads - local)
+    return bodies
+
+
+def _with_callee_reads(deps, cells):
+    # Follows calls through any definition in the notebook, and through the
+    # functions those call in turn
+    bodies = {}
+    for cell in cells:
+        for name, reads in body_reads(cell.get("input", "")).items():
+            bodies[name] = bodies.get(name, frozenset()) | reads
+    extended = []
+    for defines, reads in deps:
+        reads, todo = set(reads), [name for name in reads if name in bodies]
+        seen = set()
+        while todo:
+            name = todo.pop()
+            if name in seen:
+                continue
+            seen.add(name)
+            for read in bodies[name] - reads:
+                reads.add(read)
+                if read in bodies:
+                    todo.append(read)
+        extended.append((defines, frozenset(reads)))
+    return extended
+
+
+def _depends_on(later, earlier):
+    later_defines, later_reads = later
+    earlier_defines, _ = earlier
+    # Re-running `earlier` changes what `later` reads, or clobbers what `later` last wrote
+    return bool(earlier_defines & (later_reads | later_defines))
+
+
+def plan_run_all(cells, generation):
+    """Indices of the cells "Run All" has to execute, in notebook order.
+
+    ``generation`` is the kernel's restart counter; cells recorded against an
+    older generation lost their state and always re-run.
+    """
+    deps = _with_callee_reads([analyze(c.get("input", "")) for c in cells], cells)
+    has_code = [bool(c.get("input", "").strip()) for c in cells]
+
+    dirty = set()
+    for i, cell in enumerate(cells):
+        if not has_code[i]:
+            continue
+        fresh = (cell.get("status") == "success"
+                 and cell.get("ran_hash") == source_hash(cell.get("input", "").strip())
+                 and cell.get("kernel_gen") == generation)
+        if not fresh:
+            dirty.add(i)
+            continue
+        # An upstream cell was run on its own after this one
+        for j in range(i):
+            if (has_code[j] and _depends_on(deps[i], deps[j])
+                    and cells[j].get("run_seq", 0) > cell.get("run_seq", 0)):
+                dirty.add(i)
+                break
+
+    changed = True
+    while changed:
+        changed = False
+        for i in sorted(dirty):
+            defines, reads = deps[i]
+            for j in range(len(cells)):
+                if j in dirty or not has_code[j]:
+                    continue
+                # Downstream cells see new values; upstream definers of names
+                # this cell updates in place (x = x + 1) must reset them first.
+                if (j > i and _depends_on(deps[j], deps[i])) or (j < i and deps[j][0] & defines & reads):
+                    dirty.add(j)
+                    changed = True
+    return sorted(dirty)
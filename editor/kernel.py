@@ -0,0 +1,429 @@
+"""Out-of-process kernels for the sidebar code editor.
+
+Each learner session leases its own worker process from a shared pool and
+sends cells to it over a pipe. The worker owns that session's namespace, so a
+runaway cell only stalls (or kills) one learner's kernel, and sessions run in
+parallel across cores instead of queueing on the server's GIL.
+"""
+import atexit
+import ctypes
+import multiprocessing as mp
+import os
+import signal
+import sys
+import threading
+import time
+import types
+import weakref
+
+from editor.capture import OutputBuffer, discard_spill
+from editor.executor import fresh_namespace, make_result, run_cell
+
+# "process" leases a worker per session; "local" runs cells inside the server
+# (for hosts that don't allow subprocesses).
+KERNEL_MODE = os.environ.get("EDITOR_KERNEL", "process")
+# Idle workers kept warm (libraries already imported) ahead of new sessions.
+POOL_SIZE = int(os.environ.get("EDITOR_KERNEL_POOL_SIZE", min(4, os.cpu_count() or 1)))
+# Hard cap on live workers, leased + idle.
+MAX_KERNELS = int(os.environ.get("EDITOR_MAX_KERNELS", 32))
+# Wall-clock budget per cell, in seconds (0 disables it).
+CELL_TIMEOUT = float(os.environ.get("EDITOR_CELL_TIMEOUT", 30))
+# A leased worker unused this long, in seconds, goes back to the pool (0 disables it).
+IDLE_TIMEOUT = float(os.environ.get("EDITOR_KERNEL_IDLE_TIMEOUT", 600))
+
+_POLL_INTERVAL = 0.25
+# How often a worker ships a running cell's new output to the server.
+_STREAM_INTERVAL = 0.1
+# How long an interrupted cell gets to unwind before its kernel is restarted.
+_INTERRUPT_GRACE = 2.0
+
+KERNEL_DIED = ("Kernel died while running this cell (out of memory?).\n"
+               "It has been restarted, so variables from earlier cells are gone.")
+KERNEL_RESTARTED = ("The cell did not respond to the interrupt, so its kernel was restarted.\n"
+                    "Variables from earlier cells are gone.\n")
+KERNEL_RECLAIMED = ("The kernel sat idle for a while and was shut down to free it for other learners.\n"
+                    "It has been restarted, so variables from earlier cells are gone.\n")
+
+
+class KernelUnavailable(RuntimeError):
+    """Raised when every worker slot is already leased."""
+
+
+def _keep_spill(spills, result, spill):
+    # Spill files a session's cells still show are removed with its kernel;
+    # the ones since replaced were removed already
+    if spill and result.get("spill") == spill:
+        spills.difference_update([path for path in spills if not os.path.exists(path)])
+        spills.add(spill)
+
+
+def _discard_spills(spills):
+    for path in spills:
+        discard_spill(path)
+
+
+def _wait(done, timeout, on_tick):
+    """Block until ``done(interval)`` is true.
+
+    Returns None on completion, "timeout" once ``timeout`` seconds pass, or
+    "interrupted" as soon as ``on_tick()`` returns True.
+    """
+    deadline = time.monotonic() + timeout if timeout else None
+    while not done(_POLL_INTERVAL):
+        if deadline is not None and time.monotonic() > deadline:
+            return "timeout"
+        if on_tick is not None and on_tick():
+            return "interrupted"
+    return None
+
+
+def _stopped(result, stop, timeout):
+    # The cell may have finished on its own just before the interrupt landed
+    if result["status"] == "interrupted":
+        result["status"] = stop
+        if stop == "timeout":
+            result["output"] += f"\n⏱ Stopped after the {timeout:g}s time limit."
+    return result
+
+
+_in_cell = False
+
+
+def _on_sigint(signum, frame):
+    # Only user code is interruptible; a late SIGINT while the worker is idle
+    # or sending a reply must not kill it.
+    if _in_cell:
+        raise KeyboardInterrupt
+
+
+def _run_interruptible(code, namespace, on_write=None, profile=False, spill=None):
+    global _in_cell
+    _in_cell = True
+    try:
+        return run_cell(code, namespace, on_write, profile, spill, own_process=True)
+    except KeyboardInterrupt:
+        return make_result("KeyboardInterrupt\n", "interrupted")
+    finally:
+        _in_cell = False
+
+
+def _stream_output(conn, send_lock, pending):
+    # Batch a running cell's writes instead of sending one message per print()
+    while True:
+        time.sleep(_STREAM_INTERVAL)
+        with send_lock:
+            text = pending.drain()
+            if text:
+                conn.send(("stream", text))
+
+
+def _worker_main(conn):
+    signal.signal(signal.SIGINT, _on_sigint)
+    namespace = fresh_namespace()
+    send_lock = threading.Lock()
+    # Bounded, so a tight print loop can't outrun the pipe and grow without limit
+    pending = OutputBuffer()
+    threading.Thread(target=_stream_output, args=(conn, send_lock, pending), daemon=True).start()
+    conn.send(("ready", None))
+    while True:
+        try:
+            op, payload = conn.recv()
+        except EOFError:
+            break
+        if op == "run":
+            result = _run_interruptible(payload["code"], namespace, pending.write, payload["profile"], payload["spill"])
+            with send_lock:
+                # The result carries the full (bounded) output; anything not yet streamed is redundant
+                pending.drain()
+                conn.send(("result", result))
+        elif op == "close":
+            break
+
+
+# Stands in for __main__ while a worker starts (see start_process).
+_no_main = types.ModuleType("__main__")
+_main_lock = threading.Lock()
+
+
+def start_process(process):
+    """Start ``process`` without it re-running the server's main script.
+
+    Under both spawn and forkserver, multiprocessing imports the parent's
+    ``__main__`` in every child (and in the fork server itself) before the
+    target runs. Workers are started from script threads, where Streamlit has
+    made app.py ``__main__``, yet they need nothing from it: their entry
+    points live in importable modules. While the process starts, ``__main__``
+    is a module with no file, so there is nothing to re-run.
+    """
+    with _main_lock:
+        main = sys.modules["__main__"]
+        sys.modules["__main__"] = _no_main
+        try:
+            process.start()
+        finally:
+            # Unless a new script run has installed its own __main__ meanwhile
+            if sys.modules.get("__main__") is _no_main:
+                sys.modules["__main__"] = main
+
+
+class _Worker:
+    def __init__(self, ctx):
+        self.conn, child_conn = ctx.Pipe()
+        self.process = ctx.Process(target=_worker_main, args=(child_conn,), daemon=True)
+        start_process(self.process)
+        child_conn.close()
+        self.ready = False
+
+    def wait_ready(self):
+        # Blocks while a fresh worker is still importing its libraries
+        if not self.ready:
+            self.conn.recv()
+            self.ready = True
+
+    def alive(self):
+        return self.process.is_alive()
+
+    def stop(self):
+        try:
+            self.conn.send(("close", None))
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout=0.5)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+def mp_context():
+    # Fork workers from a warm template process (editor/template.py) where the
+    # platform allows it; elsewhere each worker is spawned and imports from scratch.
+    if "forkserver" in mp.get_all_start_methods():
+        ctx = mp.get_context("forkserver")
+        ctx.set_forkserver_preload(["editor.template"])
+        return ctx
+    return mp.get_context("spawn")
+
+
+class KernelPool:
+    """Pre-started workers handed out one per session.
+
+    Workers are never reused across sessions: a released worker is stopped and
+    the pool tops itself back up in the background. Sessions only let go of
+    their kernel when they are garbage-collected, so a worker left unused for
+    ``idle_timeout`` seconds is taken back too (see ``Kernel.close``).
+    """
+
+    def __init__(self, size=POOL_SIZE, max_kernels=MAX_KERNELS, idle_timeout=IDLE_TIMEOUT):
+        self._ctx = mp_context()
+        self._size = size
+        self._max = max_kernels
+        self._idle_timeout = idle_timeout
+        self._lock = threading.Lock()
+        self._idle = []
+        self._leased = 0
+        self._kernels = weakref.WeakSet()
+        self._closed = False
+        self._fill()
+        if idle_timeout:
+            threading.Thread(target=self._reclaim, daemon=True).start()
+        atexit.register(self.shutdown)
+
+    def _fill(self):
+        with self._lock:
+            while (not self._closed and len(self._idle) < self._size
+                   and len(self._idle) + self._leased < self._max):
+                self._idle.append(_Worker(self._ctx))
+
+    def lease(self):
+        kernel = Kernel(self, self._lease_worker())
+        with self._lock:
+            self._kernels.add(kernel)
+        return kernel
+
+    def _lease_worker(self):
+        with self._lock:
+            worker = None
+            while self._idle and worker is None:
+                candidate = self._idle.pop()
+                if candidate.alive():
+                    worker = candidate
+            if worker is None:
+                if self._leased >= self._max:
+                    raise KernelUnavailable(f"All {self._max} code kernels are busy, please try again shortly.")
+                worker = _Worker(self._ctx)
+            self._leased += 1
+        threading.Thread(target=self._fill, daemon=True).start()
+        return worker
+
+    def _respawn(self, worker):
+        worker.stop()
+        return _Worker(self._ctx)
+
+    def _release(self, slot):
+        worker, slot[0] = slot[0], None
+        if worker is None:
+            return
+        worker.stop()
+        with self._lock:
+            self._leased -= 1
+        if not self._closed:
+            threading.Thread(target=self._fill, daemon=True).start()
+
+    def _reclaim(self):
+        while not self._closed:
+            time.sleep(max(1.0, min(60.0, self._idle_timeout / 4)))
+            with self._lock:
+                kernels = list(self._kernels)
+            for kernel in kernels:
+                kernel.close(idle_for=self._idle_timeout)
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, []
+        for worker in idle:
+            worker.stop()
+
+
+class Kernel:
+    """One session's worker. The worker is retired when the kernel is closed or garbage-collected.
+
+    A closed kernel leases a new worker on its next run. ``generation`` goes
+    up whenever the namespace is lost (worker restart or close), so callers
+    can tell which stored results are still backed by live variables.
+    """
+
+    def __init__(self, pool, worker):
+        self.generation = 0
+        self.last_used = time.monotonic()
+        self._pool = pool
+        self._slot = [worker]
+        self._spills = set()
+        self._lock = threading.Lock()
+        weakref.finalize(self, pool._release, self._slot)
+        weakref.finalize(self, _discard_spills, self._spills)
+
+    def _restart(self):
+        self._slot[0] = self._pool._respawn(self._slot[0])
+        self.generation += 1
+
+    def run(self, code, timeout=CELL_TIMEOUT, on_tick=None, on_output=None, profile=False, spill=None):
+        """Run a cell, stopping it after ``timeout`` seconds or once ``on_tick()`` returns True.
+
+        ``on_output`` receives the cell's output in chunks while it runs;
+        ``profile`` asks for cProfile hotspots and peak memory (see ``CellProfile``);
+        ``spill`` is a path the worker may write the complete output to.
+        Stopping sends SIGINT so the cell unwinds with a KeyboardInterrupt and
+        the namespace survives; a cell stuck in native code past the grace
+        period gets its worker restarted instead.
+        """
+        with self._lock:
+            reclaimed = self._slot[0] is None
+            if reclaimed:
+                try:
+                    self._slot[0] = self._pool._lease_worker()
+                except KernelUnavailable as e:
+                    return make_result(str(e), "error")
+            try:
+                result = self._run(code, timeout, on_tick, on_output, profile, spill)
+            finally:
+                self.last_used = time.monotonic()
+            _keep_spill(self._spills, result, spill)
+            if reclaimed:
+                result["output"] = KERNEL_RECLAIMED + result["output"]
+            return result
+
+    def _run(self, code, timeout, on_tick, on_output, profile, spill):
+        box = {}
+        worker = self._slot[0]
+
+        def done(interval):
+            while worker.conn.poll(interval):
+                kind, payload = worker.conn.recv()
+                if kind == "result":
+                    box["result"] = payload
+                    return True
+                if on_output is not None:
+                    on_output(payload)
+                interval = 0
+            return False
+
+        try:
+            worker.wait_ready()
+            started = time.time()
+            worker.conn.send(("run", {"code": code, "profile": profile, "spill": spill}))
+            stop = _wait(done, timeout, on_tick)
+            if stop is None:
+                return box["result"]
+            if os.name == "posix":
+                os.kill(worker.process.pid, signal.SIGINT)
+                if _wait(done, _INTERRUPT_GRACE, None) is None:
+                    return _stopped(box["result"], stop, timeout)
+            self._restart()
+            result = make_result(KERNEL_RESTARTED, "interrupted", time.time() - started)
+            return _stopped(result, stop, timeout)
+        except (EOFError, OSError):
+            self._restart()
+            return make_result(KERNEL_DIED, "error")
+
+    def close(self, idle_for=0):
+        """Hand the worker back to the pool, if the kernel has been unused for ``idle_for`` seconds.
+
+        A running cell holds the kernel, so it is never closed mid-run.
+        """
+        if not self._lock.acquire(blocking=False):
+            return
+        try:
+            if self._slot[0] is not None and time.monotonic() - self.last_used >= idle_for:
+                self._pool._release(self._slot)
+                self.generation += 1
+        finally:
+            self._lock.release()
+
+
+class LocalKernel:
+    """Runs cells on a thread inside the server process."""
+
+    def __init__(self):
+        self.generation = 0
+        self.namespace = fresh_namespace(lazy=True)
+        self._spills = set()
+        weakref.finalize(self, _discard_spills, self._spills)
+
+    def run(self, code, timeout=CELL_TIMEOUT, on_tick=None, on_output=None, profile=False, spill=None):
+        result = self._run(code, timeout, on_tick, on_output, profile, spill)
+        _keep_spill(self._spills, result, spill)
+        return result
+
+    def _run(self, code, timeout, on_tick, on_output, profile, spill):
+        box = {}
+
+        def target():
+            try:
+                box["result"] = run_cell(code, self.namespace, on_output, profile, spill)
+            except KeyboardInterrupt:
+                box["result"] = make_result("KeyboardInterrupt\n", "interrupted")
+
+        def done(interval):
+            thread.join(interval)
+            return not thread.is_alive()
+
+        started = time.time()
+        thread = threading.Thread(target=target, daemon=True)
+        thread.start()
+        stop = _wait(done, timeout, on_tick)
+        if stop is None:
+            return box["result"]
+        # Raised at the thread's next bytecode boundary
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread.ident), ctypes.py_object(KeyboardInterrupt))
+        if done(_INTERRUPT_GRACE):
+            return _stopped(box["result"], stop, timeout)
+        # Threads can't be killed: abandon it together with the namespace it is writing to
+        self.reset()
+        result = make_result(KERNEL_RESTARTED, "interrupted", time.time() - started)
+        return _stopped(result, stop, timeout)
+
+    def reset(self):
+        self.namespace = fresh_namespace(lazy=True)
+        self.generation += 1
@@ -0,0 +1,29 @@
+"""Warm-up for the kernel fork server.
+
+The fork server imports this module once. Every kernel worker is then forked
+from that process copy-on-write, with the data libraries, matplotlib's font
+cache and the Agg renderer already loaded, so a new session's kernel starts
+almost instantly and the read-only pages stay shared between learners.
+"""
+import gc
+
+import editor.kernel  # noqa: F401  (worker entry point, imported once here rather than per fork)
+import grading.engine  # noqa: F401  (same, for grading workers)
+from editor.executor import collect_figures, fresh_namespace
+
+
+def warm():
+    namespace = fresh_namespace()
+    plt, pd = namespace["plt"], namespace["pd"]
+    # Loads fonts and the text/Agg rendering paths a first plot would otherwise pay for
+    fig, ax = plt.subplots()
+    ax.plot([0, 1], [0, 1])
+    ax.set_title("warm-up")
+    collect_figures()
+    pd.DataFrame({"a": [1.0, 2.0]}).describe()
+    # Keep the collector from touching (and un-sharing) the template's objects in every child
+    gc.collect()
+    gc.freeze()
+
+
+warm()
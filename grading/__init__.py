@@ -0,0 +1 @@
+"""Execution-based grading for the chapter challenges."""
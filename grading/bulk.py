@@ -0,0 +1,161 @@
+"""Grade a batch of submissions offline, e.g. a cohort's after the tests change.
+
+Reads JSONL records ``{"learner": ..., "challenge": ..., "code": ...}`` and
+grades them with the same engine as the in-app challenges (every test case,
+for partial credit), several submissions at a time. Records are streamed: at
+most ``--window`` are held in memory, and results are written in input order
+as JSONL (per-test statuses included, outputs left out) or CSV.
+
+Every ``--checkpoint-every`` records the output is flushed and
+``<output>.ckpt`` records how far it got; ``--resume`` continues an
+interrupted run from there. Duplicate submissions hit the verdict cache
+(grading/cache.py), so only distinct solutions run.
+
+    python -m grading.bulk submissions.jsonl -o results.csv
+    python -m grading.bulk submissions.jsonl -o results.jsonl --resume
+"""
+import argparse
+import collections
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from grading.challenges import CHALLENGES
+from grading.engine import TIMEOUT, WORKERS, grade
+from grading.sql import SQL_CHALLENGES
+
+CSV_FIELDS = ("line", "learner", "challenge", "passed", "status", "score", "message", "cached", "ms")
+
+
+def read_records(path, skip):
+    """``(line number, record or None, error)`` per input line, after the first ``skip`` lines."""
+    with open(path, encoding="utf-8") as f:
+        for number, line in enumerate(f, 1):
+            if number <= skip or not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:
+                yield number, None, f"invalid JSON: {e}"
+                continue
+            if not isinstance(record, dict) or not isinstance(record.get("code"), str):
+                yield number, None, "expected an object with a 'code' string"
+            elif record.get("challenge") not in CHALLENGES and record.get("challenge") not in SQL_CHALLENGES:
+                yield number, record, f"unknown challenge {record.get('challenge')!r}"
+            else:
+                yield number, record, None
+
+
+def grade_record(number, record, error, timeout, fail_fast):
+    row = {"line": number, "learner": (record or {}).get("learner"), "challenge": (record or {}).get("challenge")}
+    if error:
+        return dict(row, passed=False, status="invalid", score=0.0, message=error, cached=False, ms=0.0, tests=[])
+    verdict = grade(record["challenge"], record["code"], timeout=timeout, fail_fast=fail_fast)
+    return dict(row, passed=verdict["passed"], status=verdict["status"], score=round(verdict["score"], 4),
+                message=verdict["message"], cached=verdict["cached"], ms=round(verdict["time"] * 1000, 1),
+                tests=[{"test": t["test"], "status": t["status"], "message": t["message"]} for t in verdict["tests"]])
+
+
+class Writer:
+    """Results in JSONL or CSV, appended after ``offset`` bytes of an earlier run."""
+
+    def __init__(self, path, fmt, offset):
+        self.fmt = fmt
+        self.file = open(path, "a+", encoding="utf-8", newline="")
+        self.file.truncate(offset)
+        self.file.seek(offset)
+        self.csv = csv.DictWriter(self.file, CSV_FIELDS, extrasaction="ignore") if fmt == "csv" else None
+        if self.csv is not None and offset == 0:
+            self.csv.writeheader()
+
+    def write(self, row):
+        if self.csv is not None:
+            self.csv.writerow(row)
+        else:
+            self.file.write(json.dumps(row, ensure_ascii=False) + "\n")
+
+    def sync(self):
+        self.file.flush()
+        os.fsync(self.file.fileno())
+        return self.file.tell()
+
+    def close(self):
+        self.file.close()
+
+
+def save_checkpoint(path, state):
+    tmp = f"{path}.tmp"
+    with open(tmp, "w", encoding="utf-8") as f:
+        json.dump(state, f)
+    # Atomic, so an interrupted run never leaves a half-written checkpoint
+    os.replace(tmp, path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("input", help="JSONL file of {learner, challenge, code} records")
+    parser.add_argument("-o", "--output", required=True, help="results file (.jsonl or .csv)")
+    parser.add_argument("--format", choices=("jsonl", "csv"), help="output format (default: from the extension)")
+    parser.add_argument("--workers", type=int, default=WORKERS, help="submissions graded at once")
+    parser.add_argument("--window", type=int, default=0,
+                        help="records read ahead of the oldest unfinished one (default: 4 x workers)")
+    parser.add_argument("--timeout", type=float, default=TIMEOUT, help="wall-clock seconds per test case")
+    parser.add_argument("--fail-fast", action="store_true", help="stop each submission at its first failing test")
+    parser.add_argument("--checkpoint-every", type=int, default=100, help="records between checkpoints")
+    parser.add_argument("--resume", action="store_true", help="continue from the output's checkpoint")
+    args = parser.parse_args()
+
+    fmt = args.format or ("csv" if args.output.endswith(".csv") else "jsonl")
+    window = args.window or 4 * args.workers
+    checkpoint = f"{args.output}.ckpt"
+    state = {"input": os.path.abspath(args.input), "lines": 0, "offset": 0, "format": fmt}
+    if args.resume and os.path.exists(checkpoint):
+        with open(checkpoint, encoding="utf-8") as f:
+            saved = json.load(f)
+        if (saved["input"], saved["format"]) != (state["input"], fmt):
+            parser.error(f"{checkpoint} belongs to a run over {saved['input']} as {saved['format']}")
+        state = saved
+        print(f"resuming after line {state['lines']}", file=sys.stderr)
+
+    writer = Writer(args.output, fmt, state["offset"])
+    started = time.monotonic()
+    done = passed = 0
+    pending = collections.deque()
+
+    def finish(future):
+        nonlocal done, passed
+        row = future.result()
+        writer.write(row)
+        done += 1
+        passed += row["passed"]
+        state["lines"] = row["line"]
+        if done % args.checkpoint_every == 0:
+            state["offset"] = writer.sync()
+            save_checkpoint(checkpoint, state)
+            rate = done / (time.monotonic() - started)
+            print(f"{done} graded ({passed} passed), {rate:.1f}/s, through line {row['line']}", file=sys.stderr)
+
+    with ThreadPoolExecutor(args.workers) as pool:
+        for number, record, error in read_records(args.input, state["lines"]):
+            pending.append(pool.submit(grade_record, number, record, error, args.timeout, args.fail_fast))
+            # Results go out in input order; reading waits while the oldest is still running
+            while pending and (pending[0].done() or len(pending) >= window):
+                finish(pending.popleft())
+        while pending:
+            finish(pending.popleft())
+
+    state["offset"] = writer.sync()
+    writer.close()
+    # A finished run leaves no checkpoint, so a later --resume starts over
+    if os.path.exists(checkpoint):
+        os.remove(checkpoint)
+    elapsed = time.monotonic() - started
+    print(f"{done} graded ({passed} passed) in {elapsed:.1f}s -> {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
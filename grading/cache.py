@@ -0,0 +1,270 @@
+"""Grading verdicts shared between identical submissions.
+
+Submissions are keyed by a fingerprint of their syntax tree, so whitespace,
+comments and the names a learner picked for their own variables don't
+matter: ``x = re.findall(p, text)`` and ``prices = re.findall(p, text)  # ok``
+share one verdict. Names the program's behaviour can depend on are kept as
+written: builtins, the kernel's preloaded libraries, imports, the variables
+the challenge's setup defines and the ones its task asks for by name. So are
+names that can be reached other than as a variable: keyword arguments
+(``f(s=text)`` needs ``f``'s parameter to stay ``s``), attributes, words in
+string literals (``getattr(obj, "rate")``, ``**{"s": 1}``) and every name
+used in a class body, whose assignments become attributes. Code that can
+see its own variable names (``globals()``, ``eval`` and the like) is
+fingerprinted without renaming.
+
+Verdicts live in a SQLite table shared by every server process and the bulk
+grader, evicted least recently used beyond ``GRADER_CACHE_SIZE`` entries.
+Each key includes a version of the challenge (its setup, test cases, checks
+and fixture files), so changing a test retires the old verdicts. Only
+"passed" and "failed" verdicts are stored: errors quote the learner's own
+names, and timeouts and resource stops depend on load.
+
+    GRADER_CACHE_DB      SQLite file (default grader_cache.db next to app.py; empty disables)
+    GRADER_CACHE_SIZE    entries kept (default 100000)
+"""
+import ast
+import builtins
+import hashlib
+import inspect
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from functools import lru_cache
+
+from editor.executor import PRELOADED_NAMES
+from grading.challenges import CHALLENGES, fixture_path
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+CACHE_DB = os.environ.get("GRADER_CACHE_DB", os.path.join(ROOT, "grader_cache.db"))
+CACHE_SIZE = int(os.environ.get("GRADER_CACHE_SIZE", 100_000))
+# A hit only refreshes the entry's last use after this many seconds, to spare writes
+_TOUCH_INTERVAL = 60.0
+# Eviction runs every so many stores rather than on each one
+_EVICT_EVERY = 100
+CACHEABLE = ("passed", "failed")
+
+_INTROSPECTION = frozenset({"eval", "exec", "compile", "globals", "locals", "vars", "dir", "__import__"})
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS verdicts (
+    key TEXT PRIMARY KEY,
+    challenge TEXT NOT NULL,
+    version TEXT NOT NULL,
+    verdict TEXT NOT NULL,
+    used REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS verdicts_used ON verdicts (used);
+"""
+
+
+class _Renamer(ast.NodeTransformer):
+    """Renames every name not in ``keep`` to ``_v<n>``, in order of first appearance.
+
+    Names starting with an underscore get a ``__v<n>`` series of their own:
+    the grader ignores such variables, so ``_tax`` and ``tax`` can't share a
+    verdict.
+    """
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.names = {}
+        self._next = {"_v": 0, "__v": 0}
+
+    def canon(self, name):
+        if name in self.keep:
+            return name
+        if name not in self.names:
+            prefix = "__v" if name.startswith("_") else "_v"
+            # Skipping numbers a kept name already uses, or two names would merge
+            while f"{prefix}{self._next[prefix]}" in self.keep:
+                self._next[prefix] += 1
+            self.names[name] = f"{prefix}{self._next[prefix]}"
+            self._next[prefix] += 1
+        return self.names[name]
+
+    def visit_Name(self, node):
+        node.id = self.canon(node.id)
+        return node
+
+    def visit_arg(self, node):
+        node.arg = self.canon(node.arg)
+        return self.generic_visit(node)
+
+    def _rename_def(self, node):
+        node.name = self.canon(node.name)
+        return self.generic_visit(node)
+
+    visit_FunctionDef = visit_AsyncFunctionDef = visit_ClassDef = _rename_def
+
+    def visit_ExceptHandler(self, node):
+        if node.name:
+            node.name = self.canon(node.name)
+        return self.generic_visit(node)
+
+    def _rename_scope(self, node):
+        node.names = [self.canon(name) for name in node.names]
+        return node
+
+    visit_Global = visit_Nonlocal = _rename_scope
+
+
+_IDENTIFIER = re.compile(r"[A-Za-z_]\w*")
+
+
+def _reachable_names(tree):
+    """Names the program can reach other than as variables, which renaming must leave alone."""
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.keyword) and node.arg:
+            names.add(node.arg)
+        elif isinstance(node, ast.Attribute):
+            names.add(node.attr)
+        elif isinstance(node, ast.Constant) and isinstance(node.value, str):
+            names.update(_IDENTIFIER.findall(node.value))
+        elif isinstance(node, ast.ClassDef):
+            for child in node.body:
+                names.update(_all_names(child))
+        elif type(node).__name__ in ("MatchAs", "MatchStar", "MatchMapping", "MatchClass"):
+            # Pattern captures aren't renamed, nor the attributes a class pattern matches
+            names.update(filter(None, [getattr(node, "name", None), getattr(node, "rest", None)]))
+            names.update(getattr(node, "kwd_attrs", ()))
+    return names
+
+
+def _all_names(tree):
+    names = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Name):
+            names.add(node.id)
+        elif isinstance(node, ast.arg):
+            names.add(node.arg)
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            names.add(node.name)
+        elif isinstance(node, ast.ExceptHandler) and node.name:
+            names.add(node.name)
+        elif isinstance(node, (ast.Global, ast.Nonlocal)):
+            names.update(node.names)
+    return names
+
+
+def _bound_names(tree):
+    return {node.id for node in ast.walk(tree) if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store)}
+
+
+@lru_cache(maxsize=None)
+def _challenge_names(challenge_id):
+    challenge = CHALLENGES[challenge_id]
+    names = set(challenge.names) | _bound_names(ast.parse(challenge.setup))
+    for test in challenge.tests:
+        names |= _bound_names(ast.parse(test.setup))
+    return frozenset(names)
+
+
+def fingerprint(code, keep=frozenset()):
+    """Hash of ``code``'s syntax tree with names outside ``keep`` (and the defaults above) renamed.
+
+    Raises SyntaxError for code that doesn't parse.
+    """
+    tree = ast.parse(code)
+    names = {node.id for node in ast.walk(tree) if isinstance(node, ast.Name)}
+    if not names & _INTROSPECTION:
+        imported = {(alias.asname or alias.name).split(".")[0]
+                    for node in ast.walk(tree) if isinstance(node, (ast.Import, ast.ImportFrom))
+                    for alias in node.names}
+        keep = set(keep) | imported | _reachable_names(tree) | PRELOADED_NAMES | set(dir(builtins))
+        tree = _Renamer(keep).visit(tree)
+    return hashlib.sha256(ast.dump(tree).encode("utf-8")).hexdigest()
+
+
+@lru_cache(maxsize=None)
+def challenge_version(challenge_id):
+    """Hash of everything a challenge's verdicts depend on besides the submission."""
+    challenge = CHALLENGES[challenge_id]
+    digest = hashlib.sha256()
+    digest.update(repr((challenge.setup, challenge.names, challenge.tests)).encode("utf-8"))
+    for check in challenge.checks:
+        digest.update(inspect.getsource(check).encode("utf-8"))
+    for name in challenge.fixtures:
+        with open(fixture_path(name), "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:16]
+
+
+class VerdictCache:
+    """Verdicts by (challenge, version, mode, fingerprint) in a shared SQLite table."""
+
+    def __init__(self, path=CACHE_DB, size=CACHE_SIZE):
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._size = size
+        self._lock = threading.Lock()
+        self._stores = 0
+        self._retired = set()
+
+    def key(self, challenge_id, code, fail_fast):
+        """The cache key for a submission, or None if it doesn't parse."""
+        try:
+            fp = fingerprint(code, _challenge_names(challenge_id))
+        except (SyntaxError, ValueError):
+            return None
+        return f"{challenge_id}:{challenge_version(challenge_id)}:{'ff' if fail_fast else 'all'}:{fp}"
+
+    def _retire(self, challenge_id):
+        # Caller holds the lock; verdicts from older versions of the challenge can never hit again
+        if challenge_id not in self._retired:
+            self._retired.add(challenge_id)
+            with self._conn:
+                self._conn.execute("DELETE FROM verdicts WHERE challenge = ? AND version != ?",
+                                   (challenge_id, challenge_version(challenge_id)))
+
+    def get(self, challenge_id, key):
+        now = time.time()
+        with self._lock:
+            self._retire(challenge_id)
+            row = self._conn.execute("SELECT verdict, used FROM verdicts WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if now - row[1] > _TOUCH_INTERVAL:
+                with self._conn:
+                    self._conn.execute("UPDATE verdicts SET used = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, challenge_id, key, verdict):
+        if verdict["status"] not in CACHEABLE:
+            return
+        with self._lock:
+            self._retire(challenge_id)
+            with self._conn:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO verdicts (key, challenge, version, verdict, used) VALUES (?, ?, ?, ?, ?)",
+                    (key, challenge_id, challenge_version(challenge_id), json.dumps(verdict), time.time()))
+            self._stores += 1
+            if self._stores % _EVICT_EVERY == 0:
+                self._evict()
+
+    def _evict(self):
+        with self._conn:
+            self._conn.execute(
+                "DELETE FROM verdicts WHERE key IN (SELECT key FROM verdicts ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                (self._size,))
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def verdict_cache():
+    """The process-wide cache, opened on first use; None when disabled."""
+    global _cache
+    if not CACHE_DB:
+        return None
+    with _cache_lock:
+        if _cache is None:
+            _cache = VerdictCache()
+        return _cache
@@ -0,0 +1,223 @@
+"""The chapter challenges, their test cases and the checks a submission must pass.
+
+A challenge lists the fixture files copied into the submission's working
+directory, setup code run before the submission (the variables the task
+statement hands the learner), the variables the task asks for by name and
+its checks. Each of its test cases runs the
+submission once more, with the case's own setup and files on top, so hidden
+variants catch solutions that only work on the example; the first case is the
+example from the task statement.
+
+A check is called with a ``Result``, what the submission left behind, and
+the test case's ``expected`` value, and returns None when it passes or a
+short message telling the learner what is missing. Its docstring names it in
+the verdict. Checks look for results by value rather than by variable name
+where the task doesn't name the variable, so any working solution passes.
+
+Checks run in the server, never in the process the submission controlled:
+the worker only reports plain data (numbers, strings, lists, dicts, frames
+as ``Frame``, figures as their titles and line data), and the input files
+come from the challenge's fixtures and test case rather than from the
+submission's working directory.
+"""
+import csv
+import io
+import math
+import os
+import re
+from collections import Counter
+from typing import NamedTuple
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Fixture files live at the repository root, where the lessons refer to them
+FIXTURE_DIR = ROOT
+
+
+class TestCase(NamedTuple):
+    name: str
+    setup: str = ""
+    # file name -> content, written into the working directory over the fixtures
+    files: dict = None
+    expected: object = None
+    # wall-clock seconds for this case; None uses the grader's default
+    timeout: float = None
+
+
+class Challenge(NamedTuple):
+    title: str
+    checks: tuple
+    tests: tuple
+    setup: str = ""
+    fixtures: tuple = ()
+    # variables the checks look up by name (see grading/cache.py)
+    names: tuple = ()
+
+
+CHALLENGES = {}
+
+
+def register(challenge_id, title, checks, tests=(TestCase("example"),), setup="", fixtures=(), names=()):
+    CHALLENGES[challenge_id] = Challenge(title, tuple(checks), tuple(tests), setup, tuple(fixtures), tuple(names))
+
+
+def fixture_path(name):
+    return os.path.join(FIXTURE_DIR, name)
+
+
+def input_text(test, name):
+    """The text of input file ``name`` as the test case hands it to the submission."""
+    if test.files and name in test.files:
+        return test.files[name]
+    with open(fixture_path(name), encoding="utf-8") as f:
+        return f.read()
+
+
+class Frame(NamedTuple):
+    """A DataFrame the submission left behind, by its shape."""
+    columns: list
+    rows: int
+
+
+class Result(NamedTuple):
+    """What a submission left behind, as plain data (see grading.engine.observe)."""
+    # variable name -> value, for the variables the submission or the setup bound
+    variables: dict
+    output: str
+    # {"titles": [...], "lines": [[xs, ys], ...]} per figure the submission drew
+    figures: list
+    # input file name -> text (see input_text)
+    files: dict
+
+
+def _number(value):
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+# --- CH1: parse a customer record ---
+
+def spent_as_float(result, expected):
+    """The SPENT value is converted to a float."""
+    spent, _ = expected
+    if not any(isinstance(v, float) and math.isclose(v, spent) for v in result.variables.values()):
+        return f"No variable holds the SPENT value as a float ({spent:g}). Did you convert it with `float()`?"
+
+
+def tax_computed(result, expected):
+    """The 10% tax is calculated."""
+    spent, tax = expected
+    if not any(_number(v) and math.isclose(v, tax) for v in result.variables.values()):
+        return f"No variable holds the 10% tax on {spent:.2f} ({tax:g})."
+
+
+register("ch1_task", "Chapter 1 Final Task", [spent_as_float, tax_computed], tests=[
+    TestCase("the example record", 'data = "  ID:001 | NAME:ALICE | SPENT:150.50  "', expected=(150.5, 15.05)),
+    TestCase("another customer", 'data = " ID:002 | NAME:BOB | SPENT:20.00 "', expected=(20.0, 2.0)),
+    TestCase("a large purchase", 'data = "ID:317|NAME:CARMEN|SPENT:1234.70   "', expected=(1234.7, 123.47)),
+])
+
+
+# --- CH2: load and summarize retail_sales.csv ---
+
+def sales_df_loaded(result, expected):
+    """``sales_df`` holds retail_sales.csv."""
+    df = result.variables.get("sales_df")
+    if not isinstance(df, Frame):
+        return "There is no DataFrame called `sales_df`."
+    # Data rows, as pandas counts them: no header, no blank lines
+    rows = sum(1 for row in csv.reader(io.StringIO(result.files["retail_sales.csv"])) if row) - 1
+    if df.rows != rows or "amount" not in df.columns:
+        return f"`sales_df` doesn't hold retail_sales.csv (expected {rows} rows with an `amount` column)."
+
+
+def summary_printed(result, expected):
+    """The statistical summary is printed."""
+    if not all(stat in result.output for stat in ("count", "mean", "std", "max")):
+        return "The statistical summary wasn't printed. `describe()` gives count, mean, std, min and max."
+
+
+register("ch2_task", "Chapter 2 Final Task", [sales_df_loaded, summary_printed], fixtures=["retail_sales.csv"],
+         names=["sales_df"], tests=[
+    TestCase("the example file"),
+    TestCase("a longer file", files={"retail_sales.csv": "date,product,amount,city\n" + "".join(
+        f"2023-02-{day:02d},Item {day},{day * 10},{'London' if day % 2 else 'Leeds'}\n" for day in range(1, 21))}),
+])
+
+
+# --- CH3: extract a price with a regex ---
+
+def price_extracted(result, expected):
+    """The price is extracted with its dollar sign."""
+    if [expected] in result.variables.values() or repr([expected]) in result.output:
+        return None
+    return f"Your pattern should find `{[expected]!r}` in `text`, dollar sign included."
+
+
+register("ch3_task", "Chapter 3 Final Task", [price_extracted], tests=[
+    TestCase("the example description", 'text = "The UltraBook 5000 is on sale for $1,299.99 today!"',
+             expected="$1,299.99"),
+    TestCase("a price without cents", 'text = "Cables cost just $5 at checkout."', expected="$5"),
+    TestCase("a five-figure price", 'text = "The 2024 server rack lists at $10,000.00, shipping extra."',
+             expected="$10,000.00"),
+])
+
+
+# --- CH5: line chart with a title ---
+
+def _same(values, expected):
+    return len(values) == len(expected) and all(_number(a) and math.isclose(a, b) for a, b in zip(values, expected))
+
+
+def profit_line_drawn(result, expected):
+    """A line chart of Profit by Year is drawn."""
+    years, profits = expected
+    for fig in result.figures:
+        for x, y in fig["lines"]:
+            if _same(x, years) and _same(y, profits):
+                return None
+    return "No line chart of `Profit` by `Year` was drawn from `df`."
+
+
+def chart_titled(result, expected):
+    """The chart has a title."""
+    if any(any(fig["titles"]) for fig in result.figures):
+        return None
+    return "The chart has no title. Set one with `plt.title(...)`."
+
+
+def _profit_case(name, years, profits):
+    # The checks compare the line with the data itself, not with whatever `df` holds afterwards
+    return TestCase(name, f"df = pd.DataFrame({{'Year': {years!r}, 'Profit': {profits!r}}})",
+                    expected=(years, profits))
+
+
+register("ch5_task", "Chapter 5 Final Task", [profit_line_drawn, chart_titled], tests=[
+    _profit_case("the example data", [2019, 2020, 2021, 2022, 2023], [120, 95, 140, 180, 230]),
+    _profit_case("a longer history", list(range(2010, 2024)), [x * x % 37 for x in range(14)]),
+])
+
+
+# --- CH6: count hashtags in reviews.txt ---
+
+def hashtags_counted(result, expected):
+    """The hashtags in reviews.txt are counted into a dictionary."""
+    counts = Counter(re.findall(r"#\w+", result.files["reviews.txt"]))
+    bare = {tag.lstrip("#"): n for tag, n in counts.items()}
+    for value in result.variables.values():
+        if isinstance(value, dict) and dict(value) in (counts, bare):
+            return None
+    if not counts:
+        return "With no hashtags in reviews.txt, the counts should be an empty dictionary."
+    tag, n = counts.most_common(1)[0]
+    return f"No dictionary holds the hashtag counts from reviews.txt (for example, {tag} appears {n} times)."
+
+
+register("ch6_exam", "CA Mock Exam", [hashtags_counted], fixtures=["reviews.txt"], tests=[
+    TestCase("the example file"),
+    TestCase("repeated tags on one line", files={"reviews.txt": (
+        "R101 | 5 | #fast #fast delivery, #fast refund #happy\n"
+        "R102 | 2 | Box crushed #packaging @courier\n"
+        "R103 | 4 | #happy customer, #value for money\n")}),
+    TestCase("no hashtags at all", files={"reviews.txt": (
+        "R201 | 3 | Fine, nothing special. @support\n"
+        "R202 | NA | No comment\n")}),
+])
@@ -0,0 +1,410 @@
+"""Runs a challenge submission in isolated workers and grades what it leaves behind.
+
+Every test case of a submission gets a process of its own, forked from the
+editor's warm template (editor/template.py) so pandas and matplotlib are
+already loaded, with a fresh namespace and a temporary working directory
+holding the challenge's fixture files. The worker caps its own CPU time,
+address space and file writes before running anything, so a runaway
+submission only kills itself.
+
+The worker never judges its own submission, which could have rewritten
+the checks or the builtins they use: it reports back plain data (the
+variables the run left, its output and its figures' titles and lines, see
+``observe``) as JSON, and the server runs the challenge's checks on that.
+
+A submission's test cases run side by side, up to ``GRADER_WORKERS``
+processes per server (shared by every learner). The server waits on all
+their pipes at once and kills any worker whose case runs past its
+wall-clock limit. In fail-fast mode the first failing case stops the rest,
+which are reported as skipped; otherwise every case runs and the verdict
+carries partial credit.
+
+    GRADER_CPU_SECONDS   CPU time per test case (default 5)
+    GRADER_MEMORY_MB     memory per test case beyond the preloaded libraries (default 512)
+    GRADER_TIMEOUT       wall-clock seconds before a test case's worker is killed (default 10)
+    GRADER_WORKERS       grading processes running at once (default: CPU count)
+
+With ``EDITOR_KERNEL=local`` (hosts without subprocesses) test cases run one
+after another on a thread in the server instead, without the limits or the
+isolation.
+"""
+import contextlib
+import ctypes
+import json
+import numbers
+import os
+import shutil
+import signal
+import sys
+import tempfile
+import threading
+import time
+import traceback
+import types
+from multiprocessing.connection import wait
+
+try:
+    import resource
+except ImportError:  # not on Windows; workers run without rlimits there
+    resource = None
+
+from editor.capture import capture
+from editor.executor import PRELOADED_NAMES, compile_cell, fresh_namespace, open_figures
+from editor.kernel import KERNEL_MODE, mp_context, start_process
+from grading.cache import verdict_cache
+from grading.challenges import CHALLENGES, Frame, Result, fixture_path, input_text
+from grading.sql import SQL_CHALLENGES, grade_sql
+from grading.verdict import combine, make_verdict
+
+CPU_SECONDS = int(os.environ.get("GRADER_CPU_SECONDS", 5))
+MEMORY_LIMIT = int(os.environ.get("GRADER_MEMORY_MB", 512)) * 1024 * 1024
+TIMEOUT = float(os.environ.get("GRADER_TIMEOUT", 10))
+WORKERS = int(os.environ.get("GRADER_WORKERS", os.cpu_count() or 1))
+# Largest file a submission may write
+FILE_LIMIT = 16 * 1024 * 1024
+# How long a timed-out local case gets to unwind
+_INTERRUPT_GRACE = 2.0
+# Lists, dicts and plotted lines longer than this are left out of a report
+MAX_ITEMS = 10_000
+_MAX_DEPTH = 8
+# Largest report a worker may send back, in bytes
+MAX_REPORT = 16 * 1024 * 1024
+_SKIP = object()
+
+_slots = threading.BoundedSemaphore(WORKERS)
+# The working directory is per process; in local mode cases take turns changing it
+_local_lock = threading.Lock()
+
+
+def _address_space():
+    # Current virtual size; the memory cap is set on top of it, since the
+    # preloaded libraries already map far more than a submission should use
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[0]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _limit_resources():
+    if resource is None:
+        return
+    resource.setrlimit(resource.RLIMIT_CPU, (CPU_SECONDS, CPU_SECONDS + 1))
+    resource.setrlimit(resource.RLIMIT_FSIZE, (FILE_LIMIT, FILE_LIMIT))
+    size = _address_space()
+    if size is not None:
+        resource.setrlimit(resource.RLIMIT_AS, (size + MEMORY_LIMIT, size + MEMORY_LIMIT))
+
+
+@contextlib.contextmanager
+def _working_dir(challenge, test):
+    with tempfile.TemporaryDirectory(prefix="grade-") as workdir:
+        for name in challenge.fixtures:
+            shutil.copy(fixture_path(name), workdir)
+        for name, content in (test.files or {}).items():
+            with open(os.path.join(workdir, name), "w", encoding="utf-8") as f:
+                f.write(content)
+        previous = os.getcwd()
+        os.chdir(workdir)
+        try:
+            yield
+        finally:
+            os.chdir(previous)
+
+
+def _error_message(exc):
+    if isinstance(exc, MemoryError):
+        return f"Your code ran out of memory (limit {MEMORY_LIMIT // 2**20} MB)."
+    if isinstance(exc, SyntaxError):
+        return f"SyntaxError on line {exc.lineno}: {exc.msg}"
+    return f"Your code raised {type(exc).__name__}: {exc}"
+
+
+def plain(value, depth=0):
+    """``value`` as JSON-ready data for the checks, or _SKIP for anything they don't read."""
+    if value is None or isinstance(value, (bool, str)):
+        return value
+    if isinstance(value, numbers.Integral):
+        return int(value)
+    if isinstance(value, numbers.Real):
+        return float(value)
+    if depth >= _MAX_DEPTH:
+        return _SKIP
+    if isinstance(value, (list, tuple)):
+        if len(value) > MAX_ITEMS:
+            return _SKIP
+        items = [plain(item, depth + 1) for item in value]
+        return _SKIP if any(item is _SKIP for item in items) else items
+    if isinstance(value, dict):
+        if len(value) > MAX_ITEMS or not all(isinstance(key, str) for key in value):
+            return _SKIP
+        items = {key: plain(item, depth + 1) for key, item in value.items()}
+        return _SKIP if any(item is _SKIP for item in items.values()) else items
+    pd = sys.modules.get("pandas")
+    if pd is not None and isinstance(value, pd.DataFrame):
+        return {"__frame__": [[str(column) for column in value.columns], len(value)]}
+    return _SKIP
+
+
+def _figure(fig):
+    titles = [fig._suptitle.get_text()] if fig._suptitle is not None else []
+    titles += [ax.get_title() for ax in fig.axes]
+    lines = []
+    for ax in fig.axes:
+        for line in ax.get_lines():
+            x, y = plain(list(line.get_xdata())), plain(list(line.get_ydata()))
+            if x is not _SKIP and y is not _SKIP:
+                lines.append([x, y])
+    return {"titles": titles, "lines": lines}
+
+
+def observe(namespace, output, figures):
+    """What a run left behind, as the plain data its report carries (see grading.challenges.Result).
+
+    ``figures`` are the numbers of the pyplot figures the run opened.
+    """
+    variables = {}
+    for name, value in namespace.items():
+        if (name.startswith("_") or name in PRELOADED_NAMES
+                or isinstance(value, (types.ModuleType, types.FunctionType, type))):
+            continue
+        value = plain(value)
+        if value is not _SKIP:
+            variables[name] = value
+    plt = sys.modules.get("matplotlib.pyplot")
+    figures = [_figure(plt.figure(num)) for num in figures] if plt is not None else []
+    return {"variables": variables, "output": output, "figures": figures}
+
+
+def _close_figures(existing):
+    # Only the run's own: in local mode pyplot is shared with the editor's in-process kernels
+    plt = sys.modules.get("matplotlib.pyplot")
+    if plt is not None:
+        for num in open_figures() - existing:
+            plt.close(num)
+
+
+def run_test(challenge_id, index, code):
+    """Run ``code`` for one test case, in this process and directory, and return its report as JSON."""
+    challenge = CHALLENGES[challenge_id]
+    test = challenge.tests[index]
+    started = time.perf_counter()
+    namespace = fresh_namespace()
+    # Figures open before the run (other sessions', in local mode) are none of its business
+    existing = open_figures()
+    try:
+        exec(challenge.setup, namespace)
+        exec(test.setup, namespace)
+        with capture() as buffer:
+            try:
+                body, expr = compile_cell(code)
+                exec(body, namespace)
+                res = eval(expr, namespace) if expr is not None else None
+                if res is not None:
+                    buffer.write(repr(res))
+            except (Exception, SystemExit) as e:
+                buffer.write(traceback.format_exc())
+                report = {"error": _error_message(e), "output": buffer.getvalue()}
+            else:
+                report = observe(namespace, buffer.getvalue(), sorted(open_figures() - existing))
+    finally:
+        _close_figures(existing)
+    report["time"] = time.perf_counter() - started
+    return json.dumps(report)
+
+
+def _load_report(data):
+    def frame(obj):
+        return Frame(*obj["__frame__"]) if obj.keys() == {"__frame__"} else obj
+    report = json.loads(data, object_hook=frame)
+    if not isinstance(report, dict):
+        raise ValueError("not a report")
+    return report
+
+
+def judge(challenge_id, index, data):
+    """The test case's verdict from a worker's JSON report, with the challenge's checks run here."""
+    challenge = CHALLENGES[challenge_id]
+    test = challenge.tests[index]
+    try:
+        report = _load_report(data)
+        output, elapsed = str(report.get("output", "")), float(report.get("time", 0.0))
+        if "error" in report:
+            return make_verdict("error", str(report["error"]), output, elapsed=elapsed)
+        files = {name: input_text(test, name) for name in (*challenge.fixtures, *(test.files or ()))}
+        result = Result(dict(report["variables"]), output, list(report["figures"]), files)
+    except (ValueError, TypeError, KeyError, AttributeError):
+        return make_verdict("error", "The grader couldn't read what your code left behind.")
+    checks = []
+    for check in challenge.checks:
+        try:
+            message = check(result, test.expected)
+        except Exception as e:
+            message = f"Checking your result failed: {type(e).__name__}: {e}"
+        checks.append((check.__doc__, message))
+    failed = [message for _, message in checks if message]
+    status = "failed" if failed else "passed"
+    return make_verdict(status, failed[0] if failed else "All checks passed.", output, checks, elapsed)
+
+
+def _grade_main(conn, challenge_id, index, code):
+    _limit_resources()
+    challenge = CHALLENGES[challenge_id]
+    with _working_dir(challenge, challenge.tests[index]):
+        report = run_test(challenge_id, index, code)
+    conn.send_bytes(report.encode("utf-8"))
+    conn.close()
+
+
+def _timed_out(timeout, elapsed):
+    return make_verdict("timeout", f"Stopped after the {timeout:g}s time limit. Is there an endless loop?",
+                        elapsed=elapsed)
+
+
+def _killed(exitcode, elapsed):
+    if exitcode == -signal.SIGXCPU:
+        return make_verdict("limit", f"Your code used more than {CPU_SECONDS}s of CPU time. Is there an endless loop?",
+                            elapsed=elapsed)
+    if exitcode == -signal.SIGXFSZ:
+        return make_verdict("limit", f"Your code wrote a file larger than {FILE_LIMIT // 2**20} MB.", elapsed=elapsed)
+    return make_verdict("limit", "The grader stopped unexpectedly while running your code (out of memory?).",
+                        elapsed=elapsed)
+
+
+class _Run:
+    """One test case's worker process."""
+
+    def __init__(self, ctx, challenge_id, index, code, timeout):
+        self.challenge_id = challenge_id
+        self.index = index
+        self.timeout = timeout
+        self.conn, sender = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(target=_grade_main, args=(sender, challenge_id, index, code), daemon=True)
+        self.started = time.monotonic()
+        try:
+            start_process(self.process)
+        except BaseException:
+            self.conn.close()
+            raise
+        finally:
+            sender.close()
+
+    def deadline(self):
+        return self.started + self.timeout if self.timeout else float("inf")
+
+    def result(self):
+        elapsed = time.monotonic() - self.started
+        try:
+            data = self.conn.recv_bytes(MAX_REPORT)
+        except EOFError:
+            self.process.join()
+            return _killed(self.process.exitcode, elapsed)
+        except OSError:
+            return make_verdict("limit", "Your code left more data behind than the grader reads.", elapsed=elapsed)
+        return judge(self.challenge_id, self.index, data)
+
+    def stop(self):
+        if self.process.is_alive():
+            self.process.kill()
+        self.process.join()
+        self.conn.close()
+        _slots.release()
+
+
+def _run_workers(challenge_id, code, tests, timeout, fail_fast):
+    ctx = mp_context()
+    results = [None] * len(tests)
+    waiting = list(range(len(tests)))
+    running = {}
+    try:
+        while waiting or running:
+            # Take free slots without blocking while holding some, so two
+            # submissions can't each wait on the other's slots
+            while waiting and _slots.acquire(blocking=not running):
+                index = waiting.pop(0)
+                try:
+                    run = _Run(ctx, challenge_id, index, code, tests[index].timeout or timeout)
+                except BaseException:
+                    # Only a started run gives its slot back (in stop())
+                    _slots.release()
+                    raise
+                running[run.conn] = run
+            now = time.monotonic()
+            until = min(run.deadline() for run in running.values()) - now
+            ready = wait(list(running), timeout=None if until == float("inf") else max(0.0, until))
+            now = time.monotonic()
+            for conn in list(running):
+                run = running[conn]
+                if conn in ready:
+                    results[run.index] = run.result()
+                elif now >= run.deadline():
+                    results[run.index] = _timed_out(run.timeout, now - run.started)
+                else:
+                    continue
+                del running[conn]
+                run.stop()
+                if fail_fast and not results[run.index]["passed"]:
+                    return results
+    finally:
+        for run in running.values():
+            run.stop()
+    return results
+
+
+def _run_local(challenge_id, code, tests, timeout, fail_fast):
+    challenge = CHALLENGES[challenge_id]
+    results = [None] * len(tests)
+
+    def target(index, box):
+        try:
+            with _local_lock, _working_dir(challenge, tests[index]):
+                box["report"] = run_test(challenge_id, index, code)
+        except KeyboardInterrupt:
+            pass
+
+    for index, test in enumerate(tests):
+        box = {}
+        started = time.monotonic()
+        thread = threading.Thread(target=target, args=(index, box), daemon=True)
+        thread.start()
+        thread.join(test.timeout or timeout or None)
+        if thread.is_alive():
+            # Raised at the thread's next bytecode boundary, so it lets go of the working directory
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(thread.ident), ctypes.py_object(KeyboardInterrupt))
+            thread.join(_INTERRUPT_GRACE)
+        report = box.get("report")
+        results[index] = (judge(challenge_id, index, report) if report is not None
+                          else _timed_out(test.timeout or timeout, time.monotonic() - started))
+        if fail_fast and not results[index]["passed"]:
+            break
+    return results
+
+
+def grade(challenge_id, code, timeout=TIMEOUT, fail_fast=False, cache=True):
+    """Grade ``code`` against every test case of a registered challenge (see ``combine``).
+
+    A submission equivalent to one graded before gets that verdict back
+    without running, marked ``cached`` (see grading/cache.py). SQL
+    challenges are graded by grading/sql.py, in this process.
+    """
+    if challenge_id in SQL_CHALLENGES:
+        return grade_sql(challenge_id, code, fail_fast)
+    if challenge_id not in CHALLENGES:
+        raise KeyError(f"unknown challenge {challenge_id!r}")
+    started = time.perf_counter()
+    store = verdict_cache() if cache else None
+    key = store.key(challenge_id, code, fail_fast) if store is not None else None
+    if key is not None:
+        verdict = store.get(challenge_id, key)
+        if verdict is not None:
+            return dict(verdict, cached=True, time=time.perf_counter() - started)
+    verdict = _grade(challenge_id, code, timeout, fail_fast, started)
+    if key is not None:
+        store.put(challenge_id, key, verdict)
+    return verdict
+
+
+def _grade(challenge_id, code, timeout, fail_fast, started):
+    tests = CHALLENGES[challenge_id].tests
+    run = _run_local if KERNEL_MODE == "local" else _run_workers
+    return combine(tests, run(challenge_id, code, tests, timeout, fail_fast), started)
@@ -0,0 +1,186 @@
+"""Grades SQL challenges against a fixture database, in the server process.
+
+The retail fixture (``Customers``, ``Orders``, ``Products``) is built once.
+Each test case's variant of it is serialized to bytes once, and every
+submission gets a private in-memory copy deserialized from those bytes, so
+no tables are rebuilt per query and one learner's query can never see
+another's changes. The query runs under an authorizer that only allows
+reading and a step limit enforced by a progress handler, and its rows are
+compared with the reference solution's on the same copy, ignoring row order
+and column names.
+
+    GRADER_SQL_STEPS     SQLite virtual-machine steps per query (default 1000000)
+"""
+import os
+import sqlite3
+import time
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+
+from grading.challenges import TestCase
+from grading.verdict import combine, make_verdict
+
+MAX_STEPS = int(os.environ.get("GRADER_SQL_STEPS", 1_000_000))
+# The step limit is checked once every this many steps
+_STEP_INTERVAL = 1000
+# Rows fetched before a result is judged too large
+MAX_ROWS = 10_000
+# Longest string or blob a query may build
+MAX_LENGTH = 1_000_000
+
+# Reading tables, calling functions and recursive CTEs; everything else is denied
+_ALLOWED = frozenset({sqlite3.SQLITE_SELECT, sqlite3.SQLITE_READ, sqlite3.SQLITE_FUNCTION,
+                      sqlite3.SQLITE_RECURSIVE})
+
+FIXTURE = """
+CREATE TABLE Customers (id INTEGER PRIMARY KEY, name TEXT NOT NULL, city TEXT NOT NULL, country TEXT NOT NULL);
+CREATE TABLE Products (product_id INTEGER PRIMARY KEY, name TEXT NOT NULL, category TEXT NOT NULL,
+                       price REAL NOT NULL);
+CREATE TABLE Orders (id INTEGER PRIMARY KEY, customer_id INTEGER NOT NULL REFERENCES Customers (id),
+                     product_id INTEGER NOT NULL REFERENCES Products (product_id),
+                     quantity INTEGER NOT NULL, order_date TEXT NOT NULL);
+INSERT INTO Customers VALUES
+    (1, 'Alice Smith', 'London', 'UK'), (2, 'Bruno Costa', 'Lisbon', 'Portugal'),
+    (3, 'Chen Wei', 'London', 'UK'), (4, 'Dana Murphy', 'Dublin', 'Ireland'),
+    (5, 'Emeka Obi', 'Manchester', 'UK'), (6, 'Fatima Khan', 'London', 'UK'),
+    (7, 'Gustav Berg', 'Oslo', 'Norway'), (8, 'Hana Sato', 'Paris', 'France'),
+    (9, 'Ivan Petrov', 'London', 'Canada'), (10, 'Julia Rossi', 'Milan', 'Italy');
+INSERT INTO Products VALUES
+    (1, 'Laptop', 'Electronics', 1200.0), (2, 'Mouse', 'Electronics', 25.0),
+    (3, 'Monitor', 'Electronics', 300.0), (4, 'Keyboard', 'Electronics', 75.0),
+    (5, 'Desk Chair', 'Furniture', 180.0), (6, 'Notebook', 'Stationery', 4.5);
+INSERT INTO Orders VALUES
+    (1, 1, 1, 1, '2023-01-01'), (2, 1, 2, 2, '2023-01-02'), (3, 2, 3, 1, '2023-01-03'),
+    (4, 3, 4, 1, '2023-01-04'), (5, 4, 5, 2, '2023-01-05'), (6, 5, 6, 10, '2023-01-06'),
+    (7, 6, 1, 1, '2023-01-07'), (8, 7, 2, 3, '2023-01-08'), (9, 8, 3, 2, '2023-01-09'),
+    (10, 9, 6, 5, '2023-01-10'), (11, 10, 5, 1, '2023-01-11'), (12, 3, 2, 1, '2023-01-12');
+"""
+
+
+class SQLChallenge(NamedTuple):
+    title: str
+    # reference query whose rows a submission must match
+    solution: str
+    # each case's setup is SQL run on the fixture to make its variant
+    tests: tuple
+
+
+SQL_CHALLENGES = {}
+
+
+def register(challenge_id, title, solution, tests=(TestCase("the retail database"),)):
+    SQL_CHALLENGES[challenge_id] = SQLChallenge(title, solution, tuple(tests))
+
+
+register("ch4_task", "Chapter 4 Final Task", "SELECT name FROM Customers WHERE city = 'London'", tests=[
+    TestCase("the retail database"),
+    TestCase("new London customers", """
+        INSERT INTO Customers VALUES (11, 'Kofi Mensah', 'London', 'UK'), (12, 'Lena Vogel', 'Berlin', 'Germany');
+        UPDATE Customers SET city = 'Leeds' WHERE id = 1;
+    """),
+    TestCase("nobody in London", "UPDATE Customers SET city = 'Leeds' WHERE city = 'London';"),
+])
+
+
+def _authorize(action, *args):
+    return sqlite3.SQLITE_OK if action in _ALLOWED else sqlite3.SQLITE_DENY
+
+
+@lru_cache(maxsize=None)
+def _snapshot(challenge_id, index):
+    """The test case's database as bytes, and the reference solution's rows on it."""
+    challenge = SQL_CHALLENGES[challenge_id]
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    conn.executescript(FIXTURE + challenge.tests[index].setup)
+    expected = conn.execute(challenge.solution).fetchall()
+    data = conn.serialize() if hasattr(conn, "serialize") else None
+    if data is None:
+        # Python < 3.11: keep the built connection and copy it with the backup API
+        return conn, expected
+    conn.close()
+    return data, expected
+
+
+def _clone(snapshot):
+    conn = sqlite3.connect(":memory:", check_same_thread=False)
+    if isinstance(snapshot, bytes):
+        conn.deserialize(snapshot)
+    else:
+        snapshot.backup(conn)
+    return conn
+
+
+def _normalize(rows):
+    # Floats are compared to 9 significant digits, so SUM() order doesn't matter
+    return Counter(tuple(float(f"{v:.9g}") if isinstance(v, float) else v for v in row) for row in rows)
+
+
+def run_query(challenge_id, index, query):
+    """Run ``query`` on a fresh copy of the test case's database and compare it with the solution."""
+    started = time.perf_counter()
+    snapshot, expected = _snapshot(challenge_id, index)
+    conn = _clone(snapshot)
+    steps = [0]
+
+    def progress():
+        steps[0] += _STEP_INTERVAL
+        return steps[0] > MAX_STEPS
+
+    conn.set_authorizer(_authorize)
+    conn.set_progress_handler(progress, _STEP_INTERVAL)
+    if hasattr(conn, "setlimit"):
+        conn.setlimit(sqlite3.SQLITE_LIMIT_LENGTH, MAX_LENGTH)
+    try:
+        cursor = conn.execute(query)
+        rows = cursor.fetchmany(MAX_ROWS + 1)
+        columns = len(cursor.description or ())
+    except sqlite3.OperationalError as e:
+        if steps[0] > MAX_STEPS:
+            return make_verdict("limit", f"Your query ran past the {MAX_STEPS:,}-step limit and was stopped.",
+                                elapsed=time.perf_counter() - started)
+        return make_verdict("error", _sql_error(e), elapsed=time.perf_counter() - started)
+    except (sqlite3.Error, sqlite3.Warning, ValueError) as e:
+        return make_verdict("error", _sql_error(e), elapsed=time.perf_counter() - started)
+    finally:
+        conn.close()
+    elapsed = time.perf_counter() - started
+    output = "\n".join(" | ".join(map(str, row)) for row in rows[:20])
+    if len(rows) > MAX_ROWS:
+        return make_verdict("failed", f"Your query returns more than {MAX_ROWS:,} rows.", output, elapsed=elapsed)
+    message = _compare(rows, columns, expected)
+    return make_verdict("failed" if message else "passed", message or "Rows match.", output, elapsed=elapsed)
+
+
+def _sql_error(e):
+    text = str(e)
+    if "not authorized" in text:
+        return "Only queries that read data (SELECT) are graded."
+    if "one statement at a time" in text:
+        return "Submit a single query."
+    return f"Your query failed: {text}"
+
+
+def _compare(rows, columns, expected):
+    width = len(expected[0]) if expected else None
+    if width is not None and columns != width:
+        return f"Your query returns {columns} column{'s' * (columns != 1)}; the task asks for {width}."
+    if len(rows) != len(expected):
+        return f"Your query returns {len(rows)} row{'s' * (len(rows) != 1)}; expected {len(expected)}."
+    missing = _normalize(expected) - _normalize(rows)
+    if missing:
+        row = next(iter(missing))
+        return f"Your query returns the right number of rows, but not the right ones: {row!r} is missing."
+    return None
+
+
+def grade_sql(challenge_id, query, fail_fast=False):
+    """Grade ``query`` against every test case of a SQL challenge (see ``grading.verdict.combine``)."""
+    started = time.perf_counter()
+    tests = SQL_CHALLENGES[challenge_id].tests
+    results = [None] * len(tests)
+    for index in range(len(tests)):
+        results[index] = run_query(challenge_id, index, query)
+        if fail_fast and not results[index]["passed"]:
+            break
+    return combine(tests, results, started)
@@ -0,0 +1,34 @@
+"""The verdicts graders return, per test case and per submission."""
+import time
+
+
+def make_verdict(status, message, output="", checks=(), elapsed=0.0):
+    """One test case's result.
+
+    ``status`` is "passed", "failed" (a check failed), "error" (the code
+    raised), "timeout", "limit" (killed for exceeding CPU, memory or disk)
+    or "skipped" (not run, after a fail-fast failure).
+    """
+    return {"passed": status == "passed", "status": status, "message": message, "output": output,
+            "checks": list(checks), "time": elapsed}
+
+
+def combine(tests, results, started):
+    """A submission's verdict from its test cases' (None for cases not run).
+
+    Carries the first failing case's status and message (cases in their
+    registered order), ``score``, the share of cases passed, and the
+    per-case verdicts under ``tests``, each named by its case. ``output`` is
+    the first case's, which runs the example from the task statement.
+    """
+    results = [dict(result or make_verdict("skipped", "Not run: an earlier test failed."), test=test.name)
+               for test, result in zip(tests, results)]
+    failed = next((result for result in results if not result["passed"] and result["status"] != "skipped"), None)
+    passed = sum(result["passed"] for result in results)
+    if failed is None:
+        status, message = "passed", "All tests passed."
+    else:
+        status, message = failed["status"], f"Test '{failed['test']}': {failed['message']}"
+    return {"passed": failed is None, "status": status, "message": message, "score": passed / len(tests),
+            "tests": results, "output": results[0]["output"], "time": time.perf_counter() - started,
+            "cached": False}
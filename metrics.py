@@ -0,0 +1,136 @@
+"""Timing spans for app reruns, aggregated into histograms.
+
+``span("sidebar")`` times a block and adds the duration to the
+``app_span_seconds`` histogram, labelled by span name (plus any labels given,
+e.g. chapter and step). The histograms are served in Prometheus text format
+on a local port, and each span can also be appended to a JSONL trace file:
+
+    APP_METRICS_PORT   port for http://127.0.0.1:<port>/metrics (default 9464, 0 disables)
+    APP_TRACE_FILE     JSONL file to append one record per span to (unset: no trace)
+"""
+import bisect
+import contextlib
+import functools
+import json
+import os
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+METRICS_PORT = int(os.environ.get("APP_METRICS_PORT", 9464))
+TRACE_FILE = os.environ.get("APP_TRACE_FILE")
+# Upper bounds in seconds; one more bucket (+Inf) catches everything slower
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram:
+    """Cumulative-bucket histogram per label set, safe to update from any thread."""
+
+    def __init__(self, name, help_text, buckets=BUCKETS):
+        self.name = name
+        self.help = help_text
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        # labels (sorted tuple of pairs) -> [per-bucket counts..., +Inf count, sum]
+        self._series = {}
+
+    def observe(self, value, labels):
+        key = tuple(sorted(labels.items()))
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[bisect.bisect_left(self.buckets, value)] += 1
+            series[-1] += value
+
+    def expose(self):
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = {key: list(series) for key, series in self._series.items()}
+        for key, series in sorted(snapshot.items()):
+            labels = ",".join(f'{k}="{_escape(v)}"' for k, v in key)
+            sep = "," if labels else ""
+            count = 0
+            for bound, n in zip(self.buckets + (float("inf"),), series):
+                count += n
+                le = "+Inf" if bound == float("inf") else f"{bound:g}"
+                lines.append(f'{self.name}_bucket{{{labels}{sep}le="{le}"}} {count}')
+            braced = f"{{{labels}}}" if labels else ""
+            lines.append(f"{self.name}_sum{braced} {series[-1]:.6f}")
+            lines.append(f"{self.name}_count{braced} {count}")
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+SPANS = Histogram("app_span_seconds", "Wall time of each instrumented part of a rerun.")
+
+_trace_lock = threading.Lock()
+_trace_file = None
+
+
+def _trace(name, started, duration, labels):
+    global _trace_file
+    record = json.dumps({"ts": round(started, 6), "span": name, "ms": round(duration * 1000, 3),
+                         "pid": os.getpid(), **labels}, ensure_ascii=False)
+    with _trace_lock:
+        if _trace_file is None:
+            _trace_file = open(TRACE_FILE, "a", encoding="utf-8", buffering=1)
+        _trace_file.write(record + "\n")
+
+
+@contextlib.contextmanager
+def span(name, **labels):
+    """Time the enclosed block, even when it exits by exception (st.rerun() included)."""
+    started = time.time()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration = time.perf_counter() - t0
+        labels = {k: str(v) for k, v in labels.items()}
+        SPANS.observe(duration, {"span": name, **labels})
+        if TRACE_FILE:
+            _trace(name, started, duration, labels)
+
+
+def timed(name, **labels):
+    """Decorator form of ``span``; keeps the wrapped function's name (st.fragment keys on it)."""
+    def decorate(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            with span(name, **labels):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorate
+
+
+class _Handler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.split("?")[0] != "/metrics":
+            self.send_error(404)
+            return
+        body = SPANS.expose().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def serve(port=METRICS_PORT):
+    """Start the /metrics endpoint on a daemon thread; returns None if disabled or the port is taken."""
+    if not port:
+        return None
+    try:
+        server = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+    except OSError:
+        return None
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,221 @@
+"""Learner progress, kept in SQLite and cached in memory.
+
+Each learner is identified by an id carried in the page URL (``?learner=``),
+so a refresh or a server restart picks their progress back up. Progress is a
+bitset: exercise ``n`` (ids are assigned in chapters/__init__.py) is bit
+``n``, stored as a little-endian byte string, a few bytes per learner.
+Completion counts are popcounts of the bitset masked by a chapter's bits.
+
+Reads go through an in-process cache of every loaded learner's bitset,
+filled from the database on first use; checking progress during a rerun is
+a bit test. Writes update the cache at once and are queued for a background
+thread, which commits them in batches, so a rerun never waits on the disk.
+The database runs in WAL mode and the writer ORs new bits into the stored
+ones, so several server processes can share one file.
+
+    APP_PROGRESS_DB    SQLite file (default progress.db next to app.py)
+
+    python progress.py      # completion per chapter across all learners
+"""
+import atexit
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import chapters
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+DB_PATH = os.environ.get("APP_PROGRESS_DB", os.path.join(ROOT, "progress.db"))
+# Learners whose progress is kept in memory; the least recently used are
+# dropped beyond this and re-read on their next visit.
+CACHE_SIZE = 10_000
+# Seconds the writer waits to gather a batch, and the most learners per commit.
+FLUSH_INTERVAL = 0.5
+BATCH_SIZE = 500
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS learner_progress (
+    learner TEXT PRIMARY KEY,
+    bits BLOB NOT NULL,
+    updated_at REAL NOT NULL
+) WITHOUT ROWID
+"""
+
+
+def to_bytes(bits):
+    return bits.to_bytes((bits.bit_length() + 7) // 8, "little")
+
+
+def from_bytes(data):
+    return int.from_bytes(data, "little")
+
+
+def _connect(path):
+    conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+    conn.execute("PRAGMA journal_mode=WAL")
+    # With WAL this still never corrupts the file; a crash loses at most the last commits
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute(_SCHEMA)
+    conn.commit()
+    return conn
+
+
+def _merge(conn, learner, bits, now):
+    row = conn.execute("SELECT bits FROM learner_progress WHERE learner = ?", (learner,)).fetchone()
+    if row is not None:
+        bits |= from_bytes(row[0])
+    conn.execute("INSERT OR REPLACE INTO learner_progress (learner, bits, updated_at) VALUES (?, ?, ?)",
+                 (learner, to_bytes(bits), now))
+
+
+def _migrate(conn, exercise_ids):
+    # Earlier databases kept one (learner, exercise key) row per completion
+    with conn:
+        conn.execute("BEGIN IMMEDIATE")
+        if not conn.execute("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'progress'").fetchone():
+            return
+        learners = {}
+        for learner, key in conn.execute("SELECT learner, exercise FROM progress"):
+            if key in exercise_ids:
+                learners[learner] = learners.get(learner, 0) | 1 << exercise_ids[key]
+        now = time.time()
+        for learner, bits in learners.items():
+            _merge(conn, learner, bits, now)
+        conn.execute("DROP TABLE progress")
+
+
+class ProgressStore:
+    """Completed-exercise bitsets per learner, read through a cache and written behind."""
+
+    def __init__(self, path=DB_PATH, cache_size=CACHE_SIZE, exercise_ids=None):
+        self._reader = _connect(path)
+        self._writer = _connect(path)
+        if exercise_ids:
+            _migrate(self._writer, exercise_ids)
+        self._cache_size = cache_size
+        self._lock = threading.Lock()
+        # learner -> bitset, least recently used first
+        self._cache = OrderedDict()
+        # learner -> bits set but not yet committed (so a reload doesn't miss them)
+        self._pending = {}
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._write_behind, name="progress-writer", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def _bits(self, learner):
+        # Caller holds the lock
+        bits = self._cache.get(learner)
+        if bits is None:
+            row = self._reader.execute("SELECT bits FROM learner_progress WHERE learner = ?", (learner,)).fetchone()
+            bits = (from_bytes(row[0]) if row else 0) | self._pending.get(learner, 0)
+            self._cache[learner] = bits
+            if len(self._cache) > self._cache_size:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(learner)
+        return bits
+
+    def completed(self, learner):
+        """The learner's bitset of completed exercises."""
+        with self._lock:
+            return self._bits(learner)
+
+    def is_completed(self, learner, exercise_id):
+        with self._lock:
+            return bool(self._bits(learner) >> exercise_id & 1)
+
+    def mark(self, learner, exercise_id):
+        bit = 1 << exercise_id
+        with self._lock:
+            bits = self._bits(learner)
+            if bits & bit:
+                return
+            self._cache[learner] = bits | bit
+            self._pending[learner] = self._pending.get(learner, 0) | bit
+        self._queue.put(learner)
+
+    def _write_behind(self):
+        while True:
+            learner = self._queue.get()
+            if learner is None:
+                return
+            batch = {learner}
+            deadline = time.monotonic() + FLUSH_INTERVAL
+            stop = False
+            while len(batch) < BATCH_SIZE:
+                try:
+                    learner = self._queue.get(timeout=max(0.0, deadline - time.monotonic()))
+                except queue.Empty:
+                    break
+                if learner is None:
+                    stop = True
+                    break
+                batch.add(learner)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch):
+        with self._lock:
+            bits = {learner: self._pending[learner] for learner in batch if learner in self._pending}
+        now = time.time()
+        with self._writer:
+            # IMMEDIATE takes the write lock up front, so another process can't
+            # write the same learner between our read and our write
+            self._writer.execute("BEGIN IMMEDIATE")
+            for learner, learner_bits in bits.items():
+                _merge(self._writer, learner, learner_bits, now)
+        with self._lock:
+            for learner, committed in bits.items():
+                left = self._pending.get(learner, 0) & ~committed
+                if left:
+                    self._pending[learner] = left
+                else:
+                    self._pending.pop(learner, None)
+
+    def aggregate(self, masks):
+        """``(learners, {name: total completed})`` over every stored learner, per mask.
+
+        Reads the committed rows, so marks still queued in this process aren't counted.
+        """
+        totals = dict.fromkeys(masks, 0)
+        learners = 0
+        for data, in self._reader.execute("SELECT bits FROM learner_progress"):
+            bits = from_bytes(data)
+            learners += 1
+            for name, mask in masks.items():
+                totals[name] += (bits & mask).bit_count()
+        return learners, totals
+
+    def close(self):
+        """Commit everything queued and stop the writer; safe to call twice."""
+        if self._thread.is_alive():
+            self._queue.put(None)
+            self._thread.join()
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def store():
+    """The process-wide store, opened on first use."""
+    global _store
+    with _store_lock:
+        if _store is None:
+            _store = ProgressStore(exercise_ids=chapters.EXERCISE_IDS)
+        return _store
+
+
+if __name__ == "__main__":
+    learners, totals = ProgressStore(exercise_ids=chapters.EXERCISE_IDS).aggregate(
+        {title: chapter.mask for title, chapter in chapters.CHAPTERS.items() if chapter.total})
+    print(f"{learners} learners in {DB_PATH}")
+    for title, done in totals.items():
+        total = chapters.CHAPTERS[title].total
+        share = done / (learners * total) if learners else 0.0
+        print(f"  {title:<30}{share:>7.0%}  ({done} of {learners * total} exercises)")
@@ -0,0 +1,11 @@
+// Chapter selectbox: dropdown-only, no typing. Runs in the page itself, so
+// inputs are locked as soon as Streamlit renders (or re-renders) them.
+(function () {
+    function lock() {
+        document.querySelectorAll('div[data-testid="stSelectbox"] input:not([readonly])').forEach(function (input) {
+            input.setAttribute('readonly', 'readonly');
+        });
+    }
+    new MutationObserver(lock).observe(document.body, { childList: true, subtree: true });
+    lock();
+})();
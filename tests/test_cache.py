@@ -0,0 +1,33 @@
+"""Fingerprints must only merge submissions that behave the same (grading/cache.py)."""
+from grading.cache import fingerprint
+
+
+def test_renamed_variables_share_a_fingerprint():
+    assert fingerprint("x = re.findall(p, text)") == fingerprint("prices = re.findall(p, text)  # ok")
+
+
+def test_parameter_passed_by_keyword_keeps_its_name():
+    # The second raises TypeError: f() got an unexpected keyword argument 's'
+    works = "def f(s):\n    return s.upper()\nresult = f(s=text)"
+    fails = "def f(t):\n    return t.upper()\nresult = f(s=text)"
+    assert fingerprint(works) != fingerprint(fails)
+
+
+def test_class_body_names_are_not_renamed():
+    # The second raises AttributeError: type object 'A' has no attribute 'rate'
+    works = "class A:\n    rate = 0.1\ntax = spent * A.rate"
+    fails = "class A:\n    r = 0.1\ntax = spent * A.rate"
+    assert fingerprint(works) != fingerprint(fails)
+
+
+def test_names_in_strings_are_not_renamed():
+    works = "def f(s):\n    return s\nresult = f(**{'s': text})"
+    fails = "def f(t):\n    return t\nresult = f(**{'s': text})"
+    assert fingerprint(works) != fingerprint(fails)
+
+
+def test_underscore_names_stay_apart_from_plain_ones():
+    # The grader ignores variables starting with "_", so the first fails ch1 and the second passes
+    hidden = "_spent = float(data.split('SPENT:')[1])\n_tax = _spent * 0.1"
+    visible = "spent = float(data.split('SPENT:')[1])\ntax = spent * 0.1"
+    assert fingerprint(hidden) != fingerprint(visible)
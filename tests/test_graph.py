@@ -0,0 +1,31 @@
+"""Incremental "Run All" must re-run every cell an edit can change (editor/graph.py)."""
+from editor.graph import plan_run_all, source_hash
+
+
+def ran(code, seq):
+    # A cell as it looks after a successful run in kernel generation 0
+    return {"input": code, "status": "success", "ran_hash": source_hash(code), "kernel_gen": 0, "run_seq": seq}
+
+
+def test_unchanged_notebook_runs_nothing():
+    cells = [ran("k = 1", 1), ran("k + 1", 2)]
+    assert plan_run_all(cells, 0) == []
+
+
+def test_edited_cell_reruns_its_readers():
+    cells = [ran("k = 1", 1), ran("k + 1", 2), ran("x = 2", 3)]
+    cells[0]["input"] = "k = 5"
+    assert plan_run_all(cells, 0) == [0, 1]
+
+
+def test_callers_of_a_function_rerun_when_its_globals_change():
+    cells = [ran("def f():\n    return k", 1), ran("k = 1", 2), ran("f()", 3)]
+    cells[1]["input"] = "k = 5"
+    assert plan_run_all(cells, 0) == [1, 2]
+
+
+def test_reads_are_followed_through_nested_calls():
+    cells = [ran("def g():\n    return k", 1), ran("def f(x):\n    return g() + x", 2),
+             ran("k = 1", 3), ran("f(2)", 4)]
+    cells[2]["input"] = "k = 5"
+    assert plan_run_all(cells, 0) == [2, 3]
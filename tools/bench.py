@@ -0,0 +1,232 @@
+"""Benchmarks for the code-editor path, compared against a stored baseline.
+
+Micro benchmarks run one cell through the steps of ``run_cell`` separately --
+``compile``, ``exec`` (with output captured), ``eval`` of the trailing
+expression and ``capture`` (collecting the output and encoding figures) --
+then ``render``, a rerun of app.py that draws the resulting cell in
+``render_code_editor()``. Macro benchmarks click "Run All" over notebooks of
+1 to 100 cells and time the whole rerun, kernel round trips included.
+
+Each step is timed ``--repeat`` times and its peak Python memory is taken
+from one extra pass under tracemalloc, so tracing doesn't slow the timed
+passes. The baseline comparison uses the median pass. A step only counts as
+slower when its median grew by more than the tolerance and by more than its
+noise: a few times the larger spread (median absolute deviation) of the two
+runs, and never less than MIN_TIME_DELTA_MS.
+
+    python tools/bench.py [--only trivial,print_10mb] [--repeat 15] [--json results.json]
+    python tools/bench.py --update-baseline      # after an intended change
+    python tools/bench.py --tolerance 0.2        # fail on >20% slower / larger (default 50%)
+
+The baseline (tools/bench_baseline.json) is specific to the machine that
+wrote it; regenerate it on the CI host before gating on it, and tighten the
+tolerance there once its noise is known.
+"""
+import argparse
+import contextlib
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import tracemalloc
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import streamlit  # noqa: E402
+from streamlit.logger import set_log_level  # noqa: E402
+from streamlit.testing.v1 import AppTest  # noqa: E402
+
+from editor import executor  # noqa: E402
+from editor.capture import capture  # noqa: E402
+from editor.kernel import KERNEL_MODE  # noqa: E402
+
+BASELINE = os.path.join(ROOT, "tools", "bench_baseline.json")
+# Differences below these are noise, whatever the relative change
+MIN_TIME_DELTA_MS = 2.0
+MIN_MEMORY_DELTA_KB = 256
+# A median moving by fewer spreads than this is noise too
+NOISE_SPREADS = 3
+
+CELLS = {
+    "trivial": "x = 1\nx",
+    "print_10mb": "for i in range(10_240):\n    print('x' * 1023)",
+    "large_frame": ("df = pd.DataFrame(np.random.default_rng(0).normal(size=(500_000, 10)))\n"
+                    "df['key'] = df[0].round(1)\n"
+                    "df.groupby('key').mean()"),
+    "figures": ("for n in range(4):\n"
+                "    fig, ax = plt.subplots()\n"
+                "    ax.plot(np.sin(np.linspace(0, n + 1, 2_000)))\n"
+                "len(plt.get_fignums())"),
+}
+RUN_ALL_SIZES = (1, 10, 100)
+
+
+@contextlib.contextmanager
+def stopwatch(into, traced):
+    gc.collect()
+    if traced:
+        tracemalloc.start()
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        into.append((time.perf_counter() - t0, tracemalloc.get_traced_memory()[1] if traced else None))
+        if traced:
+            tracemalloc.stop()
+
+
+def cell_steps(code, namespace, traced):
+    """One pass of ``run_cell``'s steps; returns per-step samples and the cell result."""
+    samples = {step: [] for step in ("compile", "exec", "eval", "capture")}
+    executor._code_cache.clear()
+    with stopwatch(samples["compile"], traced):
+        body, expr = executor.compile_cell(code)
+    with capture() as buffer:
+        with stopwatch(samples["exec"], traced):
+            exec(body, namespace)
+        with stopwatch(samples["eval"], traced):
+            res = eval(expr, namespace) if expr is not None else None
+            if res is not None:
+                buffer.write(repr(res))
+        with stopwatch(samples["capture"], traced):
+            output = buffer.getvalue()
+            figures = executor.collect_figures()
+    cell = {"id": 0, "input": code, "output": output, "figures": figures, "status": "success", "exec_time": 0.0}
+    return samples, cell
+
+
+def editor_app():
+    at = AppTest.from_file(os.path.join(ROOT, "app.py"), default_timeout=600)
+    at.run()
+    # The first run applies streamlit's logging config; after it, quiet the
+    # "missing ScriptRunContext" warning every between-run session_state write logs
+    set_log_level("error")
+    at.session_state.show_editor = True
+    at.run()
+    return at
+
+
+def rerun(at, samples, traced):
+    with stopwatch(samples, traced):
+        at.run()
+    if at.exception:
+        raise RuntimeError(at.exception[0].message)
+
+
+def bench_cell(name, code, at, repeat):
+    namespace = executor.fresh_namespace()
+    samples = {}
+    for i in range(repeat + 1):
+        step_samples, cell = cell_steps(code, namespace, traced=i == repeat)
+        at.session_state.editor_cells = [cell]
+        step_samples["render"] = []
+        rerun(at, step_samples["render"], traced=i == repeat)
+        for step, values in step_samples.items():
+            samples.setdefault(f"{name}/{step}", []).extend(values)
+    return samples
+
+
+def bench_run_all(size, at, repeat):
+    code = ["v0 = 1"] + [f"v{i} = v{i - 1} + {i}" for i in range(1, size)]
+    code[-1] += f"\nv{size - 1}"
+    samples = []
+    for i in range(repeat + 1):
+        # Fresh cells each pass, so every one of them runs again
+        at.session_state.editor_cells = [{"id": n, "input": src, "output": "", "exec_time": 0.0, "status": None}
+                                         for n, src in enumerate(code)]
+        at.run()
+        at.button(key="global_run_all").click()
+        rerun(at, samples, traced=i == repeat)
+        if any(c["status"] != "success" for c in at.session_state.editor_cells):
+            raise RuntimeError(f"run_all_{size}: a cell didn't succeed")
+    return {f"run_all_{size}/rerun": samples}
+
+
+def summarize(samples):
+    results = {}
+    for key, values in samples.items():
+        times = [t for t, _ in values[:-1]]
+        median = statistics.median(times)
+        peak = values[-1][1]
+        results[key] = {
+            "median_ms": round(median * 1000, 3),
+            "min_ms": round(min(times) * 1000, 3),
+            "spread_ms": round(statistics.median(abs(t - median) for t in times) * 1000, 3),
+            "peak_kb": round(peak / 1024, 1),
+        }
+    return results
+
+
+def compare(results, baseline, tolerance):
+    regressions = []
+    for key, row in results.items():
+        base = baseline.get(key)
+        if base is None:
+            continue
+        noise = NOISE_SPREADS * max(row["spread_ms"], base.get("spread_ms", 0.0))
+        for field, floor in (("median_ms", max(MIN_TIME_DELTA_MS, noise)), ("peak_kb", MIN_MEMORY_DELTA_KB)):
+            if row[field] > base[field] * (1 + tolerance) and row[field] - base[field] > floor:
+                regressions.append(f"{key} {field}: {row[field]:g} vs baseline {base[field]:g}")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--only", help="comma-separated benchmarks to run (e.g. trivial,run_all_10)")
+    parser.add_argument("--repeat", type=int, default=15, help="timed passes per benchmark")
+    parser.add_argument("--baseline", default=BASELINE, help="results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.5,
+                        help="allowed relative slowdown / memory growth over the baseline")
+    parser.add_argument("--update-baseline", action="store_true", help="write the results as the new baseline")
+    parser.add_argument("--json", help="also write the results to this file")
+    args = parser.parse_args()
+
+    names = list(CELLS) + [f"run_all_{n}" for n in RUN_ALL_SIZES]
+    selected = args.only.split(",") if args.only else names
+    unknown = set(selected) - set(names)
+    if unknown:
+        parser.error(f"unknown benchmarks {sorted(unknown)} (choose from {', '.join(names)})")
+
+    at = editor_app()
+    samples = {}
+    for name in selected:
+        if name in CELLS:
+            samples.update(bench_cell(name, CELLS[name], at, args.repeat))
+        else:
+            samples.update(bench_run_all(int(name.rsplit("_", 1)[1]), at, args.repeat))
+    results = summarize(samples)
+
+    report = {
+        "meta": {"python": platform.python_version(), "platform": platform.platform(),
+                 "streamlit": streamlit.__version__, "kernel_mode": KERNEL_MODE, "repeat": args.repeat},
+        "results": results,
+    }
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.update_baseline:
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["results"]
+
+    print(f"  {'benchmark':<26}{'median ms':>11}{'± ms':>8}{'min ms':>10}{'peak KB':>11}{'vs base':>9}")
+    for key, row in results.items():
+        base = baseline.get(key)
+        change = f"{row['median_ms'] / base['median_ms'] - 1:+.0%}" if base and base["median_ms"] else ""
+        print(f"  {key:<26}{row['median_ms']:>11.2f}{row['spread_ms']:>8.2f}{row['min_ms']:>10.2f}"
+              f"{row['peak_kb']:>11.1f}{change:>9}")
+
+    for path in filter(None, (args.json, args.update_baseline and args.baseline)):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+            f.write("\n")
+
+    failures = compare(results, baseline, args.tolerance)
+    for failure in failures:
+        print("REGRESSION:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,76 @@
+"""Check the cold-start import budget of app.py.
+
+Runs ``python -X importtime`` over the modules app.py imports at top level
+(everything except streamlit, which is measured separately as the baseline)
+and fails when they take longer than the budget or pull in one of the heavy
+data libraries, which should only ever load inside editor kernels.
+
+    python tools/import_budget.py [--budget-ms 150]
+"""
+import argparse
+import ast
+import os
+import re
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("pandas", "numpy", "matplotlib", "seaborn", "requests")
+LINE = re.compile(r"import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)")
+
+
+def top_level_imports(path):
+    with open(path, encoding="utf-8") as f:
+        tree = ast.parse(f.read())
+    modules = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            modules += [alias.name for alias in node.names]
+        elif isinstance(node, ast.ImportFrom) and node.level == 0:
+            modules.append(node.module)
+    return [m for m in modules if m.split(".")[0] != "streamlit"]
+
+
+def importtime(statement):
+    """Map module -> (self_us, cumulative_us, depth) for everything ``statement`` imports."""
+    proc = subprocess.run([sys.executable, "-X", "importtime", "-c", statement],
+                          cwd=ROOT, capture_output=True, text=True, check=True)
+    timings = {}
+    for line in proc.stderr.splitlines():
+        m = LINE.match(line)
+        if m:
+            timings[m.group(4)] = (int(m.group(1)), int(m.group(2)), len(m.group(3)) // 2)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--budget-ms", type=float, default=150.0,
+                        help="max time for app.py's own imports on top of streamlit")
+    args = parser.parse_args()
+
+    modules = top_level_imports(os.path.join(ROOT, "app.py"))
+    baseline = importtime("import streamlit")
+    timings = importtime("import streamlit; " + "; ".join(f"import {m}" for m in modules))
+    added = {name: t for name, t in timings.items() if name not in baseline}
+
+    total_ms = sum(self_us for self_us, _, _ in added.values()) / 1000
+    print(f"streamlit baseline: {baseline['streamlit'][1] / 1000:.1f} ms")
+    print(f"app.py imports ({', '.join(modules)}): {total_ms:.1f} ms over {len(added)} modules")
+    for name, (_, cumulative, depth) in sorted(added.items(), key=lambda kv: -kv[1][1])[:10]:
+        if depth == 0:
+            print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    failures = []
+    heavy = sorted(n for n in added if n.split(".")[0] in HEAVY and "." not in n)
+    if heavy:
+        failures.append(f"heavy libraries imported at startup: {', '.join(heavy)}")
+    if total_ms > args.budget_ms:
+        failures.append(f"{total_ms:.1f} ms exceeds the {args.budget_ms:.0f} ms budget")
+    for failure in failures:
+        print("FAIL:", failure)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
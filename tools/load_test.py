@@ -0,0 +1,345 @@
+"""Drive simulated learners through a live app.py server and measure reruns.
+
+Starts ``streamlit run app.py`` headless on a free local port (or targets
+``--url``) and opens one websocket session per simulated learner, speaking
+the same protocol as the browser: every interaction sends the widget change
+and the session waits until the server reports the rerun finished. All
+sessions share the one server process, its kernel pool and its caches, so the
+numbers show how many simultaneous learners a process can carry.
+
+A session repeatedly picks an action -- switch chapter or step, answer the
+quiz on the current page, add a cell, or type a snippet into a cell and run
+it -- waits a random think time, and records how long the action's reruns
+took. Widget clicks inside a fragment rerun only that fragment, as they do in
+the browser. Nothing needs a network beyond localhost, or a browser.
+
+    python tools/load_test.py [--sessions 8] [--duration 60] [--think-ms 500]
+                              [--mix navigate=4,quiz=3,add_cell=1,run_code=2]
+                              [--url ws://host:port] [--max-p95-ms 0] [--json report.json]
+
+Prints throughput and p50/p95/p99 per action; exits non-zero when
+``--max-p95-ms`` is exceeded or a session hit an exception.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.request
+from collections import defaultdict
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from streamlit.proto.BackMsg_pb2 import BackMsg  # noqa: E402
+from streamlit.proto.ForwardMsg_pb2 import ForwardMsg  # noqa: E402
+from streamlit.proto.WidgetStates_pb2 import WidgetState  # noqa: E402
+from streamlit.testing.v1.element_tree import parse_tree_from_messages  # noqa: E402
+from websockets.asyncio.client import connect  # noqa: E402
+
+import chapters  # noqa: E402
+from chapters import content  # noqa: E402
+
+SNIPPETS = (
+    "total = sum(range(100_000))\ntotal",
+    "words = 'the quick brown fox jumps over the lazy dog'.split()\nsorted(words, key=len)",
+    "import re\nre.findall(r'#\\w+', 'loving #python and #pandas today')",
+    "df = pd.DataFrame({'region': list('NSEW') * 25, 'sales': range(100)})\ndf.groupby('region').sales.sum()",
+    "arr = np.random.default_rng(0).normal(size=10_000)\narr.mean(), arr.std()",
+)
+MAX_CELLS = 8
+
+
+def percentile(sorted_values, pct):
+    if not sorted_values:
+        return 0.0
+    rank = max(0, min(len(sorted_values) - 1, round(pct / 100 * len(sorted_values)) - 1))
+    return sorted_values[rank]
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        if name not in ACTIONS:
+            raise argparse.ArgumentTypeError(f"unknown action {name!r} (choose from {', '.join(ACTIONS)})")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+class Client:
+    """One browser tab's worth of protocol: send widget changes, mirror the page."""
+
+    def __init__(self, ws, timeout):
+        self.ws = ws
+        self.timeout = timeout
+        # delta path -> (ForwardMsg, run number that last wrote it)
+        self._page = {}
+        self._runs = 0
+        self._tree = None
+
+    async def rerun(self, widgets=(), fragment_id=""):
+        msg = BackMsg()
+        msg.rerun_script.widget_states.widgets.extend(widgets)
+        msg.rerun_script.fragment_id = fragment_id
+        t0 = time.perf_counter()
+        await self.ws.send(msg.SerializeToString())
+        await asyncio.wait_for(self._receive_run(), self.timeout)
+        return time.perf_counter() - t0
+
+    async def _receive_run(self):
+        fragments = set()
+        while True:
+            fm = ForwardMsg()
+            fm.ParseFromString(await self.ws.recv())
+            kind = fm.WhichOneof("type")
+            if kind == "new_session":
+                # st.rerun() ends the run early and starts a new one
+                self._runs += 1
+                fragments = set(fm.new_session.fragment_ids_this_run)
+            elif kind == "delta":
+                self._page[tuple(fm.metadata.delta_path)] = (fm, self._runs)
+                if fm.delta.fragment_id:
+                    fragments.add(fm.delta.fragment_id)
+            elif kind == "script_finished":
+                status = fm.script_finished
+                if status == ForwardMsg.FINISHED_EARLY_FOR_RERUN:
+                    continue
+                if status == ForwardMsg.FINISHED_WITH_COMPILE_ERROR:
+                    raise RuntimeError("app.py failed to compile")
+                self._drop_stale(fragments if status == ForwardMsg.FINISHED_FRAGMENT_RUN_SUCCESSFULLY else None)
+                self._tree = None
+                return
+
+    def _drop_stale(self, fragments):
+        # What the browser does when a run finishes: a full run replaces the
+        # page; a fragment run removes what the fragment (or anything nested
+        # in it) drew last time and didn't draw again
+        def redrawn_around(path):
+            for end in range(len(path), 0, -1):
+                entry = self._page.get(path[:end])
+                if entry and entry[0].delta.fragment_id in fragments:
+                    return True
+            return False
+
+        for path, (_, run) in list(self._page.items()):
+            if run != self._runs and (fragments is None or redrawn_around(path)):
+                del self._page[path]
+
+    @property
+    def tree(self):
+        if self._tree is None:
+            self._tree = parse_tree_from_messages([fm for _, (fm, _) in sorted(self._page.items())])
+        return self._tree
+
+    def find(self, kind, key=None, label=None):
+        return [node for node in self.tree
+                if node.type == kind and (key is None or node.key == key)
+                and (label is None or getattr(node, "label", None) == label)]
+
+    def fragment_of(self, node):
+        for fm, _ in self._page.values():
+            element = fm.delta.new_element
+            kind = element.WhichOneof("type")
+            if kind and getattr(getattr(element, kind), "id", None) == node.id:
+                return fm.delta.fragment_id
+        return ""
+
+    async def click(self, key=None, node=None, extra=()):
+        node = node or self.find("button", key=key)[0]
+        return await self.rerun([*extra, WidgetState(id=node.id, trigger_value=True)], self.fragment_of(node))
+
+    async def set(self, node, value):
+        return await self.rerun([value_state(node, value)], self.fragment_of(node))
+
+
+def value_state(node, value):
+    """The WidgetState the browser sends after picking or typing ``value``."""
+    state = WidgetState(id=node.id)
+    if node.type == "select_slider":
+        state.string_array_value.data.append(value)
+    else:
+        # selectbox, radio and text_input all send the chosen/typed string
+        state.string_value = value
+    return state
+
+
+class Session:
+    def __init__(self, client, rng):
+        self.client = client
+        self.rng = rng
+
+    async def _open_editor(self):
+        if self.client.find("button", key="global_add"):
+            return 0.0
+        return await self.client.click("toggle_code_sidebar")
+
+    async def navigate(self):
+        title = self.rng.choice(list(chapters.CHAPTERS))
+        seconds = await self.client.set(self.client.find("selectbox", key="chapter_selector")[0], title)
+        sliders = self.client.find("select_slider")
+        if sliders and self.rng.random() < 0.7:
+            seconds += await self.client.set(sliders[0], self.rng.choice(sliders[0].options))
+        return seconds
+
+    async def quiz(self):
+        exercises = content.bundle()["exercises"]
+        on_page = [w for w in self.client.find("text_input") + self.client.find("radio") if w.key in exercises]
+        if not on_page:
+            return await self.navigate()
+        widget = self.rng.choice(on_page)
+        ex = exercises[widget.key]
+        # Mostly right, sometimes wrong, like a real learner
+        answer = self.rng.choice(ex["answers"]) if self.rng.random() < 0.7 else "not sure"
+        if ex["widget"] == "radio" and answer not in ex["options"]:
+            answer = self.rng.choice(ex["options"])
+        typed = value_state(widget, answer)
+        return await self.client.click(f"submit_{widget.key}", extra=[typed])
+
+    async def add_cell(self):
+        seconds = await self._open_editor()
+        if len(self.client.find("component_instance")) >= MAX_CELLS:
+            return seconds + await self.client.click("global_reset")
+        return seconds + await self.client.click("global_add")
+
+    async def run_code(self):
+        seconds = await self._open_editor()
+        editors = self.client.find("component_instance")
+        runs = self.client.find("button", label="▶️ Run")
+        i = self.rng.randrange(min(len(editors), len(runs)))
+        typed = WidgetState(id=editors[i].id, json_value=json.dumps(self.rng.choice(SNIPPETS)))
+        return seconds + await self.client.click(node=runs[i], extra=[typed])
+
+
+ACTIONS = {name: getattr(Session, name) for name in ("navigate", "quiz", "add_cell", "run_code")}
+
+
+async def run_session(url, seed, args, deadline, samples, errors):
+    rng = random.Random(seed)
+    names, weights = zip(*args.mix.items())
+    try:
+        async with connect(f"{url}/_stcore/stream", subprotocols=["streamlit"], max_size=None) as ws:
+            client = Client(ws, args.timeout)
+            seconds = await client.rerun()
+            samples["first_load"].append(seconds)
+            session = Session(client, rng)
+            while time.monotonic() < deadline:
+                await asyncio.sleep(rng.expovariate(1000 / args.think_ms) if args.think_ms else 0)
+                name = rng.choices(names, weights)[0]
+                seconds = await ACTIONS[name](session)
+                samples[name].append(seconds)
+                exceptions = client.find("exception")
+                if exceptions:
+                    raise RuntimeError(exceptions[0].message)
+    except Exception as e:
+        errors.append(f"session {seed}: {type(e).__name__}: {e}")
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(log, data_dir):
+    """Start app.py on a free port, keeping its databases in ``data_dir``."""
+    port = free_port()
+    cmd = [sys.executable, "-m", "streamlit", "run", os.path.join(ROOT, "app.py"),
+           "--server.headless", "true", "--server.address", "127.0.0.1", "--server.port", str(port),
+           "--server.fileWatcherType", "none", "--browser.gatherUsageStats", "false"]
+    # The server's own /metrics endpoint stays off so it can't clash with a running app,
+    # and the synthetic learners' progress and grades stay out of the real databases
+    env = {**os.environ, "APP_METRICS_PORT": "0",
+           "APP_PROGRESS_DB": os.path.join(data_dir, "progress.db"),
+           "GRADER_CACHE_DB": os.path.join(data_dir, "grader_cache.db")}
+    proc = subprocess.Popen(cmd, cwd=ROOT, stdout=log, stderr=subprocess.STDOUT, env=env)
+    started = time.monotonic()
+    while time.monotonic() - started < 60:
+        if proc.poll() is not None:
+            raise RuntimeError(f"streamlit exited with {proc.returncode} (log: {log.name})")
+        try:
+            with urllib.request.urlopen(f"http://127.0.0.1:{port}/_stcore/health", timeout=1):
+                return proc, f"ws://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.2)
+    proc.terminate()
+    raise RuntimeError(f"streamlit didn't come up within 60s (log: {log.name})")
+
+
+async def load(url, args):
+    samples, errors = defaultdict(list), []
+    started = time.monotonic()
+    deadline = started + args.duration
+    await asyncio.gather(*(run_session(url, args.seed + i, args, deadline, samples, errors)
+                           for i in range(args.sessions)))
+    return samples, errors, time.monotonic() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sessions", type=int, default=8, help="simultaneous simulated learners")
+    parser.add_argument("--duration", type=float, default=60.0, help="seconds to keep the load on")
+    parser.add_argument("--think-ms", type=float, default=500.0,
+                        help="mean pause between a session's actions (exponentially distributed)")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("navigate=4,quiz=3,add_cell=1,run_code=2"),
+                        help="relative weights of the actions")
+    parser.add_argument("--url", help="websocket base URL of a running app (default: start one locally)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="per-rerun timeout in seconds")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--max-p95-ms", type=float, default=0.0,
+                        help="fail when the overall p95 action latency exceeds this (0: report only)")
+    parser.add_argument("--json", help="also write the report to this file")
+    args = parser.parse_args()
+
+    proc = None
+    with tempfile.NamedTemporaryFile("w", prefix="load_test-", suffix=".log", delete=False) as log, \
+            tempfile.TemporaryDirectory(prefix="load_test-") as data_dir:
+        try:
+            url = args.url
+            if not url:
+                proc, url = start_server(log, data_dir)
+            samples, errors, elapsed = asyncio.run(load(url.rstrip("/"), args))
+        finally:
+            if proc:
+                proc.terminate()
+                proc.wait()
+
+    report = {"sessions": args.sessions, "duration_s": round(elapsed, 2), "actions": {}, "errors": errors}
+    actions = sorted(s for name, values in samples.items() if name != "first_load" for s in values)
+    for name, values in sorted(samples.items()) + [("all", actions)]:
+        values = sorted(values)
+        report["actions"][name] = {
+            "count": len(values),
+            **{f"p{p}_ms": round(percentile(values, p) * 1000, 1) for p in (50, 95, 99)},
+        }
+    report["throughput_per_s"] = round(len(actions) / elapsed, 2) if elapsed else 0.0
+
+    print(f"{args.sessions} sessions for {elapsed:.1f}s: {len(actions)} actions, "
+          f"{report['throughput_per_s']:.2f}/s")
+    print(f"  {'action':<12}{'count':>7}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}")
+    for name, row in report["actions"].items():
+        print(f"  {name:<12}{row['count']:>7}{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}{row['p99_ms']:>10.1f}")
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+
+    failures = list(errors)
+    p95 = report["actions"]["all"]["p95_ms"]
+    if args.max_p95_ms and p95 > args.max_p95_ms:
+        failures.append(f"p95 {p95:.1f} ms exceeds the {args.max_p95_ms:.0f} ms limit")
+    for failure in failures:
+        print("FAIL:", failure)
+    if failures and proc:
+        print(f"server log: {log.name}")
+    else:
+        os.unlink(log.name)
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())